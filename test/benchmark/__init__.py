@@ -0,0 +1,12 @@
+# encoding=utf8
+
+""" The benchmarks
+    Author: lipixun
+    Created Time : 日 10/18 11:02:17 2026
+
+    File Name: __init__.py
+    Description:
+
+        Run with `py.test -s test/benchmark` to see the results
+
+"""
@@ -0,0 +1,37 @@
+# encoding=utf8
+
+""" The call stack benchmark
+    Author: lipixun
+    Created Time : 日 10/18 11:04:52 2026
+
+    File Name: test_callstack.py
+    Description:
+
+"""
+
+from timeit import timeit
+
+from unifiedrpc.protocol.execution import CallStack
+
+ROUNDS = 20000
+
+def caller(next):
+    """A caller which does nothing but calls next
+    """
+    return next()
+
+def endpoint(next):
+    """The endpoint
+    """
+    return 'OK'
+
+def test_callstack_overhead():
+    """The per-call overhead of the call stack with 0 - 10 callers
+    """
+    print
+    print 'Callers    Per-call (us)'
+    for count in range(0, 11):
+        callStack = CallStack([ caller ] * count + [ endpoint ])
+        assert callStack() == 'OK'
+        cost = timeit(callStack, number = ROUNDS)
+        print '%-10d %.3f' % (count, cost / ROUNDS * 1e6)
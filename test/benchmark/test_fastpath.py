@@ -0,0 +1,50 @@
+# encoding=utf8
+
+""" The fast path benchmark
+    Author: lipixun
+    Created Time : 日 10/18 11:46:31 2026
+
+    File Name: test_fastpath.py
+    Description:
+
+"""
+
+from time import time
+
+from werkzeug.test import EnvironBuilder
+
+from unifiedrpc import Server
+from unifiedrpc.services import PingService
+from unifiedrpc.adapters.web import WebAdapter
+
+ROUNDS = 5000
+
+def startResponse(status, headers, excInfo = None):
+    """The start response method
+    """
+
+def run(adapter):
+    """Run the ping requests
+    Returns:
+        Requests per second
+    """
+    environ = EnvironBuilder('/_ping').get_environ()
+    startTime = time()
+    for _ in xrange(ROUNDS):
+        body = ''.join(adapter(dict(environ), startResponse))
+    assert body == 'OK'
+    # Done
+    return ROUNDS / (time() - startTime)
+
+def test_fastpath_requests_per_second():
+    """Compare the requests per second of PingService.ping in the fast path and the full pipeline
+    """
+    fastAdapter, fullAdapter = WebAdapter(), WebAdapter()
+    fullAdapter.FAST_PATH = False
+    Server([ PingService() ], [ fastAdapter ]).start()
+    Server([ PingService() ], [ fullAdapter ]).start()
+    # Run
+    print
+    print 'Path       Requests/s'
+    print 'full       %.0f' % run(fullAdapter)
+    print 'fast       %.0f' % run(fastAdapter)
@@ -0,0 +1,45 @@
+# encoding=utf8
+
+""" The json codec benchmark
+    Author: lipixun
+    Created Time : 日 10/18 20:48:12 2026
+
+    File Name: test_json.py
+    Description:
+
+"""
+
+from timeit import timeit
+from unittest import SkipTest
+
+from unifiedrpc.util import json
+from unifiedrpc.content.codec import getJsonCodec, getAvailableJsonCodecs
+
+ROUNDS = 200
+
+PAYLOADS = [
+    ('small', { 'value': { 'id': 1, 'name': 'name', 'enabled': True }, 'error': None }),
+    ('records', { 'value': [ { 'id': i, 'name': 'name%d' % i, 'score': i * 0.5, 'tags': [ 'a', 'b' ] } for i in range(1000) ] }),
+    ('unicode', { 'value': [ u'你好，世界' * 10 for _ in range(100) ] }),
+    ('nested', { 'value': reduce(lambda x, _: { 'child': x, 'values': range(10) }, range(50), {}) }),
+    ]
+
+def test_json_codecs():
+    """The per-call time of dumps and loads of the json codecs on the typical payloads
+    """
+    codecNames = getAvailableJsonCodecs()
+    if len(codecNames) < 2:
+        raise SkipTest('Require at least 2 json codecs to compare, available: %s' % ', '.join(codecNames))
+    print
+    print 'Payload    Codec          Dumps (us)     Loads (us)'
+    for name, payload in PAYLOADS:
+        # The double pass encoding used before the codecs
+        cost = timeit(lambda: json.dumps(payload, ensure_ascii = False).encode('utf-8'), number = ROUNDS)
+        print '%-10s %-14s %-14.3f -' % (name, '(legacy)', cost / ROUNDS * 1e6)
+        for codecName in codecNames:
+            codec = getJsonCodec(codecName)
+            data = codec.dumps(payload)
+            assert codec.loads(data) == json.loads(data)
+            dumpsCost = timeit(lambda: codec.dumps(payload), number = ROUNDS)
+            loadsCost = timeit(lambda: codec.loads(data), number = ROUNDS)
+            print '%-10s %-14s %-14.3f %.3f' % (name, codecName, dumpsCost / ROUNDS * 1e6, loadsCost / ROUNDS * 1e6)
@@ -0,0 +1,36 @@
+# encoding=utf8
+
+""" The msgpack content benchmark
+    Author: lipixun
+    Created Time : 日 10/18 22:16:51 2026
+
+    File Name: test_msgpack.py
+    Description:
+
+"""
+
+from timeit import timeit
+
+import msgpack
+
+from unifiedrpc.content.codec import getJsonCodec, TYPE_ENCODERS
+
+from test_json import ROUNDS, PAYLOADS
+
+def test_msgpack_vs_json():
+    """The per-call time of encoding and decoding of msgpack and json on the same payloads
+    """
+    codec = getJsonCodec()
+    packer = msgpack.Packer(default = TYPE_ENCODERS.encode)
+    print
+    print 'Payload    Format     Size       Dumps (us)     Loads (us)'
+    for name, payload in PAYLOADS:
+        data = codec.dumps(payload)
+        dumpsCost = timeit(lambda: codec.dumps(payload), number = ROUNDS)
+        loadsCost = timeit(lambda: codec.loads(data), number = ROUNDS)
+        print '%-10s %-10s %-10d %-14.3f %.3f' % (name, codec.NAME, len(data), dumpsCost / ROUNDS * 1e6, loadsCost / ROUNDS * 1e6)
+        data = packer.pack(payload)
+        assert msgpack.unpackb(data, raw = False) == codec.loads(codec.dumps(payload))
+        dumpsCost = timeit(lambda: packer.pack(payload), number = ROUNDS)
+        loadsCost = timeit(lambda: msgpack.unpackb(data, raw = False), number = ROUNDS)
+        print '%-10s %-10s %-10d %-14.3f %.3f' % (name, 'msgpack', len(data), dumpsCost / ROUNDS * 1e6, loadsCost / ROUNDS * 1e6)
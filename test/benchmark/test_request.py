@@ -0,0 +1,80 @@
+# encoding=utf8
+
+""" The web request benchmark
+    Author: lipixun
+    Created Time : 日 10/18 18:12:05 2026
+
+    File Name: test_request.py
+    Description:
+
+"""
+
+import gc
+
+from time import time
+
+from werkzeug.test import EnvironBuilder
+
+from unifiedrpc.adapters.web.request import WebRequest
+
+ROUNDS = 5000
+
+class EagerWebRequest(WebRequest):
+    """The web request which parses the attributes in __init__ as before the lazy parsing (The baseline)
+    """
+    EAGER_ATTRIBUTES = [ 'headers', 'queryParams', 'params', 'content', 'accept' ]
+
+    def __init__(self, environ):
+        """Create a new EagerWebRequest
+        """
+        super(EagerWebRequest, self).__init__(environ)
+        access(self, self.EAGER_ATTRIBUTES)
+
+def access(request, attributes):
+    """Access the attributes of the request
+    """
+    for attribute in attributes:
+        getattr(request, attribute)
+
+def measure(requestClass, environ, attributes):
+    """Measure the gc tracked objects and time per request
+    Returns:
+        A tuple (objects per request, us per request)
+    """
+    # The objects kept alive by the requests
+    requests = []
+    gc.collect()
+    gc.disable()
+    try:
+        count = len(gc.get_objects())
+        for _ in xrange(ROUNDS):
+            request = requestClass(dict(environ))
+            access(request, attributes)
+            requests.append(request)
+        objects = (len(gc.get_objects()) - count - 1) / float(ROUNDS)
+    finally:
+        gc.enable()
+    del requests
+    # The time
+    startTime = time()
+    for _ in xrange(ROUNDS):
+        access(requestClass(dict(environ)), attributes)
+    # Done
+    return objects, (time() - startTime) / ROUNDS * 1e6
+
+def test_request_allocations():
+    """The gc tracked objects and time per request when accessing different attributes, the lazy parsing against
+    the eager parsing
+    """
+    environ = EnvironBuilder('/test', query_string = 'a=1&b=2', headers = {
+        'Accept': 'application/json;q=0.9, text/plain;q=0.5, */*;q=0.1',
+        'Accept-Charset': 'utf-8, iso-8859-1;q=0.5',
+        'Cookie': 'session=value',
+        }).get_environ()
+    print
+    print '                                 Lazy                   Eager (Baseline)'
+    print 'Attributes                       Objects    Time (us)   Objects    Time (us)'
+    for attributes in ([], [ 'params' ], [ 'params', 'content' ], [ 'params', 'content', 'accept', 'cookies' ]):
+        lazyObjects, lazyCost = measure(WebRequest, environ, attributes)
+        eagerObjects, eagerCost = measure(EagerWebRequest, environ, attributes)
+        print '%-32s %-10.1f %-11.3f %-10.1f %.3f' % (','.join(attributes) or '-', lazyObjects, lazyCost, eagerObjects, eagerCost)
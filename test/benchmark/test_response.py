@@ -0,0 +1,126 @@
+# encoding=utf8
+
+""" The response writer benchmark
+    Author: lipixun
+    Created Time : 日 10/18 19:05:47 2026
+
+    File Name: test_response.py
+    Description:
+
+"""
+
+from time import time
+
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Response as WKResponse
+
+from unifiedrpc import endpoint, context, Service, Server
+from unifiedrpc.helpers import container, mimetype
+from unifiedrpc.adapters.web import get, WebAdapter
+from unifiedrpc.content.container import APIContentContainer
+from unifiedrpc.adapters.web.util import getContentType
+
+ROUNDS = 5000
+
+class BenchmarkService(Service):
+    """The benchmark service
+    """
+    @get('/text')
+    @endpoint()
+    def text(self):
+        """Return text
+        """
+        return 'OK'
+
+    @container(APIContentContainer)
+    @mimetype('application/json')
+    @get('/json')
+    @endpoint()
+    def json(self):
+        """Return json with a header and a cookie
+        """
+        context.response.headers['X-Value'] = 'value'
+        context.response.cookies['key'] = 'value'
+        return { 'key': 'value' }
+
+class WerkzeugWebAdapter(WebAdapter):
+    """The web adapter which creates the response by the werkzeug Response (The writer used before)
+    """
+    def createResponse(self, sessionManager = None):
+        """Create the response of current context by the werkzeug Response
+        """
+        response = context.response
+        # Set session
+        if sessionManager:
+            sessionManager.set(context.session, response)
+        # Create the container and builder
+        container = response.content.container()
+        if response.content.executionResult:
+            container.setValue(response.content.executionResult)
+        if response.content.error:
+            container.setRPCError(response.content.error)
+        # Dump the container and set headers
+        containerValues, containerHeaders = container.dump()
+        if containerHeaders:
+            response.headers.update(containerHeaders)
+        # Create the response
+        wkResponse = WKResponse(
+            status = response.status,
+            headers = response.headers,
+            response = response.content.builder.build(response, containerValues),
+            content_type =  getContentType(response.mimeType, response.encoding)
+            )
+        if response.cookies and len(response.cookies) > 0:
+            for key in response.cookies:
+                cookie = response.cookies[key]
+                # Get set cookie params
+                params = { 'value': cookie.value }
+                if cookie['domain'] != '':
+                    params['domain'] = cookie['domain']
+                if cookie['secure'] != '':
+                    params['secure'] = cookie['secure']
+                if cookie['expires'] != '':
+                    params['expires'] = cookie['expires']
+                if cookie['max-age'] != '':
+                    params['max_age'] = cookie['max-age']
+                if cookie['path'] != '':
+                    params['path'] = cookie['path']
+                if cookie['httponly'] != '':
+                    params['httponly'] = cookie['httponly']
+                # Set it
+                wkResponse.set_cookie(key, **params)
+        # Done
+        body, status, headers = wkResponse.get_wsgi_response(context.request.environ)
+        return status, headers, body
+
+def startResponse(status, headers, excInfo = None):
+    """The start response method
+    """
+
+def run(adapter, path, mimeType):
+    """Run the requests
+    Returns:
+        Requests per second
+    """
+    environ = EnvironBuilder(path, headers = { 'Accept': mimeType }).get_environ()
+    startTime = time()
+    for _ in xrange(ROUNDS):
+        body = ''.join(adapter(dict(environ), startResponse))
+    assert body
+    # Done
+    return ROUNDS / (time() - startTime)
+
+def test_response_requests_per_second():
+    """The requests per second of the full pipeline with the werkzeug response and the response writer
+    """
+    adapters = []
+    for adapterClass in (WerkzeugWebAdapter, WebAdapter):
+        adapter = adapterClass()
+        adapter.FAST_PATH = False
+        Server([ BenchmarkService() ], [ adapter ]).start()
+        adapters.append(adapter)
+    # Run
+    print
+    print 'Path       Werkzeug (req/s)   Writer (req/s)'
+    for path, mimeType in (('/text', 'text/plain'), ('/json', 'application/json')):
+        print '%-10s %-18.0f %.0f' % (path, run(adapters[0], path, mimeType), run(adapters[1], path, mimeType))
@@ -0,0 +1,41 @@
+# encoding=utf8
+
+""" The router benchmark
+    Author: lipixun
+    Created Time : 日 10/18 17:41:20 2026
+
+    File Name: test_router.py
+    Description:
+
+"""
+
+from timeit import timeit
+
+from werkzeug.routing import Map
+from werkzeug.test import EnvironBuilder
+
+from unifiedrpc.adapters.web.router import Router
+from unifiedrpc.adapters.web.endpoint import WebEndpoint
+
+ROUNDS = 2000
+
+def test_router_match():
+    """The per-match time of the router and the werkzeug map with 10 - 10,000 routes
+    """
+    print
+    print 'Routes     Path                     Router (us)    Werkzeug (us)'
+    for count in (10, 100, 1000, 10000):
+        webEndpoints = []
+        for i in range(count / 2):
+            webEndpoints.append(WebEndpoint('/api/r%d' % i, method = 'GET'))
+            webEndpoints.append(WebEndpoint('/api/r%d/<int:id>/<path:path>' % i, method = 'GET'))
+        router, urlMapper = Router(), Map([ x.getUrlRule(x.path) for x in webEndpoints ])
+        for webEndpoint in webEndpoints:
+            router.add(webEndpoint, webEndpoint.path)
+        # Match the last routes
+        for path in ('/api/r%d' % (count / 2 - 1), '/api/r%d/1/a/b' % (count / 2 - 1)):
+            environ = EnvironBuilder(path).get_environ()
+            assert router.match('GET', path, 'localhost')[1] == urlMapper.bind_to_environ(environ).match()[0][1]
+            routerCost = timeit(lambda: router.match('GET', path, 'localhost'), number = ROUNDS)
+            werkzeugCost = timeit(lambda: urlMapper.bind_to_environ(environ).match(), number = max(ROUNDS * 10 / count, 10))
+            print '%-10d %-24s %-14.3f %.3f' % (count, path, routerCost / ROUNDS * 1e6, werkzeugCost / max(ROUNDS * 10 / count, 10) * 1e6)
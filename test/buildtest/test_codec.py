@@ -0,0 +1,101 @@
+# encoding=utf8
+
+""" The json codec test
+    Author: lipixun
+    Created Time : 日 10/18 23:05:17 2026
+
+    File Name: test_codec.py
+    Description:
+
+"""
+
+import json
+
+from unifiedrpc.content.codec import JsonCodec, StdJsonCodec, UJsonCodec, getJsonCodec, getAvailableJsonCodecs, \
+    registerJsonCodec, unregisterJsonCodec
+
+class DummyCodec(StdJsonCodec):
+    """The dummy codec
+    """
+    NAME = 'dummy'
+
+class UnavailableCodec(StdJsonCodec):
+    """The codec which backend is not installed
+    """
+    NAME = 'unavailable'
+
+    def __init__(self, encoders = None):
+        """Create a new UnavailableCodec
+        """
+        raise ImportError('No module named unavailable')
+
+class DummyUJson(object):
+    """The dummy ujson module which returns the specified output
+    """
+    def __init__(self, output):
+        """Create a new DummyUJson
+        """
+        self.output = output
+
+    def dumps(self, value, **kwargs):
+        """Return the output
+        """
+        return self.output
+
+class DummyUJsonCodec(UJsonCodec):
+    """The ujson codec with the dummy ujson module
+    """
+    def __init__(self, output):
+        """Create a new DummyUJsonCodec
+        """
+        self._ujson = DummyUJson(output)
+        self._supportDefault = False
+        JsonCodec.__init__(self)
+
+def test_codec_registry():
+    """Test registering and selecting the json codecs
+    """
+    registerJsonCodec(DummyCodec)
+    registerJsonCodec(UnavailableCodec)
+    try:
+        # The codec is created once
+        codec = getJsonCodec('dummy')
+        assert type(codec) is DummyCodec and getJsonCodec('dummy') is codec and getJsonCodec(codec) is codec
+        assert 'dummy' in getAvailableJsonCodecs() and 'json' in getAvailableJsonCodecs()
+        # Registered again, the created codec is dropped
+        registerJsonCodec(DummyCodec)
+        assert not getJsonCodec('dummy') is codec
+        # The backend is not installed
+        assert not 'unavailable' in getAvailableJsonCodecs()
+        try:
+            getJsonCodec('unavailable')
+            assert False
+        except ValueError:
+            pass
+    finally:
+        unregisterJsonCodec(DummyCodec.NAME)
+        unregisterJsonCodec(UnavailableCodec.NAME)
+    try:
+        getJsonCodec('dummy')
+        assert False
+    except ValueError:
+        pass
+
+def test_codec_encoding():
+    """Test the output of the json codecs in the utf-8 and non utf-8 encodings
+    """
+    codec = StdJsonCodec()
+    # The unicode output
+    assert codec.dumps([ u'你好' ]) == u'["你好"]'.encode('utf-8')
+    assert codec.dumps([ u'你好' ], 'gbk') == u'["你好"]'.encode('gbk')
+    # The str output which has the raw utf-8 bytes
+    assert codec.dumps([ u'你好'.encode('utf-8') ], 'utf8') == u'["你好"]'.encode('utf-8')
+    assert codec.dumps([ u'你好'.encode('utf-8') ], 'gbk') == u'["你好"]'.encode('gbk')
+    assert codec.loads(u'["你好"]'.encode('gbk'), 'gbk') == [ u'你好' ]
+    # The ujson codec
+    for output in (u'["你好"]', u'["你好"]'.encode('utf-8')):
+        codec = DummyUJsonCodec(output)
+        assert codec.dumps(None) == u'["你好"]'.encode('utf-8')
+        assert codec.dumps(None, 'UTF-8') == u'["你好"]'.encode('utf-8')
+        assert codec.dumps(None, 'gbk') == u'["你好"]'.encode('gbk')
+    assert json.loads(DummyUJsonCodec(u'{"a": 1}').dumps(None, 'gbk')) == { 'a': 1 }
@@ -0,0 +1,209 @@
+# encoding=utf8
+
+""" The execution test
+    Author: lipixun
+    Created Time : 日 10/18 10:12:40 2026
+
+    File Name: test_execution.py
+    Description:
+
+"""
+
+import time
+
+from threading import Thread
+
+import gevent
+
+from webtest import TestApp
+
+from unifiedrpc import endpoint, context, Service, Server, CONFIG_RESPONSE_ENCODING, CONFIG_RESPONSE_MIMETYPE
+from unifiedrpc.errors import ServiceUnavailableError, BadRequestParameterError, ERRCODE_BADREQUEST_UNKNOWN_PARAMETER, ERRCODE_BADREQUEST_LACK_OF_PARAMETER
+from unifiedrpc.protocol import Endpoint
+from unifiedrpc.protocol.context import Context, getContext, setContext, clearContext, bindContext
+from unifiedrpc.protocol.execution import CallStack
+from unifiedrpc.stages import Bulkhead, GeventBulkhead
+from unifiedrpc.adapters.web import get, WebAdapter
+
+def test_execution_plan():
+    """The execution plan test
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            return context.meta.get('value', 'OK')
+
+    service = TestService()
+    adapter = WebAdapter()
+    server = Server([ service ], [ adapter ])
+    server.start()
+    # The plans are compiled when starting
+    plan = server.getExecutionPlan(adapter, service, service.endpoints['test'])
+    assert plan is server.getExecutionPlan(adapter, service, service.endpoints['test'])
+    assert plan.prerequest and plan.calling and plan.onerror
+    # Test
+    app = TestApp(adapter)
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.text == 'OK'
+    # Change the stage after started
+    def setValue(self):
+        """Set the value
+        """
+        context.meta['value'] = 'Changed'
+    service._stage.addPreRequest(setValue)
+    assert not plan is server.getExecutionPlan(adapter, service, service.endpoints['test'])
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.text == 'Changed'
+    # Stop
+    server.stop()
+    assert not server._executionContexts
+
+def test_parameter_binder():
+    """The parameter binder test
+    """
+    def method(a, b, c = 3):
+        """The method
+        """
+        return a, b, c
+
+    endpoint = Endpoint(method)
+    binder = endpoint.getBinder()
+    assert binder is endpoint.getBinder()
+    assert binder.bind({ 'a': 1, 'b': 2 }) == { 'a': 1, 'b': 2, 'c': 3 }
+    assert binder.bind({ 'a': 1, 'b': 2, 'c': 4 }) == { 'a': 1, 'b': 2, 'c': 4 }
+    # Unknown parameter
+    try:
+        binder.bind({ 'a': 1, 'b': 2, 'd': 4 })
+        assert False
+    except BadRequestParameterError as error:
+        assert error.code == ERRCODE_BADREQUEST_UNKNOWN_PARAMETER and error.parameter == 'd'
+    # Lack of parameter
+    try:
+        binder.bind({ 'b': 2 })
+        assert False
+    except BadRequestParameterError as error:
+        assert error.code == ERRCODE_BADREQUEST_LACK_OF_PARAMETER and error.parameter == 'a'
+    # Change the executor
+    endpoint.executor(lambda a, **kwargs: a)
+    binder = endpoint.getBinder()
+    assert binder.bind({ 'a': 1, 'd': 4 }) == { 'a': 1, 'd': 4 }
+
+def test_execution_context_configs():
+    """The execution context configs test
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            return context.execution().getConfig(CONFIG_RESPONSE_ENCODING)
+
+    service = TestService(configs = { CONFIG_RESPONSE_ENCODING: 'gbk' })
+    adapter = WebAdapter()
+    server = Server([ service ], [ adapter ])
+    server.start()
+    # The execution contexts are shared
+    execution = server.getExecutionContext(adapter, service, service.endpoints['test'])
+    assert execution is server.getExecutionContext(adapter, service, service.endpoints['test'])
+    assert execution.getConfig(CONFIG_RESPONSE_ENCODING) == 'gbk'
+    assert execution.getConfig(CONFIG_RESPONSE_MIMETYPE) == server.DEFAULT_RESPONSE_MIMETYPE
+    assert execution.getConfig('unknown', 'default') == 'default'
+    # Test
+    app = TestApp(adapter)
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.text == 'gbk'
+    # Change the config after started
+    service.endpoints['test'].setConfig(CONFIG_RESPONSE_ENCODING, 'utf-8')
+    assert not execution is server.getExecutionContext(adapter, service, service.endpoints['test'])
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.text == 'utf-8'
+    # Not cached after stopped (The changes are not watched)
+    server.stop()
+    execution = server.getExecutionContext(adapter, service, service.endpoints['test'])
+    assert not execution is server.getExecutionContext(adapter, service, service.endpoints['test'])
+    service.endpoints['test'].setConfig(CONFIG_RESPONSE_ENCODING, 'gbk')
+    assert server.getExecutionContext(adapter, service, service.endpoints['test']).getConfig(CONFIG_RESPONSE_ENCODING) == 'gbk'
+
+def test_callstack():
+    """The call stack test
+    """
+    calls = []
+    def createCaller(name):
+        """Create a caller
+        """
+        def caller(next):
+            """The caller
+            """
+            calls.append(name)
+            return '%s(%s)' % (name, next())
+        # Done
+        return caller
+
+    callStack = CallStack([ createCaller('a'), createCaller('b'), lambda next: next() ])
+    assert callStack() == 'a(b(None))' and calls == [ 'a', 'b' ]
+    assert callStack() == 'a(b(None))' and calls == [ 'a', 'b', 'a', 'b' ]
+    assert CallStack([])() is None
+
+def test_context_binding():
+    """The context binding test
+    """
+    results = []
+    ctx = Context(None, None, meta = { 'value': 'OK' })
+    setContext(ctx)
+    try:
+        def run():
+            """Run in thread
+            """
+            results.append(context.meta.get('value') if context else None)
+        # The context is not shared with the other threads
+        thread = Thread(target = run)
+        thread.start()
+        thread.join()
+        # The context is bound
+        thread = Thread(target = bindContext(run))
+        thread.start()
+        thread.join()
+        assert results == [ None, 'OK' ] and getContext() is ctx
+    finally:
+        clearContext()
+    assert getContext() is None
+
+def test_bulkhead():
+    """The bulkhead test
+    """
+    for bulkheadClass, spawn in ((Bulkhead, lambda method: Thread(target = method)), (GeventBulkhead, gevent.Greenlet)):
+        _bulkhead = bulkheadClass(1, queueSize = 1, maxWait = 0.2)
+        results = []
+        def call():
+            """Call in bulkhead
+            """
+            try:
+                results.append(_bulkhead(lambda: 'OK'))
+            except ServiceUnavailableError:
+                results.append('Rejected')
+        # Wait until timeout
+        _bulkhead.enter()
+        waiter = spawn(call)
+        waiter.start()
+        sleep = gevent.sleep if bulkheadClass is GeventBulkhead else time.sleep
+        sleep(0.05)
+        assert _bulkhead.waiting == 1
+        # The queue is full
+        call()
+        waiter.join()
+        assert results == [ 'Rejected', 'Rejected' ] and _bulkhead.getStats() == { 'inflight': 1, 'waiting': 0, 'rejected': 2 }
+        # Wait until the running call completed
+        waiter = spawn(call)
+        waiter.start()
+        sleep(0.05)
+        _bulkhead.leave()
+        waiter.join()
+        assert results[-1] == 'OK' and _bulkhead.getStats() == { 'inflight': 0, 'waiting': 0, 'rejected': 2 }
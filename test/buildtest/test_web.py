@@ -9,19 +9,43 @@
 
 """
 
+import os
 import json
+import time
 import urllib
+import signal
+import socket
+import httplib
+
+from StringIO import StringIO
+from threading import current_thread
 
 import mime
 
 from webtest import TestApp
+from werkzeug.test import EnvironBuilder
 
 from unifiedrpc import endpoint, context, Service, Server, \
-    CONFIG_RESPONSE_CONTENT_CONTAINER, CONFIG_RESPONSE_MIMETYPE
-from unifiedrpc.helpers import paramtype
+    CONFIG_RESPONSE_CONTENT_CONTAINER, CONFIG_RESPONSE_MIMETYPE, CONFIG_RESPONSE_CONTENT_BUILDER, CONFIG_RESPONSE_CONTENT_CODEC
+from unifiedrpc.errors import NotFoundError, BadRequestError, MethodNotAllowedError, InternalServerError
+from unifiedrpc.helpers import paramtype, threadpool, cpubound, bulkhead, timeout, requiressl, codec, container, mimetype
+from unifiedrpc.stages import ThreadPoolCaller, FuturesThreadPool, GeventThreadPool
+from unifiedrpc.processpool import ProcessPool, ProcessPoolTask
+from unifiedrpc.certificate import Certificate
 from unifiedrpc.paramtypes import boolean
-from unifiedrpc.adapters.web import get, post, put, delete, head, patch, options, WebAdapter
-from unifiedrpc.content.container import APIContentContainer
+from unifiedrpc.server import GeventServer
+from unifiedrpc.protocol import CONFIG_ENDPOINT_BULKHEAD, startup
+from unifiedrpc.adapters.web import get, post, put, delete, head, patch, options, WebAdapter, GeventWebAdapter, createWSGIApplication
+from unifiedrpc.adapters.web.router import Router
+from unifiedrpc.adapters.web.response import WebResponse
+from unifiedrpc.adapters.web.connection import Connection
+from unifiedrpc.adapters.web.endpoint import WebEndpoint
+from unifiedrpc.adapters.requests import Http2UnifiedRPCErrorHandler
+from unifiedrpc.content.builder import JsonContentBuilder, NdjsonContentBuilder, XmlContentBuilder, AutomaticContentBuilder
+from unifiedrpc.content.builder._msgpack import MsgpackContentBuilder, MsgpackStreamContentBuilder
+from unifiedrpc.content.parser import XmlContentParser
+from unifiedrpc.content.container import APIContentContainer, PlainContentContainer
+from unifiedrpc.protocol.execution import IterableEndpointExecutionResult, GeneratorEndpointExecutionResult
 
 def test_web_basic():
     """The web basic test
@@ -190,6 +214,400 @@ def test_web_content_json():
     value = json.loads(rsp.text)
     assert rsp.status_int == 200 and value['value'] == { 'key': 'value' }
 
+def test_web_content_codec():
+    """Test the json codec of the request and response content
+    """
+    from uuid import UUID
+    from decimal import Decimal
+    from datetime import datetime
+    from unifiedrpc.content.codec import TypeEncoders, StdJsonCodec, getJsonCodec, getAvailableJsonCodecs, registerJsonCodec, unregisterJsonCodec
+
+    class Point(object):
+        """A custom type
+        """
+        def __init__(self, x, y):
+            """Create a new Point
+            """
+            self.x, self.y = x, y
+
+    class TestCodec(StdJsonCodec):
+        """The test codec which encodes Point
+        """
+        NAME = 'test'
+
+        def __init__(self):
+            """Create a new TestCodec
+            """
+            encoders = TypeEncoders()
+            encoders.register(Point, lambda x: [ x.x, x.y ])
+            super(TestCodec, self).__init__(encoders)
+
+        def load(self, stream, encoding = 'utf-8'):
+            """Decode the content and mark the value decoded by this codec
+            """
+            value = super(TestCodec, self).load(stream, encoding)
+            value['codec'] = self.NAME
+            return value
+
+    class TestService(Service):
+        """The test service
+        """
+        @post('/types')
+        @endpoint()
+        def types(self):
+            """Return the non-json types
+            """
+            return {
+                'data': context.request.content.data,
+                'time': datetime(2016, 4, 8, 18, 23, 3),
+                'decimal': Decimal('1.5'),
+                'uuid': UUID(int = 1),
+                'set': set([ 1 ]),
+                'text': u'你好',
+                }
+
+        @codec('test')
+        @get('/point')
+        @endpoint()
+        def point(self):
+            """Return the custom type
+            """
+            return { 'point': Point(1, 2) }
+
+        @codec('test')
+        @post('/echo')
+        @endpoint()
+        def echo(self):
+            """Return the content decoded by the codec of the endpoint
+            """
+            return context.request.content.data
+
+    registerJsonCodec(TestCodec)
+    try:
+        assert 'json' in getAvailableJsonCodecs() and getJsonCodec('json') is getJsonCodec('json')
+        try:
+            getJsonCodec('unknown')
+            assert False
+        except ValueError:
+            pass
+        # The codecs
+        for name in getAvailableJsonCodecs():
+            jsonCodec = getJsonCodec(name)
+            assert jsonCodec.loads(jsonCodec.dumps({ 'key': u'你好' })) == { 'key': u'你好' }
+            assert jsonCodec.dumps([ u'你好' ], 'gbk').decode('gbk') == u'["你好"]'
+            assert jsonCodec.dumps([ u'你好'.encode('utf-8') ], 'gbk').decode('gbk') == u'["你好"]'
+        # The standard library json codec keeps the default separators
+        assert getJsonCodec('json').dumps({ 'key': [ 1, 2 ] }) == '{"key": [1, 2]}'
+        # The web
+        adapter = WebAdapter()
+        server = Server([ TestService() ], [ adapter ], {
+            CONFIG_RESPONSE_CONTENT_CONTAINER: APIContentContainer,
+            CONFIG_RESPONSE_MIMETYPE: mime.APPLICATION_JSON,
+            CONFIG_RESPONSE_CONTENT_CODEC: 'json',
+            })
+        server.start()
+        app = TestApp(adapter)
+        rsp = app.post('/types', params = json.dumps({ 'key': 'value' }), content_type = mime.APPLICATION_JSON)
+        assert rsp.status_int == 200 and json.loads(rsp.text)['value'] == {
+            'data': { 'key': 'value' },
+            'time': '2016-04-08T18:23:03',
+            'decimal': '1.5',
+            'uuid': '00000000-0000-0000-0000-000000000001',
+            'set': [ 1 ],
+            'text': u'你好',
+            }
+        rsp = app.post('/types', params = '{', content_type = mime.APPLICATION_JSON, expect_errors = True)
+        assert rsp.status_int == 400
+        rsp = app.get('/point', headers = { 'Accept-Charset': 'gbk' })
+        assert rsp.status_int == 200 and rsp.body == '{"value": {"point": [1, 2]}}'
+        # The request content is decoded by the codec of the endpoint
+        rsp = app.post('/echo', params = json.dumps({ 'key': 'value' }), content_type = mime.APPLICATION_JSON)
+        assert rsp.status_int == 200 and json.loads(rsp.text)['value'] == { 'key': 'value', 'codec': 'test' }
+    finally:
+        unregisterJsonCodec(TestCodec.NAME)
+    try:
+        getJsonCodec(TestCodec.NAME)
+        assert False
+    except ValueError:
+        pass
+
+def test_web_content_json_stream():
+    """Test streaming the multiple values as json array
+    """
+    produced = []
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self, count, fail = None):
+            """Test
+            """
+            for i in range(int(count)):
+                if fail and i == int(fail):
+                    raise BadRequestError(reason = 'Failed')
+                produced.append(i)
+                yield { 'id': i }
+
+        @get('/list')
+        @endpoint()
+        def list(self):
+            """Return a list
+            """
+            return [ 1, 2 ]
+
+    builder = AutomaticContentBuilder({ mime.APPLICATION_JSON: JsonContentBuilder(chunkSize = 20) })
+    for containerClass in (APIContentContainer, PlainContentContainer):
+        app = createWSGIApplication([ TestService() ], {
+            CONFIG_RESPONSE_CONTENT_CONTAINER: containerClass,
+            CONFIG_RESPONSE_MIMETYPE: mime.APPLICATION_JSON,
+            CONFIG_RESPONSE_CONTENT_BUILDER: builder,
+            })
+        unwrap = (lambda x: x['value']) if containerClass is APIContentContainer else (lambda x: x)
+        # The values are produced when the chunks are consumed
+        del produced[:]
+        body = app(EnvironBuilder('/test', query_string = 'count=100').get_environ(), lambda status, headers: None)
+        chunks = [ next(body) ]
+        assert len(chunks[0]) >= 20 and len(produced) < 10
+        chunks.extend(body)
+        assert len(chunks) > 10 and len(produced) == 100
+        assert unwrap(json.loads(''.join(chunks))) == [ { 'id': i } for i in range(100) ]
+        # The full content
+        rsp = TestApp(app).get('/test?count=3')
+        assert rsp.status_int == 200 and unwrap(json.loads(rsp.text)) == [ { 'id': 0 }, { 'id': 1 }, { 'id': 2 } ]
+        rsp = TestApp(app).get('/list')
+        assert rsp.status_int == 200 and unwrap(json.loads(rsp.text)) == [ 1, 2 ]
+        # The generator of a single value is an array as well (Was the value itself for the plain container)
+        rsp = TestApp(app).get('/test?count=1')
+        assert rsp.status_int == 200 and unwrap(json.loads(rsp.text)) == [ { 'id': 0 } ]
+        # The trailing error
+        rsp = TestApp(app).get('/test?count=3&fail=2')
+        value = json.loads(rsp.text)
+        if containerClass is APIContentContainer:
+            assert value['value'] == [ { 'id': 0 }, { 'id': 1 } ] and value['error']['reason'] == 'Failed'
+        else:
+            assert value[: 2] == [ { 'id': 0 }, { 'id': 1 } ] and value[2]['error']['reason'] == 'Failed'
+
+def test_web_content_ndjson():
+    """Test the ndjson content
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self, count, fail = None):
+            """Test
+            """
+            for i in range(int(count)):
+                if fail and i == int(fail):
+                    raise BadRequestError(reason = 'Failed')
+                yield { 'id': i }
+
+    for containerClass in (PlainContentContainer, APIContentContainer):
+        app = TestApp(createWSGIApplication([ TestService() ], {
+            CONFIG_RESPONSE_CONTENT_CONTAINER: containerClass,
+            CONFIG_RESPONSE_MIMETYPE: [ mime.APPLICATION_JSON, 'application/x-ndjson' ],
+            }))
+        rsp = app.get('/test?count=3', headers = { 'Accept': 'application/x-ndjson' })
+        assert rsp.status_int == 200 and rsp.content_type == 'application/x-ndjson'
+        assert rsp.text == '{"id": 0}\n{"id": 1}\n{"id": 2}\n'
+        # The error line
+        rsp = app.get('/test?count=3&fail=1', headers = { 'Accept': 'application/x-ndjson' })
+        lines = [ json.loads(x) for x in rsp.text.splitlines() ]
+        assert lines[0] == { 'id': 0 } and lines[1]['error']['reason'] == 'Failed' and len(lines) == 2
+        # The json is selected by the accept header
+        rsp = app.get('/test?count=2', headers = { 'Accept': 'application/json' })
+        assert rsp.content_type == mime.APPLICATION_JSON and '{"id": 0}, {"id": 1}]' in rsp.text
+    # The passthrough mode, the content is truncated
+    app = TestApp(createWSGIApplication([ TestService() ], {
+        CONFIG_RESPONSE_CONTENT_BUILDER: AutomaticContentBuilder({ 'application/x-ndjson': NdjsonContentBuilder(chunkSize = 1, errorLine = False) }),
+        CONFIG_RESPONSE_MIMETYPE: 'application/x-ndjson',
+        }))
+    rsp = app.get('/test?count=3&fail=1')
+    assert rsp.status_int == 200 and rsp.body == '{"id": 0}\n'
+
+def test_web_content_msgpack():
+    """Test the msgpack content
+    """
+    import msgpack
+
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self, count, fail = None):
+            """Test
+            """
+            for i in range(int(count)):
+                if fail and i == int(fail):
+                    raise BadRequestError(reason = 'Failed')
+                yield { 'id': i }
+
+        @post('/echo')
+        @endpoint()
+        def echo(self):
+            """Echo
+            """
+            return context.request.content.data
+
+    headers = { 'Accept': 'application/msgpack' }
+    for containerClass in (PlainContentContainer, APIContentContainer):
+        app = TestApp(createWSGIApplication([ TestService() ], {
+            CONFIG_RESPONSE_CONTENT_CONTAINER: containerClass,
+            CONFIG_RESPONSE_MIMETYPE: [ mime.APPLICATION_JSON, 'application/msgpack' ],
+            }))
+        rsp = app.get('/test?count=3', headers = headers)
+        assert rsp.status_int == 200 and rsp.content_type == 'application/msgpack'
+        value = msgpack.unpackb(rsp.body, raw = False)
+        if containerClass is APIContentContainer:
+            assert value['value'] == [ { 'id': 0 }, { 'id': 1 }, { 'id': 2 } ]
+        else:
+            assert value == [ { 'id': 0 }, { 'id': 1 }, { 'id': 2 } ]
+        # The trailing error
+        rsp = app.get('/test?count=3&fail=1', headers = headers)
+        value = msgpack.unpackb(rsp.body, raw = False)
+        if containerClass is APIContentContainer:
+            assert value['value'] == [ { 'id': 0 } ] and value['error']['reason'] == 'Failed'
+        else:
+            assert value[0] == { 'id': 0 } and value[1]['error']['reason'] == 'Failed' and len(value) == 2
+        # The parser
+        rsp = app.post('/echo', params = msgpack.packb({ 'key': [ 1, u'你好' ] }, use_bin_type = True), content_type = 'application/msgpack', headers = headers)
+        value = msgpack.unpackb(rsp.body, raw = False)
+        if containerClass is APIContentContainer:
+            value = value['value']
+        assert value == { 'key': [ 1, u'你好' ] }
+        rsp = app.post('/echo', params = '\xc1', content_type = 'application/msgpack', headers = headers, expect_errors = True)
+        assert rsp.status_int == 400
+    # The client side error handler
+    class Response(object):
+        status_code = 400
+        headers = { 'Content-Type': 'application/msgpack' }
+        content = msgpack.packb({ 'value': None, 'error': { 'code': 'invalid', 'reason': 'Failed' } })
+    error = Http2UnifiedRPCErrorHandler().getUnifiedRPCError(Response())
+    assert isinstance(error, BadRequestError) and error.code == 'invalid' and error.reason == 'Failed'
+    # The result of known length is streamed, the error is written in place
+    class Response(object):
+        encoding = 'utf-8'
+    builder = MsgpackContentBuilder(chunkSize = 1)
+    body = builder.build(Response(), IterableEndpointExecutionResult([ { 'id': 0 }, object(), { 'id': 2 } ]))
+    assert next(body) == msgpack.packb([ None ] * 3)[0]
+    value = msgpack.unpackb(msgpack.packb([ None ] * 3)[0] + ''.join(body), raw = False)
+    assert value[0] == { 'id': 0 } and value[1]['error']['reason'] == 'Undefined error occurred' and value[2] is None
+    body = ''.join(builder.build(Response(), [ { 'value': IterableEndpointExecutionResult([ 1, 2 ]), 'meta': 1 } ]))
+    assert msgpack.unpackb(body, raw = False) == { 'value': [ 1, 2 ], 'meta': 1 }
+    # The generator result is streamed by the msgpack stream content builder
+    headers = { 'Accept': 'application/x-msgpack-stream' }
+    for containerClass in (PlainContentContainer, APIContentContainer):
+        app = TestApp(createWSGIApplication([ TestService() ], {
+            CONFIG_RESPONSE_CONTENT_CONTAINER: containerClass,
+            CONFIG_RESPONSE_MIMETYPE: [ 'application/msgpack', 'application/x-msgpack-stream' ],
+            }))
+        rsp = app.get('/test?count=3', headers = headers)
+        assert rsp.status_int == 200 and rsp.content_type == 'application/x-msgpack-stream'
+        assert list(msgpack.Unpacker(StringIO(rsp.body), raw = False)) == [ { 'id': 0 }, { 'id': 1 }, { 'id': 2 } ]
+        rsp = app.get('/test?count=3&fail=1', headers = headers)
+        values = list(msgpack.Unpacker(StringIO(rsp.body), raw = False))
+        assert values[0] == { 'id': 0 } and values[1]['error']['reason'] == 'Failed' and len(values) == 2
+    produced = []
+    def generate():
+        """Generate the values
+        """
+        for i in range(3):
+            produced.append(i)
+            yield i
+    body = MsgpackStreamContentBuilder(chunkSize = 1).build(Response(), GeneratorEndpointExecutionResult(0, generate()))
+    assert next(body) == msgpack.packb(0) and produced == []
+    assert next(body) == msgpack.packb(0) and produced == [ 0 ]
+
+BILLION_LAUGHS = u'''<?xml version="1.0" encoding="utf-16"?>
+<!DOCTYPE a [
+<!ENTITY a0 "laugh">
+%s
+]>
+<a>&a9;</a>''' % u'\n'.join(u'<!ENTITY a%d "%s">' % (i, u'&a%d;' % (i - 1) * 10) for i in range(1, 10))
+
+def test_web_content_xml():
+    """Test the xml content
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self, count, fail = None):
+            """Test
+            """
+            for i in range(int(count)):
+                if fail and i == int(fail):
+                    raise BadRequestError(reason = 'Failed')
+                yield { 'id': i, 'name': u'<名字>' }
+
+        @post('/echo')
+        @endpoint()
+        def echo(self):
+            """Echo
+            """
+            return context.request.content.data
+
+    parser = XmlContentParser()
+    load = lambda text: parser.load(StringIO(text))
+    for containerClass in (PlainContentContainer, APIContentContainer):
+        app = TestApp(createWSGIApplication([ TestService() ], {
+            CONFIG_RESPONSE_CONTENT_CONTAINER: containerClass,
+            CONFIG_RESPONSE_MIMETYPE: [ mime.APPLICATION_JSON, mime.APPLICATION_XML ],
+            }))
+        rsp = app.get('/test?count=2', headers = { 'Accept': mime.APPLICATION_XML })
+        assert rsp.status_int == 200 and rsp.content_type == mime.APPLICATION_XML
+        assert '<item><id>0</id><name>&lt;名字&gt;</name></item>' in rsp.body
+        value = load(rsp.body)
+        if containerClass is APIContentContainer:
+            value = value['value']
+        assert value == [ { 'id': '0', 'name': u'<名字>' }, { 'id': '1', 'name': u'<名字>' } ]
+        # The trailing error
+        rsp = app.get('/test?count=3&fail=1', headers = { 'Accept': mime.APPLICATION_XML })
+        value = load(rsp.body)
+        if containerClass is APIContentContainer:
+            assert len(value['value']) == 1 and value['error']['reason'] == 'Failed'
+        else:
+            assert len(value) == 2 and value[1]['error']['reason'] == 'Failed'
+        # The parser
+        rsp = app.post('/echo', params = '<request><key><item>1</item><item>2</item></key><entry key="a b">c</entry></request>',
+            content_type = mime.APPLICATION_XML, headers = { 'Accept': mime.APPLICATION_JSON })
+        value = json.loads(rsp.text)
+        if containerClass is APIContentContainer:
+            value = value['value']
+        assert value == { 'key': [ '1', '2' ], 'a b': 'c' }
+        for content, status in (
+            ('<a>' * 100 + '</a>' * 100, 400),
+            ('<!DOCTYPE a [<!ENTITY b "c">]><a>&b;</a>', 400),
+            (BILLION_LAUGHS.encode('utf-16'), 400),
+            ('<a>', 400),
+            ('<a>%s</a>' % ('a' * (XmlContentParser.MAX_SIZE + 1)), 413),
+            ):
+            rsp = app.post('/echo', params = content, content_type = mime.APPLICATION_XML, expect_errors = True)
+            assert rsp.status_int == status
+    # The unicode keys and non-ascii values
+    class Response(object):
+        encoding = 'utf-8'
+    for value in ({ u'name': u'cafe' }, { u'name': u'caf\xe9', u'名字': u'值' }):
+        body = list(XmlContentBuilder().build(Response(), [ value ]))
+        assert all(isinstance(x, str) for x in body) and load(''.join(body)) == value
+    # The content is streamed
+    produced = []
+    def generate():
+        """Generate the values
+        """
+        for i in range(3):
+            produced.append(i)
+            yield i
+    class Response(object):
+        encoding = 'utf-8'
+    body = XmlContentBuilder(chunkSize = 1).build(Response(), IterableEndpointExecutionResult(generate()))
+    assert [ next(body) for _ in range(3) ] == [ '<?xml version="1.0" encoding="utf-8"?>', '<response>', '<item>0</item>' ] and produced == [ 0 ]
+    assert ''.join(body) == '<item>1</item><item>2</item></response>'
+
 def test_web_content_form():
     """Test web request with form content
     """
@@ -215,3 +633,987 @@ def test_web_content_form():
     rsp = app.post('/test', params = urllib.urlencode({ 'key': 'value' }), content_type = mime.APPLICATION_X_WWW_FORM_URLENCODED)
     value = json.loads(rsp.text)
     assert rsp.status_int == 200 and value['value'] == { 'key': [ 'value' ] }
+
+def test_web_router():
+    """Test the web router
+    """
+    router = Router()
+    for path, method, host in [
+        ('/', None, None),
+        ('/items', 'GET', None),
+        ('/items', 'POST', None),
+        ('/items/', 'GET', None),
+        ('/items/new', 'GET', None),
+        ('/items/<id>', 'GET', None),
+        ('/items/<int:id>', 'GET', None),
+        ('/items/<int:id>', 'DELETE', None),
+        ('/items/<int:id>/v<int(min=1):version>', 'GET', None),
+        ('/files/<path:path>', 'GET', None),
+        ('/files/<path:path>/edit', 'POST', None),
+        ('/files/<path:path>.json', 'GET', None),
+        ('/host', 'GET', 'example.com'),
+        ]:
+        router.add(WebEndpoint(path, method = method, host = host), path)
+
+    def match(path, method = 'GET', host = 'localhost'):
+        """Match and get the endpoint and parameters
+        """
+        webEndpoint, endpoint, params = router.match(method, path, host)
+        return endpoint, params
+
+    assert match('/') == ('/', {})
+    assert match('/items') == ('/items', {})
+    assert match('/items', 'POST') == ('/items', {})
+    assert match('/items', 'HEAD') == ('/items', {})
+    assert match('/items/') == ('/items/', {})
+    assert match('/items/new') == ('/items/new', {})
+    assert match('/items/1') == ('/items/<int:id>', { 'id': 1 })
+    assert match('/items/1', 'DELETE') == ('/items/<int:id>', { 'id': 1 })
+    assert match('/items/abc') == ('/items/<id>', { 'id': u'abc' })
+    assert match(u'/items/你') == ('/items/<id>', { 'id': u'你' })
+    assert match('/items/1/v2') == ('/items/<int:id>/v<int(min=1):version>', { 'id': 1, 'version': 2 })
+    assert match('/files/a/b/c') == ('/files/<path:path>', { 'path': u'a/b/c' })
+    assert match('/files/a/b/edit', 'POST') == ('/files/<path:path>/edit', { 'path': u'a/b' })
+    assert match('/files/a/b.json') == ('/files/<path:path>.json', { 'path': u'a/b' })
+    assert match('/host', host = 'example.com:8080') == ('/host', {})
+    for path, method, host, errorClass in [
+        ('/notfound', 'GET', 'localhost', NotFoundError),
+        ('/items/1/v0', 'GET', 'localhost', NotFoundError),
+        ('/items/new/v1', 'GET', 'localhost', NotFoundError),
+        ('/files/', 'GET', 'localhost', NotFoundError),
+        ('/host', 'GET', 'localhost', NotFoundError),
+        ('/items', 'PUT', 'localhost', MethodNotAllowedError),
+        ('/items/1', 'POST', 'localhost', MethodNotAllowedError),
+        ('/files/a/edit', 'PUT', 'localhost', MethodNotAllowedError),
+        ]:
+        try:
+            match(path, method, host)
+            assert False, path
+        except errorClass:
+            pass
+
+def test_web_route_cache():
+    """Test the route match result cache
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test/<int:id>')
+        @endpoint()
+        def test(self, id):
+            """Test
+            """
+            return str(id)
+
+    adapter = createWSGIApplication([ TestService() ], adapterConfigs = { 'web.routeCache.size': 2 })
+    app = TestApp(adapter)
+    for _ in range(2):
+        rsp = app.get('/test/1')
+        assert rsp.status_int == 200 and rsp.text == '1'
+        rsp = app.get('/test/a', expect_errors = True)
+        assert rsp.status_int == 404
+    assert adapter.routeCache.getStats() == { 'size': 2, 'hits': 2, 'misses': 2 }
+    # The least recently used one is removed
+    for method in ('get', 'post', 'get'):
+        rsp = getattr(app, method)('/test/1', expect_errors = True)
+        assert rsp.status_int == (200 if method == 'get' else 405)
+    assert adapter.routeCache.getStats() == { 'size': 2, 'hits': 4, 'misses': 3 }
+    assert not ('GET', 'localhost:80', u'/test/a') in adapter.routeCache
+    # Cleared when restarted
+    adapter.server.stop()
+    assert adapter.routeCache is None
+    adapter.server.start()
+    assert adapter.routeCache.getStats() == { 'size': 0, 'hits': 0, 'misses': 0 }
+
+def test_web_negotiation_cache():
+    """Test the accept negotiation cache
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            return 'OK'
+
+    service = TestService()
+    adapter = createWSGIApplication([ service ])
+    server = adapter.server
+    app = TestApp(adapter)
+    for _ in range(2):
+        rsp = app.get('/test', headers = { 'Accept': 'text/plain', 'Accept-Charset': 'ascii' })
+        assert rsp.status_int == 200 and rsp.headers['Content-Type'] == 'text/plain; charset=ascii' and rsp.text == 'OK'
+        rsp = app.get('/test', headers = { 'Accept': 'image/png' }, expect_errors = True)
+        assert rsp.status_int == 406
+    # The mimetype and encoding of the 2 accept headers, cached per execution context
+    cache = WebResponse.getNegotiationCache(server.getExecutionContext(adapter, service, service.endpoints['test']))
+    assert cache.getStats() == { 'size': 4, 'hits': 4, 'misses': 4 }
+    # Released with the execution contexts
+    server.stop()
+    assert WebResponse.getNegotiationCache(server.getExecutionContext(adapter, service, service.endpoints['test'])) is not cache
+
+def test_web_connection():
+    """Test the connection shared by the requests of a keep-alive connection
+    """
+    from gevent import pywsgi, socket
+    from unifiedrpc.adapters.web.geventhandler import WSGIHandler
+
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            return '%d:%d' % (id(context.connection), context.connection.remote.port)
+
+    class TestSocket(object):
+        """The test socket
+        """
+        def __init__(self):
+            """Create a new TestSocket
+            """
+            self.calls = []
+
+        def getpeername(self):
+            """Get the peer name
+            """
+            self.calls.append('getpeername')
+            return ('127.0.0.1', 10000)
+
+    # The info is loaded on first access
+    sock = TestSocket()
+    connection = Connection({ 'wsgi.socket': sock })
+    assert not sock.calls and not connection.ssl
+    assert connection.remote.host == '127.0.0.1' and connection.remote.port == 10000
+    assert connection.remote.port == 10000 and sock.calls == [ 'getpeername' ]
+    # The gevent server
+    server = pywsgi.WSGIServer(('127.0.0.1', 0), createWSGIApplication([ TestService() ]), handler_class = WSGIHandler, log = None)
+    server.start()
+    try:
+        results = []
+        for _ in range(2):
+            client = httplib.HTTPConnection('127.0.0.1', server.server_port)
+            client.sock = socket.create_connection(('127.0.0.1', server.server_port))
+            for _ in range(2):
+                client.request('GET', '/test')
+                rsp = client.getresponse()
+                assert rsp.status == 200
+                results.append(rsp.read())
+            assert results[-1] == results[-2] and int(results[-1].split(':')[1]) == client.sock.getsockname()[1]
+            client.close()
+        assert results[0].split(':')[1] != results[2].split(':')[1]
+    finally:
+        server.stop()
+
+def test_web_prefork():
+    """Test the pre-fork workers with the shared listener and SO_REUSEPORT
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @startup('web')
+        def onStartup(self, adapter):
+            """Startup in each worker
+            """
+            self.startupPid = os.getpid()
+
+        @get('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            return '%d:%d:%d' % (context.server.workerId, os.getpid(), self.startupPid)
+
+    def request(port):
+        """Request the worker
+        Returns:
+            A tuple (worker id, pid), None if failed to connect
+        """
+        try:
+            client = httplib.HTTPConnection('127.0.0.1', port, timeout = 5)
+            client.request('GET', '/test', headers = { 'Connection': 'close' })
+            rsp = client.getresponse()
+            body = rsp.read()
+            client.close()
+        except socket.error:
+            return
+        assert rsp.status == 200
+        workerId, pid, startupPid = map(int, body.split(':'))
+        assert pid == startupPid
+        return workerId, pid
+
+    def collect(port, count):
+        """Collect the workers until count workers are found
+        Returns:
+            A dict which key is the worker id and value is the pid
+        """
+        workers, deadline = {}, time.time() + 10
+        while len(workers) < count and time.time() < deadline:
+            result = request(port)
+            if result:
+                workers[result[0]] = result[1]
+            else:
+                time.sleep(0.05)
+        assert sorted(workers.keys()) == range(count)
+        return workers
+
+    for reusePort in (False, True):
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        port = listener.getsockname()[1]
+        listener.close()
+        supervisorPid = os.fork()
+        if supervisorPid == 0:
+            try:
+                GeventServer([ TestService() ], [ GeventWebAdapter('127.0.0.1', port) ]).prefork(2, reusePort)
+            finally:
+                os._exit(0)
+        try:
+            workers = collect(port, 2)
+            # The crashed worker is restarted
+            crashedPid = workers[0]
+            os.kill(crashedPid, signal.SIGKILL)
+            deadline = time.time() + 10
+            while workers[0] == crashedPid and time.time() < deadline:
+                time.sleep(0.1)
+                workers = collect(port, 2)
+            assert workers[0] != crashedPid
+            # Stop
+            os.kill(supervisorPid, signal.SIGTERM)
+            pid, status = os.waitpid(supervisorPid, 0)
+            assert pid == supervisorPid and status == 0
+            for pid in workers.itervalues():
+                try:
+                    os.kill(pid, 0)
+                except OSError:
+                    pass
+                else:
+                    assert False, 'Worker [%d] is still running' % pid
+            assert request(port) is None
+        finally:
+            try:
+                os.kill(supervisorPid, signal.SIGTERM)
+                os.waitpid(supervisorPid, 0)
+            except OSError:
+                pass
+
+def test_web_certificate_cache():
+    """Test the peer certificate and authorization cache
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @requiressl(authorize = lambda cert: authorized.append(cert.fingerprint) or (cert.subject.commonName if cert.subject.commonName != 'blocked' else None))
+        @get('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            return '%s:%s' % (context.identity, context.connection.remote.cert.subject.commonName)
+
+    class TestSSLSocket(object):
+        """The test ssl socket
+        """
+        def __init__(self, commonName, notAfter = 'Oct 18 00:00:00 2036 GMT'):
+            """Create a new TestSSLSocket
+            """
+            self.commonName = commonName
+            self.notAfter = notAfter
+            self.parsed = 0
+
+        def getpeername(self):
+            """Get the peer name
+            """
+            return ('127.0.0.1', 10000)
+
+        def getpeercert(self, binaryForm = False):
+            """Get the peer certificate
+            """
+            if binaryForm:
+                return 'DER:%s:%s' % (self.commonName, self.notAfter)
+            self.parsed += 1
+            return {
+                'subject': ((('commonName', self.commonName), ), ),
+                'issuer': ((('commonName', 'ca'), ), ),
+                'notAfter': self.notAfter,
+                }
+
+    def request(sock):
+        """Request with the socket
+        """
+        return app.get('/test', extra_environ = { 'wsgi.socket': sock, 'wsgi.url_scheme': 'https' }, expect_errors = True)
+
+    authorized = []
+    Connection.CERTIFICATE_CACHE.clear()
+    app = TestApp(createWSGIApplication([ TestService() ]))
+    sock = TestSSLSocket('client')
+    for _ in range(3):
+        rsp = request(sock)
+        assert rsp.status_int == 200 and rsp.text == 'client:client'
+    assert sock.parsed == 1 and len(authorized) == 1
+    # The certificate is immutable
+    cert = Connection.CERTIFICATE_CACHE.get(authorized[0])
+    assert isinstance(cert, Certificate) and cert.subject.commonName == 'client' and not cert.isExpired()
+    try:
+        cert.subject.commonName = 'other'
+        assert False
+    except AttributeError:
+        pass
+    # The rejection is cached as well
+    sock = TestSSLSocket('blocked')
+    for _ in range(2):
+        assert request(sock).status_int == 403
+    assert sock.parsed == 1 and len(authorized) == 2
+    # The expired certificate is not cached
+    sock = TestSSLSocket('expired', 'Oct 18 00:00:00 2016 GMT')
+    for _ in range(2):
+        assert request(sock).status_int == 200
+    assert sock.parsed == 2 and len(authorized) == 4
+
+def test_web_response_writer():
+    """Test writing the response headers and body
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @head('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            context.response.headers['X-Count'] = 1
+            context.response.cookies['key'] = 'value'
+            context.response.cookies['key']['httponly'] = True
+            return u'你好'
+
+        @get('/test/stream')
+        @endpoint()
+        def stream(self):
+            """Test streaming
+            """
+            yield 'a'
+            yield 'b'
+
+    adapter = createWSGIApplication([ TestService() ])
+    app = TestApp(adapter)
+    rsp = app.get('/test')
+    assert rsp.status == '200 OK' and rsp.text == u'你好' and rsp.content_length == 6 and rsp.headers['X-Count'] == '1'
+    assert rsp.headers['Set-Cookie'] == 'key=value; HttpOnly; Path=/' and rsp.headers['Content-Type'] == 'text/plain; charset=utf-8'
+    rsp = app.head('/test')
+    assert rsp.status_int == 200 and not rsp.body and rsp.content_length == 6
+    # The length of the streaming response is unknown
+    responses = []
+    body = adapter(EnvironBuilder('/test/stream').get_environ(), lambda status, headers: responses.append((status, dict(headers))))
+    assert list(body) == [ 'a', 'b' ] and responses[0][0] == '200 OK' and not 'Content-Length' in responses[0][1]
+
+def test_web_fast_path():
+    """Test the fast path of trivial endpoints
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @head('/test')
+        @endpoint()
+        def test(self, value = u'OK'):
+            """Test
+            """
+            return value
+
+        @get('/test/redirect')
+        @endpoint()
+        def redirect(self):
+            """Test redirect
+            """
+            context.response.redirect('/test')
+
+        @get('/test/error')
+        @endpoint()
+        def error(self):
+            """Test error
+            """
+            raise NotFoundError
+
+        @paramtype(number = int)
+        @get('/test/number')
+        @endpoint()
+        def number(self, number):
+            """Test number
+            """
+            return str(number)
+
+        @get('/test/headers')
+        @endpoint()
+        def headers(self):
+            """Test the headers replaced by the fast path
+            """
+            context.response.headers['Content-Type'] = 'text/html'
+            context.response.headers['Content-Length'] = '100'
+            return 'OK'
+
+    service = TestService()
+    adapter = WebAdapter()
+    server = Server([ service ], [ adapter ])
+    server.start()
+    # Check the fast path
+    assert adapter.isFastPath(server.getExecutionContext(adapter, service, service.endpoints['test']))
+    assert not adapter.isFastPath(server.getExecutionContext(adapter, service, service.endpoints['number']))
+    # Test
+    app = TestApp(adapter)
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.content_type == 'text/plain' and rsp.text == 'OK' and rsp.content_length == 2
+    rsp = app.get('/test?value=%E4%BD%A0')
+    assert rsp.status_int == 200 and rsp.charset == 'utf-8' and rsp.text == u'你'
+    rsp = app.head('/test')
+    assert rsp.status_int == 200 and rsp.content_type == 'text/plain' and not rsp.body
+    rsp = app.get('/test?a=1', expect_errors = True)
+    assert rsp.status_int == 400
+    rsp = app.get('/test', headers = { 'Accept': mime.APPLICATION_JSON }, expect_errors = True)
+    assert rsp.status_int == 406
+    rsp = app.get('/test/redirect')
+    assert rsp.status_int == 302 and rsp.headers['Location'].endswith('/test')
+    rsp = app.get('/test/error', expect_errors = True)
+    assert rsp.status_int == 404 and json.loads(rsp.headers['X-SERVER-ERROR'])['code'] is None
+    rsp = app.get('/test/number?number=1')
+    assert rsp.status_int == 200 and rsp.text == '1'
+    assert adapter.isFastPath(server.getExecutionContext(adapter, service, service.endpoints['headers']))
+    rsp = app.get('/test/headers')
+    assert rsp.status_int == 200 and rsp.text == 'OK'
+    assert [ (name, value) for (name, value) in rsp.headerlist if name.lower() in ('content-type', 'content-length') ] == \
+        [ ('Content-Type', 'text/plain; charset=utf-8'), ('Content-Length', '2') ]
+    # Disable the fast path after started
+    service.endpoints['test']._stage.addPostRequest(lambda bound: None)
+    assert not adapter.isFastPath(server.getExecutionContext(adapter, service, service.endpoints['test']))
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.content_type == 'text/plain' and rsp.text == 'OK'
+
+def test_web_wsgi_streaming():
+    """Test serving the services by a WSGI application with streaming response
+    """
+    produced = []
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self, count):
+            """Test
+            """
+            for i in range(int(count)):
+                produced.append(i)
+                yield 'line%d\n' % i
+
+    app = createWSGIApplication([ TestService() ])
+    # The content is produced when it's consumed
+    statuses = []
+    body = app(EnvironBuilder('/test', query_string = 'count=3').get_environ(), lambda status, headers: statuses.append(status))
+    assert next(body) == 'line0\n' and produced == [ 0 ] and statuses == [ '200 OK' ]
+    assert next(body) == 'line1\n' and produced == [ 0, 1 ]
+    body.close()
+    assert produced == [ 0, 1 ]
+    # Test
+    rsp = TestApp(app).get('/test?count=3')
+    assert rsp.status_int == 200 and rsp.text == 'line0\nline1\nline2\n'
+    # Shut down
+    assert app.server.started
+    app.server.stop()
+    assert not app.server.started and not app.started
+
+def test_web_threadpool():
+    """Test running the endpoint in thread pool
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @threadpool(queueSize = 0, pool = FuturesThreadPool(1))
+        @get('/test')
+        @endpoint()
+        def test(self, value):
+            """Test
+            """
+            return '%s:%s:%s' % (value, context.request.path, current_thread() is threadMain)
+
+    threadMain = current_thread()
+    service = TestService()
+    app = TestApp(createWSGIApplication([ service ]))
+    rsp = app.get('/test?value=1')
+    assert rsp.status_int == 200 and rsp.text == '1:/test:False'
+    # The queue is full
+    caller = [ h.callableObject.obj for h in service.endpoints['test']._stage._calling if isinstance(h.callableObject.obj, ThreadPoolCaller) ][0]
+    caller._slots.acquire()
+    rsp = app.get('/test?value=1', expect_errors = True)
+    assert rsp.status_int == 503
+    caller._slots.release()
+    rsp = app.get('/test?value=2')
+    assert rsp.status_int == 200 and rsp.text == '2:/test:False'
+
+def test_web_threadpool_class():
+    """Test the thread pool is created by the class of the server
+    """
+    for serverClass, poolClass in ((Server, FuturesThreadPool), (GeventServer, GeventThreadPool)):
+        class TestService(Service):
+            """The test service
+            """
+            @threadpool(1)
+            @get('/test')
+            @endpoint()
+            def test(self):
+                """Test
+                """
+                return 'OK'
+
+        service = TestService()
+        adapter = WebAdapter()
+        serverClass([ service ], [ adapter ]).start()
+        rsp = TestApp(adapter).get('/test')
+        assert rsp.status_int == 200 and rsp.text == 'OK'
+        caller = [ h.callableObject.obj for h in service.endpoints['test']._stage._calling if isinstance(h.callableObject.obj, ThreadPoolCaller) ][0]
+        assert type(caller.pool) is poolClass
+
+def test_web_bulkhead():
+    """Test limiting the concurrent calls
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @bulkhead(1, retryAfter = 5)
+        @get('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            return 'OK'
+
+    service = TestService()
+    app = TestApp(createWSGIApplication([ service ]))
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.text == 'OK'
+    # Occupy the bulkhead
+    _bulkhead = service.endpoints['test'].getConfig(CONFIG_ENDPOINT_BULKHEAD)
+    _bulkhead.enter()
+    rsp = app.get('/test', expect_errors = True)
+    assert rsp.status_int == 503 and rsp.headers['Retry-After'] == '5'
+    assert _bulkhead.getStats() == { 'inflight': 1, 'waiting': 0, 'rejected': 1 }
+    _bulkhead.leave()
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.text == 'OK'
+
+def test_web_bulkhead_stream():
+    """Test the streaming endpoint holds the bulkhead until the content is consumed
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @bulkhead(1)
+        @get('/test')
+        @endpoint()
+        def test(self, count):
+            """Test
+            """
+            for i in range(int(count)):
+                yield 'line%d\n' % i
+
+    service = TestService()
+    app = createWSGIApplication([ service ])
+    _bulkhead = service.endpoints['test'].getConfig(CONFIG_ENDPOINT_BULKHEAD)
+    # Exhausted
+    body = app(EnvironBuilder('/test', query_string = 'count=2').get_environ(), lambda status, headers: None)
+    assert next(body) == 'line0\n' and _bulkhead.inflight == 1
+    assert list(body) == [ 'line1\n' ] and _bulkhead.inflight == 0
+    # Closed
+    body = app(EnvironBuilder('/test', query_string = 'count=2').get_environ(), lambda status, headers: None)
+    assert next(body) == 'line0\n' and _bulkhead.inflight == 1
+    body.close()
+    assert _bulkhead.getStats() == { 'inflight': 0, 'waiting': 0, 'rejected': 0 }
+    rsp = TestApp(app).get('/test?count=2')
+    assert rsp.status_int == 200 and rsp.text == 'line0\nline1\n' and _bulkhead.inflight == 0
+
+def test_web_bulkhead_greenlets():
+    """Test the default bulkhead with the concurrent greenlets (threading is not patched)
+    """
+    import gevent
+
+    class TestService(Service):
+        """The test service
+        """
+        @bulkhead(1, queueSize = 5)
+        @get('/test')
+        @endpoint()
+        def test(self, value):
+            """Test
+            """
+            gevent.sleep(0.02)
+            return value
+
+    service = TestService()
+    app = TestApp(createWSGIApplication([ service ]))
+    greenlets = [ gevent.spawn(app.get, '/test?value=%d' % i) for i in range(3) ]
+    gevent.joinall(greenlets, timeout = 5)
+    assert [ x.value.text for x in greenlets ] == [ '0', '1', '2' ]
+    assert service.endpoints['test'].getConfig(CONFIG_ENDPOINT_BULKHEAD).getStats() == { 'inflight': 0, 'waiting': 0, 'rejected': 0 }
+
+def test_web_deadline():
+    """Test the request deadline
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @timeout(0.05)
+        @get('/test')
+        @endpoint()
+        def test(self, delay = 0):
+            """Test
+            """
+            return '%.2f' % context.getRemainingTime()
+
+        @get('/test/stream')
+        @endpoint()
+        def stream(self, count):
+            """Test streaming
+            """
+            try:
+                for i in range(int(count)):
+                    produced.append(i)
+                    yield 'line%d\n' % i
+                    time.sleep(0.06)
+            finally:
+                produced.append('closed')
+
+    def delay(bound):
+        """Delay the calling stage
+        """
+        delays.append(context.request.path)
+        time.sleep(float(context.dispatchResult.parameters.get('delay', 0)))
+
+    produced, delays = [], []
+    service = TestService()
+    service.endpoints['test']._stage.addPreRequest(delay)
+    app = TestApp(createWSGIApplication([ service ]))
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and 0 < float(rsp.text) <= 0.05
+    rsp = app.get('/test?delay=0.1', expect_errors = True)
+    assert rsp.status_int == 408
+    # The header could only shorten the deadline
+    rsp = app.get('/test', headers = { 'X-Request-Timeout': '10' })
+    assert rsp.status_int == 200 and float(rsp.text) <= 0.05
+    rsp = app.get('/test', headers = { 'X-Request-Timeout': '0' }, expect_errors = True)
+    assert rsp.status_int == 408
+    # The request arrived already expired is rejected before the pre-request stage
+    del delays[:]
+    rsp = app.get('/test', headers = { 'X-Request-Timeout': '0' }, expect_errors = True)
+    assert rsp.status_int == 408 and not delays
+    # The streaming is truncated and the generator is closed when the deadline exceeded
+    rsp = app.get('/test/stream?count=10', headers = { 'X-Request-Timeout': '0.05' })
+    assert rsp.status_int == 200 and rsp.body == 'line0\nline1\n' and produced == [ 0, 1, 'closed' ]
+
+def test_web_error_response_cache():
+    """Test the pre-rendered error responses
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @head('/test')
+        @endpoint()
+        def test(self, detail = None):
+            """Test
+            """
+            raise BadRequestError(reason = 'Bad value', detail = detail)
+
+    adapter = createWSGIApplication([ TestService() ])
+    app = TestApp(adapter)
+    rsp = app.get('/test', expect_errors = True)
+    assert rsp.status_int == 400 and json.loads(rsp.headers['X-SERVER-ERROR'])['reason'] == 'Bad value' and rsp.content_length == 0
+    assert len(adapter.errorResponseCache) == 1
+    # Served by the cache
+    cachedRsp = app.get('/test', expect_errors = True)
+    assert cachedRsp.status == rsp.status and cachedRsp.headers.items() == rsp.headers.items() and cachedRsp.body == rsp.body
+    rsp = app.head('/test', expect_errors = True)
+    assert rsp.status_int == 400 and not rsp.body and len(adapter.errorResponseCache) == 1
+    # The error with detail isn't cached
+    rsp = app.get('/test?detail=value', expect_errors = True)
+    assert rsp.status_int == 400 and json.loads(rsp.headers['X-SERVER-ERROR'])['detail'] == 'value'
+    assert len(adapter.errorResponseCache) == 1
+    # The error out of the execution
+    for _ in range(2):
+        rsp = app.get('/notfound', expect_errors = True)
+        assert rsp.status_int == 404 and not rsp.body
+    rsp = app.get('/test', headers = { 'Accept': mime.APPLICATION_JSON }, expect_errors = True)
+    assert rsp.status_int == 406 and len(adapter.errorResponseCache) == 3
+    # Bounded, the least recently used responses are evicted
+    adapter.errorResponseCache.size = 2
+    rsp = app.get('/notfound', expect_errors = True)
+    assert rsp.status_int == 404
+    rsp = app.post('/test', expect_errors = True)
+    assert rsp.status_int == 405 and len(adapter.errorResponseCache) == 2
+    misses = adapter.errorResponseCache.misses
+    rsp = app.get('/notfound', expect_errors = True)
+    assert rsp.status_int == 404 and adapter.errorResponseCache.misses == misses
+    rsp = app.get('/test', expect_errors = True)
+    assert rsp.status_int == 400 and adapter.errorResponseCache.misses == misses + 1
+    # Disabled
+    class NoCacheWebAdapter(WebAdapter):
+        ERROR_RESPONSE_CACHE_SIZE = 0
+    adapter = createWSGIApplication([ TestService() ], adapterClass = NoCacheWebAdapter)
+    rsp = TestApp(adapter).get('/test', expect_errors = True)
+    assert rsp.status_int == 400 and adapter.errorResponseCache is None
+
+def test_web_error_response_nocache():
+    """Test the error responses out of the execution when the pre-rendered error responses cache is disabled
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self, value = None):
+            """Test
+            """
+            if value:
+                context.response.headers['X-Value'] = value
+            return 'OK'
+
+    class NoCacheWebAdapter(WebAdapter):
+        ERROR_RESPONSE_CACHE_SIZE = 0
+
+    adapter = createWSGIApplication([ TestService() ], adapterClass = NoCacheWebAdapter)
+    app = TestApp(adapter)
+    assert adapter.errorResponseCache is None
+    for _ in range(2):
+        rsp = app.get('/missing', expect_errors = True)
+        assert rsp.status_int == 404 and not rsp.body
+        rsp = app.post('/test', expect_errors = True)
+        assert rsp.status_int == 405 and not rsp.body
+        # The invalid header fails the response
+        rsp = app.get('/test', params = { 'value': 'a\nb' }, expect_errors = True)
+        assert rsp.status_int == 500 and not rsp.body and not 'X-Value' in rsp.headers
+    rsp = app.get('/test')
+    assert rsp.status_int == 200 and rsp.text == 'OK'
+
+def test_web_error_response_cache_codec():
+    """Test the pre-rendered error responses of the endpoints with different codecs and encodings
+    """
+    from unifiedrpc.content.codec import StdJsonCodec
+
+    class NewlineCodec(StdJsonCodec):
+        """The codec which appends a newline
+        """
+        def dumps(self, value, encoding = 'utf-8'):
+            """Encode the value
+            """
+            return super(NewlineCodec, self).dumps(value, encoding) + '\n'
+
+    class TestService(Service):
+        """The test service
+        """
+        @get('/a')
+        @endpoint()
+        def a(self):
+            """Test
+            """
+            raise BadRequestError(reason = u'错误')
+
+        @codec(NewlineCodec())
+        @get('/b')
+        @endpoint()
+        def b(self):
+            """Test
+            """
+            raise BadRequestError(reason = u'错误')
+
+    adapter = createWSGIApplication([ TestService() ], {
+        CONFIG_RESPONSE_CONTENT_CONTAINER: APIContentContainer,
+        CONFIG_RESPONSE_MIMETYPE: mime.APPLICATION_JSON,
+        })
+    app = TestApp(adapter)
+    for _ in range(2):
+        rsp = app.get('/a', expect_errors = True)
+        assert rsp.status_int == 400 and not rsp.body.endswith('\n')
+        rsp = app.get('/b', expect_errors = True)
+        assert rsp.status_int == 400 and rsp.body.endswith('\n')
+        rsp = app.get('/a', headers = { 'Accept-Charset': 'gbk' }, expect_errors = True)
+        assert rsp.status_int == 400 and json.loads(rsp.body.decode('gbk'))['error']['reason'] == u'错误'
+    assert len(adapter.errorResponseCache) == 3
+
+def test_web_header_injection():
+    """Test the headers with newline are rejected
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self, name = 'X-Value', value = 'value'):
+            """Test in the fast path
+            """
+            context.response.headers[name] = value
+            return 'OK'
+
+        @container(APIContentContainer)
+        @mimetype(mime.APPLICATION_JSON)
+        @get('/json')
+        @endpoint()
+        def json(self, name = 'X-Value', value = 'value'):
+            """Test in the full pipeline
+            """
+            context.response.headers[name] = value
+            return { 'key': 'value' }
+
+    adapter = createWSGIApplication([ TestService() ], { CONFIG_RESPONSE_MIMETYPE: [ 'text/plain', mime.APPLICATION_JSON ] })
+    app = TestApp(adapter)
+    for path in ('/test', '/json'):
+        rsp = app.get(path)
+        assert rsp.status_int == 200 and rsp.headers['X-Value'] == 'value'
+        for params in ({ 'value': 'a\r\nSet-Cookie: key=value' }, { 'value': 'a\nb' }, { 'name': 'X-Value\r\nSet-Cookie: key' }):
+            rsp = app.get(path, params = params, expect_errors = True)
+            assert rsp.status_int == 500 and not 'Set-Cookie' in rsp.headers and not 'X-Value' in rsp.headers
+
+def test_web_error_header():
+    """Test the error header of the plain container is ascii
+    """
+    class TestService(Service):
+        """The test service
+        """
+        @get('/test')
+        @endpoint()
+        def test(self):
+            """Test
+            """
+            raise BadRequestError(reason = u'错误', detail = u'详情')
+
+    app = TestApp(createWSGIApplication([ TestService() ], { CONFIG_RESPONSE_CONTENT_CODEC: 'json' }))
+    rsp = app.get('/test', expect_errors = True)
+    header = rsp.headers['X-SERVER-ERROR']
+    assert rsp.status_int == 400 and all(ord(x) < 128 for x in header)
+    assert json.loads(header) == { 'code': None, 'reason': u'错误', 'detail': u'详情' }
+
+class CpuBoundService(Service):
+    """The cpu bound test service
+    NOTE:
+        The service should be defined at module level in order to be found by the worker processes
+    """
+    @cpubound(spoolThreshold = 4)
+    @get('/test')
+    @endpoint()
+    def test(self, value, action = None):
+        """Test
+        """
+        if action == 'error':
+            raise BadRequestError(reason = value)
+        elif action == 'crash':
+            os._exit(1)
+        elif action == 'value':
+            raise ValueError(value)
+        elif action == 'self':
+            return self.name
+        return '%s:%s' % (value, os.getpid())
+
+def test_web_cpubound():
+    """Test running the endpoint in process pool
+    """
+    app = createWSGIApplication([ CpuBoundService() ])
+    server = app.server
+    assert server.processPool
+    app = TestApp(app)
+    rsp = app.get('/test?value=1')
+    value, pid = rsp.text.split(':')
+    assert rsp.status_int == 200 and value == '1' and int(pid) != os.getpid()
+    # Spooled
+    rsp = app.get('/test?value=%s' % ('a' * 1024))
+    assert rsp.status_int == 200 and rsp.text.split(':')[0] == 'a' * 1024
+    # Error
+    rsp = app.get('/test?value=invalid&action=error', expect_errors = True)
+    assert rsp.status_int == 400 and json.loads(rsp.headers['X-SERVER-ERROR'])['reason'] == 'invalid'
+    # The executor is called without the service instance
+    rsp = app.get('/test?value=1&action=self', expect_errors = True)
+    assert rsp.status_int == 500
+    try:
+        ProcessPoolTask(CpuBoundService.__module__, CpuBoundService.__name__, 'test', { 'value': '1', 'action': 'self' })()
+        assert False
+    except AttributeError:
+        pass
+    # Crash
+    for _ in range(server.processPool.size + 1):
+        rsp = app.get('/test?value=1&action=crash', expect_errors = True)
+        assert rsp.status_int == 500
+    rsp = app.get('/test?value=1')
+    assert rsp.status_int == 200 and rsp.text.startswith('1:')
+    # Stop
+    server.stop()
+    assert not server.processPool
+
+def test_processpool_sockets():
+    """Test the worker replaced while serving doesn't hold the listener
+    """
+    def getSocketInodes(pid):
+        """Get the inodes of the sockets of the process
+        """
+        inodes = set()
+        for name in os.listdir('/proc/%d/fd' % pid):
+            try:
+                target = os.readlink('/proc/%d/fd/%s' % (pid, name))
+            except OSError:
+                continue
+            if target.startswith('socket:['):
+                inodes.add(int(target[8: -1]))
+        return inodes
+
+    if not os.path.isdir('/proc/self/fd'):
+        return
+    pool = ProcessPool(1)
+    pool.start()
+    listener = socket.socket()
+    try:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        # Crash the worker, the replacement is forked after the listener is created
+        try:
+            pool.run(ProcessPoolTask(CpuBoundService.__module__, CpuBoundService.__name__, 'test', { 'value': '1', 'action': 'crash' }))
+            assert False
+        except InternalServerError:
+            pass
+        worker = pool._workers[0]
+        assert pool.run(ProcessPoolTask(CpuBoundService.__module__, CpuBoundService.__name__, 'test', { 'value': '1' })) == '1:%d' % worker.process.pid
+        assert not os.fstat(listener.fileno()).st_ino in getSocketInodes(worker.process.pid)
+    finally:
+        listener.close()
+        pool.stop()
+
+def test_processpool_interrupted():
+    """Test the worker is replaced when the caller is interrupted before the result is received
+    """
+    def createTask(value, action = None):
+        """Create the task of the cpu bound test endpoint
+        """
+        return ProcessPoolTask(CpuBoundService.__module__, CpuBoundService.__name__, 'test', { 'value': value, 'action': action })
+
+    def interrupt(connection):
+        """Interrupt the caller after the task is sent
+        """
+        raise KeyboardInterrupt
+
+    pool = ProcessPool(1)
+    pool.start()
+    try:
+        pool.wait = interrupt
+        try:
+            pool.run(createTask('1'))
+            assert False
+        except KeyboardInterrupt:
+            pass
+        del pool.wait
+        # The result of the interrupted task isn't returned
+        assert pool.run(createTask('2')).startswith('2:')
+        # The standard error keeps its args
+        try:
+            pool.run(createTask('invalid', 'value'))
+            assert False
+        except ValueError as error:
+            assert str(error) == 'invalid'
+    finally:
+        pool.stop()
@@ -33,6 +33,27 @@ class Adapter(object):
         """
         raise NotImplementedError
 
+    def bind(self, reusePort = False):
+        """Bind the listener before the adapter is started
+        Parameters:
+            reusePort                   Bind the listener with SO_REUSEPORT
+        NOTE:
+            This is used by the pre-fork mode, the listener is bound in the supervisor process and shared by all
+            the workers, or bound in each worker with SO_REUSEPORT. The adapter without listener does nothing.
+        """
+        pass
+
+    def unbind(self):
+        """Close the listener bound by the bind method
+        """
+        pass
+
+    @property
+    def server(self):
+        """Get the server this adapter is attached to
+        """
+        return self._server
+
     @property
     def started(self):
         """Get if the adapter is started
@@ -11,7 +11,7 @@
 
 import logging
 
-from unifiedrpc.util import json
+from unifiedrpc.content.codec import getJsonCodec
 from unifiedrpc.errors import *
 
 ERROR_MAPPING = {
@@ -26,8 +26,11 @@ ERROR_MAPPING = {
     413     : RequestEntityTooLargeError,
     415     : UnsupportedMediaTypeError,
     500     : InternalServerError,
+    503     : ServiceUnavailableError,
     }
 
+MSGPACK_MIMETYPES = frozenset([ 'application/msgpack', 'application/x-msgpack', 'application/x-msgpack-stream' ])
+
 class UnhandledHttpError(RPCError):
     """The unhandled http error
     """
@@ -44,10 +47,14 @@ class Http2UnifiedRPCErrorHandler(object):
     """
     logger = logging.getLogger('unifiedrpc.adapters.requests.http2UnifiedRPCErrorHandler')
 
-    def __init__(self, mapping = None):
+    def __init__(self, mapping = None, codec = None):
         """Create a new HttpErrorHandler
+        Parameters:
+            mapping                     The http status code --> error class
+            codec                       The json codec name or JsonCodec object
         """
         self.mapping = mapping or ERROR_MAPPING
+        self.codec = getJsonCodec(codec)
 
     def getUnifiedRPCError(self, response):
         """Get unifiedrpc error from response
@@ -63,12 +70,11 @@ class Http2UnifiedRPCErrorHandler(object):
             errorClass = UnhandledHttpError
             initKwargs['httpStatusCode'] = response.status_code
         # Try to decode the content as standard error
-        # TODO: Support handling more response content format
         # Try to get error from header
         if 'X-SERVER-ERROR' in response.headers:
             # Load from header
             try:
-                error = json.loads(response.headers['X-SERVER-ERROR'])
+                error = self.codec.loads(response.headers['X-SERVER-ERROR'])
                 if error.get('code'):
                     initKwargs['code'] = error['code']
                 if error.get('reason'):
@@ -81,7 +87,7 @@ class Http2UnifiedRPCErrorHandler(object):
         else:
             # Load from content
             try:
-                error = json.loads(response.content)
+                error = self.loadContent(response)
                 if error.get('code'):
                     initKwargs['code'] = error['code']
                 if error.get('reason'):
@@ -94,6 +100,22 @@ class Http2UnifiedRPCErrorHandler(object):
         # Done
         return errorClass(**initKwargs)
 
+    def loadContent(self, response):
+        """Load the error object from the response content (json or msgpack)
+        NOTE:
+            The error object in the envelope of the api container is unwrapped
+        """
+        contentType = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if contentType in MSGPACK_MIMETYPES:
+            import msgpack
+            error = msgpack.unpackb(response.content, raw = False)
+        else:
+            error = self.codec.loads(response.content)
+        if isinstance(error.get('error'), dict):
+            error = error['error']
+        # Done
+        return error
+
     def handle(self, response):
         """Raise error if any error occurred
         Returns:
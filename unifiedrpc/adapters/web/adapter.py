@@ -6,36 +6,47 @@
 The known configs:
 
     request.encoding                    The default request encoding to use
+    request.timeout                     The seconds the request should be completed in, could be shortened by the
+                                        request header X-Request-Timeout
     response.mimeType                   The default response mime type to use
     response.encoding                   The default response encoding to use
     cookie.secret                       The cookie secret string to use
+    web.routeCache.size                 The max number of the cached route match results (adapter config only), 0 means
+                                        no cache. Use it when most requests hit a small set of urls
 
 """
 
+import time
 import logging
 import traceback
 
 from os import remove
 from os.path import exists
 
-from werkzeug.routing import Map
-from werkzeug.wrappers import Response as WKResponse
-from werkzeug.exceptions import HTTPException, NotFound, MethodNotAllowed
+from werkzeug.http import dump_cookie
+from werkzeug.exceptions import HTTPException
 
+from unifiedrpc.util import LRUCache
 from unifiedrpc.errors import *
 from unifiedrpc.adapters import Adapter
-from unifiedrpc.protocol import Service
-from unifiedrpc.definition import CONFIG_REQUEST_ENCODING, CONFIG_REQUEST_CONTENT_PARSER, CONFIG_SESSION_MANAGER, \
+from unifiedrpc.protocol import Service, createResponseResult, CONFIG_ENDPOINT_PARAMETER_TYPE
+from unifiedrpc.protocol.execution import GeneratorEndpointExecutionResult
+from unifiedrpc.definition import CONFIG_REQUEST_ENCODING, CONFIG_REQUEST_CONTENT_PARSER, CONFIG_REQUEST_TIMEOUT, CONFIG_SESSION_MANAGER, \
     CONFIG_RESPONSE_CONTENT_CONTAINER, CONFIG_RESPONSE_CONTENT_BUILDER
 from unifiedrpc.protocol.context import context, Context, setContext, clearContext
+from unifiedrpc.stages import ParameterConverter
+from unifiedrpc.content.builder import TextContentBuilder, AutomaticContentBuilder
+from unifiedrpc.content.container import PlainContentContainer
 
-from util import getContentType
+from util import getContentType, getStatusLine, getHeader, hasResponseBody
 from errors import ERROR_BINDINGS
 from request import WebRequest
 from response import WebResponse
+from router import Router
 from dispatch import WebDispatchResult
 from connection import Connection
-from definition import ENDPOINT_CHILDREN_WEBENDPOINT_KEY, STARTUP_SHUTDOWN_HANDLER_NAME, SSL_CLIENTAUTH_NONE, SSL_CLIENTAUTH_OPTIONAL, SSL_CLIENTAUTH_REQUIRED
+from definition import ENDPOINT_CHILDREN_WEBENDPOINT_KEY, STARTUP_SHUTDOWN_HANDLER_NAME, SSL_CLIENTAUTH_NONE, SSL_CLIENTAUTH_OPTIONAL, SSL_CLIENTAUTH_REQUIRED, \
+    CONFIG_WEB_ROUTECACHE_SIZE
 
 class WebAdapter(Adapter):
     """The web adapter
@@ -52,13 +63,25 @@ class WebAdapter(Adapter):
 
     DEFAULT_REQUEST_ENCODING    = 'utf8'
 
+    REQUEST_TIMEOUT_HEADER      = 'X-Request-Timeout'
+
+    # Whether to execute the trivial endpoints (See isFastPath) in the fast path or not
+    FAST_PATH                   = True
+    FAST_PATH_META_KEY          = 'web.fastPath'
+    FAST_PATH_MIMETYPE          = 'text/plain'
+
+    # The max number of the pre-rendered error responses to cache, 0 means no cache
+    ERROR_RESPONSE_CACHE_SIZE   = 1024
+
     def __init__(self, configs = None, stage = None):
         """Create a new WebAdapter
         Parameters:
             configs                     The adapter configs
             stage                       The execution stage
         """
-        self._urlMapper = None       # A werkzeug.routing.Map object
+        self._router = None          # The Router object
+        self._routeCache = None      # The LRUCache of route match results, key is (method, host, path)
+        self._errorResponses = None  # The LRUCache of pre-rendered error responses, key is the error response key, value is (status, headers, body)
         # Super
         super(WebAdapter, self).__init__(configs, stage)
         # Add handlers
@@ -68,8 +91,8 @@ class WebAdapter(Adapter):
     def __start__(self):
         """Start
         """
-        urlRules = []
-        # Start services and build up the url rules
+        router = Router()
+        # Start services and build up the router
         for service in self._server.services:
             hasWebEndpoint = False
             # Get endpoints
@@ -79,7 +102,9 @@ class WebAdapter(Adapter):
                 if webs:
                     # Good
                     for webEndpoint in webs:
-                        urlRules.append(webEndpoint.getUrlRule(endpoint))
+                        router.add(webEndpoint, endpoint)
+                    # Detect the fast path
+                    self.isFastPath(self._server.getExecutionContext(self, service, endpoint))
                     # Set flag
                     hasWebEndpoint = True
             # Start the service
@@ -88,14 +113,19 @@ class WebAdapter(Adapter):
                 handler = service.startups.get(STARTUP_SHUTDOWN_HANDLER_NAME)
                 if handler:
                     handler(service, self)
-        # Set the map
-        self._urlMapper = Map(urlRules)
+        # Set the router
+        self._router = router
+        routeCacheSize = self._configs.get(CONFIG_WEB_ROUTECACHE_SIZE)
+        self._routeCache = LRUCache(routeCacheSize) if routeCacheSize else None
+        self._errorResponses = LRUCache(self.ERROR_RESPONSE_CACHE_SIZE) if self.ERROR_RESPONSE_CACHE_SIZE else None
 
     def __stop__(self):
         """Close current adapter
         """
-        self._urlMapper = None
-        # Start services and build up the url rules
+        self._router = None
+        self._routeCache = None
+        self._errorResponses = None
+        # Shut down the services
         for service in self._server.services:
             hasWebEndpoint = False
             # Get endpoints
@@ -120,23 +150,19 @@ class WebAdapter(Adapter):
         Returns:
             Yield or list of string for http response content
         """
+        startTime = time.time()
         endpointExecutionContext = None
+        headersSent = False
         setContext(Context(server = self._server, adapter = self))
         try:
-            # Set the connection
-            context.connection = Connection(environ)
+            # Set the connection, created per request if the wsgi server doesn't provide it
+            context.connection = environ.get('wsgi.connection') or Connection(environ)
             # Execute
             endpointExecutionContext = None
             # The normal http processing
             execution = context.execution()
-            # Parse the request
+            # Create the request
             context.request = self.REQUEST_CLASS(environ)
-            if context.request.content and context.request.content.mimeType:
-                # Get the default encoding if not specified
-                if not context.request.content.encoding:
-                    context.request.content.encoding = execution.getConfig(CONFIG_REQUEST_ENCODING, self.DEFAULT_REQUEST_ENCODING)
-                # Parse the content data
-                context.request.content.data = execution.getConfig(CONFIG_REQUEST_CONTENT_PARSER).parse(context)
             # Get session
             sessionManager = execution.getConfig(CONFIG_SESSION_MANAGER)
             if sessionManager:
@@ -156,70 +182,87 @@ class WebAdapter(Adapter):
                     webEndpoint,
                     endpoint,
                     params,
-                    endpoint.bound if isinstance(endpoint.bound, Service) else None,
+                    endpoint.bindObject if isinstance(endpoint.bindObject, Service) else None,
                     )
                 # Update the execution
                 execution = context.execution()
+            # Set the deadline, the request arrived already expired is rejected before parsing the content and running
+            # the pre-request stage
+            context.deadline = self.getDeadline(context.request, execution, startTime)
+            context.checkDeadline()
+            # Parse the request content in the execution context of the endpoint (the content is parsed only when
+            # content type is present)
+            if environ.get('CONTENT_TYPE') and context.request.content and context.request.content.mimeType:
+                # Get the default encoding if not specified
+                if not context.request.content.encoding:
+                    context.request.content.encoding = execution.getConfig(CONFIG_REQUEST_ENCODING, self.DEFAULT_REQUEST_ENCODING)
+                # Parse the content data
+                context.request.content.data = execution.getConfig(CONFIG_REQUEST_CONTENT_PARSER).parse(context)
             # Generate the response
             context.response = self.RESPONSE_CLASS()
             # Call the execution
             endpointExecutionContext = execution.getEndpointExecutionContext()
-            endpointExecutionContext()
+            if webEndpoint and self.isFastPath(execution):
+                # The fast path, the response will be completed by the full pipeline if None is returned
+                fastResponse = self._executeFastPath(execution, endpointExecutionContext)
+                if fastResponse:
+                    status, headers, body = fastResponse
+                    startResponse(status, headers)
+                    headersSent = True
+                    if body:
+                        yield body
+                    return
+            else:
+                endpointExecutionContext()
             # Complete the response
             if not context.response.content.container:
                 context.response.content.container = context.response.getContentContainer(context.request, context.response, execution)
             if not context.response.content.builder:
                 context.response.content.builder = context.response.getContentBuilder(context.request, context.response, execution)
+            if not context.response.content.codec:
+                context.response.content.codec = context.response.getContentCodec(context.request, context.response, execution)
             if not context.response.encoding:
                 context.response.encoding = context.response.getEncoding(context.request, context.response, execution)
             if not context.response.mimeType:
                 context.response.mimeType = context.response.getMimeType(context.request, context.response, execution)
-            # Set session
-            if sessionManager:
-                sessionManager.set(context.session, context.response)
-            # Create the container and builder
-            container = context.response.content.container()
-            if context.response.content.executionResult:
-                container.setValue(context.response.content.executionResult)
-            if context.response.content.error:
-                container.setRPCError(context.response.content.error)
-            # Dump the container and set headers
-            containerValues, containerHeaders = container.dump()
-            if containerHeaders:
-                context.response.headers.update(containerHeaders)
+            # Use the pre-rendered response of the error
+            errorResponseKey = None if sessionManager else self.getErrorResponseKey(context.response)
+            if errorResponseKey:
+                statusLine, headers, body = self.getErrorResponse(errorResponseKey, lambda: self.createResponse(sessionManager))
+                startResponse(statusLine, list(headers))
+                headersSent = True
+                if body and hasResponseBody(context.request.method, context.response.status):
+                    yield body
+                return
             # Create the response
-            responseValue = context.response.content.builder.build(context.response, containerValues)
-            response = WKResponse(
-                status = context.response.status,
-                headers = context.response.headers,
-                response = responseValue,
-                content_type =  getContentType(context.response.mimeType, context.response.encoding)
-                )
-            # Set cookies
-            if context.response.cookies and len(context.response.cookies) > 0:
-                for key in context.response.cookies:
-                    cookie = context.response.cookies[key]
-                    # Get set cookie params
-                    params = { 'value': cookie.value }
-                    if cookie['domain'] != '':
-                        params['domain'] = cookie['domain']
-                    if cookie['secure'] != '':
-                        params['secure'] = cookie['secure']
-                    if cookie['expires'] != '':
-                        params['expires'] = cookie['expires']
-                    if cookie['max-age'] != '':
-                        params['max_age'] = cookie['max-age']
-                    if cookie['path'] != '':
-                        params['path'] = cookie['path']
-                    if cookie['httponly'] != '':
-                        params['httponly'] = cookie['httponly']
-                    # Set it
-                    response.set_cookie(key, **params)
+            statusLine, headers, body = self.createResponse(sessionManager)
+            if not hasResponseBody(context.request.method, context.response.status):
+                if not isinstance(body, basestring) and hasattr(body, 'close'):
+                    body.close()
+                body = None
             # Send header and body
-            for _v in response(environ, startResponse):
-                yield _v
+            startResponse(statusLine, headers)
+            headersSent = True
+            if isinstance(body, basestring):
+                if body:
+                    yield body
+            elif body:
+                try:
+                    for _v in body:
+                        yield _v
+                finally:
+                    if hasattr(body, 'close'):
+                        body.close()
         except Exception as error:
             # Error happened
+            if headersSent:
+                # The error is raised while sending the body (the body is closed), the response couldn't be changed
+                # any more, the content is truncated
+                if isinstance(error, RPCError):
+                    self.logger.error('Failed to send the response body: %s', error)
+                else:
+                    self.logger.exception('Failed to send the response body')
+                return
             if not type(error) in ERROR_BINDINGS:
                 # Log the error with details
                 self.logger.exception('Failed to handle http request')
@@ -235,10 +278,8 @@ class WebAdapter(Adapter):
                 status = ERROR_BINDINGS[type(error)]
                 self.logger.error(str(error))
             # Return error without container and builder
-            response = WKResponse(status = status, response = [])
-            # Send header and body
-            for _v in response(environ, startResponse):
-                yield _v
+            statusLine, headers, body = self.getErrorResponse((status, ), lambda: (getStatusLine(status), [ ('Content-Type', 'text/plain; charset=utf-8'), ('Content-Length', '0') ], ''))
+            startResponse(statusLine, list(headers))
         finally:
             # Call the finalize
             try:
@@ -250,25 +291,248 @@ class WebAdapter(Adapter):
             # Clear the context
             clearContext()
 
+    def createResponse(self, sessionManager = None):
+        """Create the response of current context
+        The body of the response with a known length (not a generator or file result) is built to a string and the
+        Content-Length header is set, otherwise the body is the iterator returned by the content builder
+        Returns:
+            A tuple (status line, headers, body)
+        """
+        response = context.response
+        # Set session
+        if sessionManager:
+            sessionManager.set(context.session, response)
+        # Create the container and builder
+        container = response.content.container()
+        executionResult = response.content.executionResult
+        if executionResult:
+            container.setValue(executionResult)
+        if response.content.error:
+            container.setRPCError(response.content.error)
+        # Dump the container and set headers
+        containerValues, containerHeaders = container.dump()
+        if containerHeaders:
+            response.headers.update(containerHeaders)
+        # Build the body
+        body = response.content.builder.build(response, containerValues)
+        if not executionResult or (not isinstance(executionResult, GeneratorEndpointExecutionResult) and executionResult.type is not file):
+            body = ''.join(body)
+        # Create the headers
+        headers = [ getHeader(key, value) for (key, value) in response.headers.iteritems() if key.lower() != 'content-type' ]
+        headers.append(('Content-Type', getContentType(response.mimeType, response.encoding)))
+        if isinstance(body, basestring) and not 'content-length' in [ name.lower() for (name, value) in headers ]:
+            headers.append(('Content-Length', str(len(body))))
+        # Set cookies
+        if response.cookies and len(response.cookies) > 0:
+            for key in response.cookies:
+                cookie = response.cookies[key]
+                # Get set cookie params
+                params = { 'value': cookie.value }
+                if cookie['domain'] != '':
+                    params['domain'] = cookie['domain']
+                if cookie['secure'] != '':
+                    params['secure'] = cookie['secure']
+                if cookie['expires'] != '':
+                    params['expires'] = cookie['expires']
+                if cookie['max-age'] != '':
+                    params['max_age'] = cookie['max-age']
+                if cookie['path'] != '':
+                    params['path'] = cookie['path']
+                if cookie['httponly'] != '':
+                    params['httponly'] = cookie['httponly']
+                # Set it
+                headers.append(('Set-Cookie', dump_cookie(key, **params)))
+        # Done
+        return getStatusLine(response.status), headers, body
+
+    def getErrorResponseKey(self, response):
+        """Get the key of the pre-rendered error response
+        Returns:
+            The key, None if the response shouldn't be cached (no error, the cache is disabled, the error has detail or the response has cookies)
+        """
+        error = response.content.error
+        if not error or self._errorResponses is None or error.detail is not None or response.content.executionResult or response.cookies:
+            return
+        # Done
+        return (
+            type(error),
+            error.code,
+            error.reason,
+            response.status,
+            response.content.container,
+            response.content.builder,
+            response.content.codec,
+            response.mimeType,
+            response.encoding,
+            tuple(sorted(response.headers.iteritems())) if response.headers else None,
+            )
+
+    def getErrorResponse(self, key, createResponse):
+        """Get the pre-rendered error response
+        Parameters:
+            key                         The error response key
+            createResponse              The method to create the response (status line, headers, body) when not cached
+        Returns:
+            A tuple (status line, headers, body)
+        """
+        if self._errorResponses is None:
+            # The cache is disabled or the adapter isn't started
+            return createResponse()
+        errorResponse = self._errorResponses.get(key)
+        if not errorResponse:
+            # Render the response
+            statusLine, headers, body = createResponse()
+            if not isinstance(body, basestring):
+                body = ''.join(body)
+                headers = [ (name, value) for (name, value) in headers if name.lower() != 'content-length' ] + [ ('Content-Length', str(len(body))) ]
+            errorResponse = (statusLine, tuple(headers), body)
+            self._errorResponses.set(key, errorResponse)
+        # Done
+        return errorResponse
+
+    @property
+    def routeCache(self):
+        """The LRUCache of the route match results, None if not enabled
+        """
+        return self._routeCache
+
+    @property
+    def errorResponseCache(self):
+        """The LRUCache of the pre-rendered error responses, None if not enabled
+        """
+        return self._errorResponses
+
     def dispatch(self, request):
         """Dispatch the request for current context
+        NOTE:
+            The returned parameters could be shared by the requests when the route cache is enabled, don't modify it
         Returns:
-            WebEndpoint, Parameters
+            WebEndpoint, Endpoint, Parameters
         """
-        if not self._urlMapper:
+        if not self._router:
             return None, None, None
-        # Map the url
+        if self._routeCache is None:
+            return self._router.match(request.method, request.path, request.host)
+        # Match the request with the cache
+        key = (request.method, request.host, request.path)
+        result = self._routeCache.get(key)
+        if result is None:
+            try:
+                result = self._router.match(request.method, request.path, request.host)
+            except (NotFoundError, MethodNotAllowedError) as error:
+                result = error
+            self._routeCache.set(key, result)
+        if isinstance(result, RPCError):
+            raise type(result)(result.code, result.reason, result.detail)
+        # Done
+        return result
+
+    def getDeadline(self, request, execution, startTime):
+        """Get the deadline of the request by config request.timeout and the request timeout header
+        Returns:
+            The deadline timestamp, None if no deadline
+        """
+        timeout = execution.getConfig(CONFIG_REQUEST_TIMEOUT)
+        value = request.headers.get(self.REQUEST_TIMEOUT_HEADER)
+        if value:
+            try:
+                value = float(value)
+                if timeout is None or value < timeout:
+                    timeout = value
+            except ValueError:
+                self.logger.warn('Invalid request timeout header [%s]', value)
+        # Done
+        if not timeout is None:
+            return startTime + timeout
+
+    def isFastPath(self, execution):
+        """Check if the endpoint of the execution context could be executed in the fast path
+        The fast path calls the executor and writes the encoded result directly, without the execution context,
+        content container or werkzeug response. An endpoint is qualified when:
+            - No handlers other than the defaults of this adapter and the ParameterConverter (with no parameter types)
+            - No session manager
+            - Use the plain content container and the default text content builder
+        NOTE:
+            The result is cached in the meta of the execution context, so it will be detected again when the
+            execution context is invalidated
+        """
+        fastPath = execution.meta.get(self.FAST_PATH_META_KEY)
+        if fastPath is None:
+            fastPath = self.FAST_PATH and self._detectFastPath(execution)
+            execution.meta[self.FAST_PATH_META_KEY] = fastPath
+        # Done
+        return fastPath
+
+    def _detectFastPath(self, execution):
+        """Detect if the endpoint of the execution context could be executed in the fast path
+        """
+        endpoint = execution.endpoint
+        if not endpoint or endpoint.getConfig(CONFIG_ENDPOINT_PARAMETER_TYPE):
+            return False
+        # Check the handlers
+        plan = execution.getExecutionPlan()
+        if plan.postrequest:
+            return False
+        for handler, bound in plan.prerequest:
+            if handler.callableObject.obj != self._onExecutionPreRequest:
+                return False
+        for handler, bound in plan.onerror:
+            if handler.callableObject.obj != self._onExecutionError:
+                return False
+        for handler, bound in plan.calling:
+            if type(handler.callableObject.obj) is not ParameterConverter:
+                return False
+        # Check the configs
+        if execution.getConfig(CONFIG_SESSION_MANAGER) or execution.getConfig(CONFIG_RESPONSE_CONTENT_CONTAINER) is not PlainContentContainer:
+            return False
+        builder = execution.getConfig(CONFIG_RESPONSE_CONTENT_BUILDER)
+        if type(builder) is not AutomaticContentBuilder or type(builder.builders.get(self.FAST_PATH_MIMETYPE)) is not TextContentBuilder:
+            return False
+        # Good
+        return True
+
+    def _executeFastPath(self, execution, endpointExecutionContext):
+        """Execute the endpoint in the fast path
+        Returns:
+            A tuple (status, headers, body), None if the response should be completed by the full pipeline
+        """
+        request, response = context.request, context.response
+        # Call the endpoint
         try:
-            urlAdapter = self._urlMapper.bind_to_environ(request.environ)
-            (webEndpoint, endpoint), params = urlAdapter.match()
+            context.checkDeadline()
+            self._onExecutionPreRequest()
+            endpoint = context.dispatchResult.endpoint
+            result = endpoint(**endpoint.getBinder().bind(context.dispatchResult.parameters))
+        except Exception as error:
+            # Only log error when debugging
+            if not isinstance(error, RPCError):
+                self.logger.exception('Error occurred when executing calling stage')
+            # Call the on error
+            if not endpointExecutionContext.handleError(error):
+                raise
             # Done
-            return webEndpoint, endpoint, params
-        except NotFound:
-            # Not found
-            raise NotFoundError(ERRCODE_NOTFOUND_ENDPOINT_NOT_FOUND, reason = 'Endpoint not found')
-        except MethodNotAllowed:
-            # Method not allowed
-            raise MethodNotAllowedError(reason = 'Method isn\'t allowed for the endpoint')
+            return
+        # Check the result and response
+        if not isinstance(result, basestring) or response.cookies or response.content.container or response.content.builder:
+            response.content.executionResult = createResponseResult(result)
+            return
+        response.content.builder = response.getContentBuilder(request, response, execution)
+        if not response.encoding:
+            response.encoding = response.getEncoding(request, response, execution)
+        if not response.mimeType:
+            response.mimeType = response.getMimeType(request, response, execution)
+        if response.mimeType != self.FAST_PATH_MIMETYPE:
+            response.content.executionResult = createResponseResult(result)
+            return
+        # Create the response
+        body = result.encode(response.encoding) if isinstance(result, unicode) else result
+        if not hasResponseBody(request.method, response.status):
+            body = ''
+        headers = [ getHeader(key, value) for (key, value) in response.headers.iteritems() if not key.lower() in ('content-type', 'content-length') ]
+        headers.append(('Content-Type', getContentType(response.mimeType, response.encoding)))
+        headers.append(('Content-Length', str(len(body))))
+        # Done
+        return getStatusLine(response.status), headers, body
 
     def _onExecutionPreRequest(self):
         """On execution pre-request
@@ -332,9 +596,34 @@ class WebAdapter(Adapter):
         # Handled
         return True
 
+def createWSGIApplication(services, configs = None, stage = None, adapterConfigs = None, adapterClass = WebAdapter):
+    """Create a started WSGI application of the services
+    This is used to serve the services by any WSGI server (uWSGI, gunicorn, meinheld, waitress, ...)
+    NOTE:
+        - The response is an iterator, so the content of generator endpoints is streamed as the server consumes it
+        - The server is got by the server property of the returned adapter, call adapter.server.stop() when the WSGI
+          server shuts down (e.g. by atexit) to stop the services, drain the process pool and release the execution
+          contexts
+    Parameters:
+        services                        The services
+        configs                         The server configs
+        stage                           The server execution stage
+        adapterConfigs                  The adapter configs
+        adapterClass                    The web adapter class
+    Returns:
+        The web adapter object which is a WSGI callable, attached to the started server
+    """
+    from unifiedrpc.server import Server
+    adapter = adapterClass(adapterConfigs)
+    Server(services, [ adapter ], configs, stage).start()
+    # Done
+    return adapter
+
 class GeventWSGIAdapter(WebAdapter):
     """The gevent wsgi adapter
     """
+    LISTEN_BACKLOG = 1024
+
     def __init__(self, certFile = None, keyFile = None, caCerts = None, sslClientAuth = SSL_CLIENTAUTH_NONE, configs = None, stage = None):
         """Create a new GeventWSGIAdapter
         """
@@ -343,14 +632,44 @@ class GeventWSGIAdapter(WebAdapter):
         self._certFile = certFile
         self._sslClientAuth = sslClientAuth
         self._geventWSGIServer = None
+        self._listener = None
         # Super
         super(GeventWSGIAdapter, self).__init__(configs, stage)
 
     def getListener(self):
         """Get the listener
+        Returns:
+            A bound socket or an address tuple (host, port)
         """
         raise NotImplementedError
 
+    def bind(self, reusePort = False):
+        """Bind the listener before the adapter is started
+        """
+        import socket
+        listener = self.getListener()
+        if isinstance(listener, tuple):
+            # Create the tcp listener
+            listener = socket.socket(socket.AF_INET6 if ':' in listener[0] else socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if reusePort:
+                if not hasattr(socket, 'SO_REUSEPORT'):
+                    raise ValueError('SO_REUSEPORT is not supported on this platform')
+                listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            listener.bind(self.getListener())
+            listener.listen(self.LISTEN_BACKLOG)
+            listener.setblocking(0)
+        elif reusePort:
+            raise ValueError('SO_REUSEPORT is only supported by the tcp listener')
+        self._listener = listener
+
+    def unbind(self):
+        """Close the listener bound by the bind method
+        """
+        if self._listener:
+            self._listener.close()
+            self._listener = None
+
     def __start__(self):
         """Start
         """
@@ -365,8 +684,8 @@ class GeventWSGIAdapter(WebAdapter):
                 """Write the message
                 """
                 super(GeventLogAdapter, self).write(msg.strip())
-        # Create the listener
-        listener = self.getListener()
+        # Create the listener (Or use the listener bound in advance)
+        listener = self._listener or self.getListener()
         # Start gevent wsgi server
         kwargs = dict(
             listener        = listener,
@@ -402,10 +721,11 @@ class GeventWSGIAdapter(WebAdapter):
         """Close current adapter
         """
         # Super
-        super(GeventUnixSocketWebAdapter, self).__stop__()
-        # Stop
+        super(GeventWSGIAdapter, self).__stop__()
+        # Stop (The bound listener is closed by the server as well)
         self._geventWSGIServer.close()
         self._geventWSGIServer = None
+        self._listener = None
 
 class GeventWebAdapter(GeventWSGIAdapter):
     """The gevent web adapter
@@ -462,6 +782,6 @@ class GeventUnixSocketWebAdapter(GeventWSGIAdapter):
         if exists(self._sockFilename):
             remove(self._sockFilename)
         listener.bind(self._sockFilename)
-        listener.listen(1024)
+        listener.listen(self.LISTEN_BACKLOG)
         # Done
         return listener
@@ -9,44 +9,82 @@
 
 """
 
+from hashlib import sha256
 from email.utils import parsedate
 
+from werkzeug.utils import cached_property
+
+from unifiedrpc.certificate import CertificateCache, Certificate, Name
+
 class Connection(object):
     """The web connection
+    The connection info is constant for the lifetime of the socket, so one Connection object could be shared by all
+    requests of a keep-alive connection (See geventhandler.WSGIHandler). The local and remote info are loaded on
+    first access
+    Attributes:
+        socket                          The socket object, None if the wsgi server doesn't provide it
+        ssl                             If the connection is secured by ssl
     """
+    # The parsed peer certificates, set to None to disable the cache
+    CERTIFICATE_CACHE = CertificateCache()
+
     def __init__(self, environ):
         """Create a new Connection
         """
         self.socket = environ.get('wsgi.socket')
+        self.ssl = environ.get('wsgi.url_scheme') == 'https'
+
+    @cached_property
+    def local(self):
+        """The local info, None if the socket is not found
+        """
         if self.socket:
-            # Set the info
-            endpoint = self.socket.getpeername()
-            if endpoint and isinstance(endpoint, tuple):
-                host, port = self.socket.getpeername()
-                self.remote = RemoteInfo(host, port)
-            else:
-                self.remote = RemoteInfo()
             endpoint = self.socket.getsockname()
             if endpoint and isinstance(endpoint, tuple):
                 host, port = endpoint
-                self.local = LocalInfo(host, port)
+                return LocalInfo(host, port)
+            return LocalInfo()
+
+    @cached_property
+    def remote(self):
+        """The remote info (with the certificate when ssl is used), None if the socket is not found
+        """
+        if self.socket:
+            endpoint = self.socket.getpeername()
+            if endpoint and isinstance(endpoint, tuple):
+                host, port = endpoint
+                remote = RemoteInfo(host, port)
             else:
-                self.local = LocalInfo()
-        else:
-            # Socket object not found
-            self.local = None
-            self.remote = None
-        # Check ssl
-        if environ.get('wsgi.url_scheme') == 'https':
-            self.ssl = True
-            self.remote.cert = self.loadCertificate()
-        else:
-            self.ssl = False
+                remote = RemoteInfo()
+            if self.ssl:
+                remote.cert = self.loadCertificate()
+            # Done
+            return remote
 
     def loadCertificate(self):
         """Load certificate
+        NOTE:
+            The certificate is cached by the DER fingerprint and shared by the connections, don't modify it
+        """
+        der = self.socket.getpeercert(True)
+        if not der:
+            return
+        fingerprint = sha256(der).hexdigest()
+        cache = self.CERTIFICATE_CACHE
+        certificate = cache.get(fingerprint) if not cache is None else None
+        if not certificate:
+            certificate = self.parseCertificate(self.socket.getpeercert(), fingerprint)
+            if certificate and not cache is None:
+                cache.set(fingerprint, certificate, certificate.expireTime)
+        # Done
+        return certificate
+
+    @classmethod
+    def parseCertificate(cls, cert, fingerprint = None):
+        """Parse the certificate dict returned by getpeercert
+        Returns:
+            The Certificate object, None if the certificate is empty (not validated)
         """
-        cert = self.socket.getpeercert()
         if cert:
             # Get the time
             notBefore = parsedate(cert['notBefore']) if cert.get('notBefore') else None
@@ -59,7 +97,7 @@ class Connection(object):
             if subjectAltName:
                 subjectNames['altNames'] = subjectAltName
             # Create the Certificate object
-            return Certificate(Name(**subjectNames), Name(**issuerNames), notBefore, notAfter, cert.get('serialNumber'), cert.get('version'))
+            return Certificate(Name(**subjectNames), Name(**issuerNames), notBefore, notAfter, cert.get('serialNumber'), cert.get('version'), fingerprint)
 
 class LocalInfo(object):
     """The local info
@@ -79,74 +117,3 @@ class RemoteInfo(object):
         self.host = host
         self.port = port
         self.cert = cert
-
-class Certificate(object):
-    """The certificate
-    """
-    def __init__(self, subject, issuer, notBefore, notAfter, serialNumber, version):
-        """Create a new Certificate
-        """
-        self.subject = subject
-        self.issuer = issuer
-        self.notBefore = notBefore
-        self.notAfter = notAfter
-        self.serialNumber = serialNumber
-        self.version = version
-
-    def __str__(self):
-        """To string
-        """
-        return 'Subject [%s] Issuer [%s] NotBefore [%s] NotAfter[%s] SN [%s] VERSION [%s]' % (
-            self.subject,
-            self.issuer,
-            self.notBefore,
-            self.notAfter,
-            self.serialNumber,
-            self.version
-            )
-
-class Name(object):
-    """The name
-    """
-    def __init__(
-        self,
-        countryName = None,
-        stateOrProvinceName = None,
-        localityName = None,
-        organizationName = None,
-        organizationalUnitName = None,
-        commonName = None,
-        emailAddress = None,
-        altNames = None
-        ):
-        """Create a new Name
-        """
-        self.countryName = countryName
-        self.stateOrProvinceName = stateOrProvinceName
-        self.localityName = localityName
-        self.organizationName = organizationName
-        self.organizationalUnitName = organizationalUnitName
-        self.commonName = commonName
-        self.emailAddress = emailAddress
-        self.altNames = altNames
-
-    def __str__(self):
-        """To string (The DN String)
-        """
-        pieces = []
-        if self.commonName:
-            pieces.append('/CN=%s' % self.commonName)
-        if self.countryName:
-            pieces.append('/C=%s' % self.countryName)
-        if self.stateOrProvinceName:
-            pieces.append('/ST=%s' % self.stateOrProvinceName)
-        if self.localityName:
-            pieces.append('/L=%s' % self.localityName)
-        if self.organizationName:
-            pieces.append('/O=%s' % self.organizationName)
-        if self.organizationalUnitName:
-            pieces.append('/OU=%s' % self.organizationalUnitName)
-        if self.emailAddress:
-            pieces.append('/emailAddress=%s' % self.emailAddress)
-        # Done
-        return ''.join(pieces)
@@ -18,3 +18,5 @@ STARTUP_SHUTDOWN_HANDLER_NAME           = 'web'
 SSL_CLIENTAUTH_NONE         = 'none'
 SSL_CLIENTAUTH_OPTIONAL     = 'optiona'
 SSL_CLIENTAUTH_REQUIRED     = 'required'
+
+CONFIG_WEB_ROUTECACHE_SIZE  = 'web.routeCache.size'     # The max number of the cached route match results, 0 means no cache
@@ -61,15 +61,23 @@ class WebEndpoint(object):
         # Done
         return endpoint
 
-    def getUrlRule(self, endpoint):
-        """Get the url rule
+    def getMethods(self):
+        """Get the allowed methods
+        Returns:
+            A frozenset of upper case methods (HEAD is allowed if GET is allowed), None means all methods are allowed
         """
-        # Get the methods
         if not self.method:
-            methods = None
+            return None
         elif isinstance(self.method, basestring):
-            methods = (self.method, )
+            methods = set([ self.method.upper() ])
         else:
-            methods = self.method
-        # Create the Rule
-        return Rule(self.path, endpoint = (self, endpoint), methods = methods, host = self.host, subdomain = self.subdomain)
+            methods = set([ x.upper() for x in self.method ])
+        if 'GET' in methods:
+            methods.add('HEAD')
+        # Done
+        return frozenset(methods)
+
+    def getUrlRule(self, endpoint):
+        """Get the url rule
+        """
+        return Rule(self.path, endpoint = (self, endpoint), methods = self.getMethods(), host = self.host, subdomain = self.subdomain)
@@ -21,4 +21,5 @@ ERROR_BINDINGS = {
     RequestEntityTooLargeError:     413,
     UnsupportedMediaTypeError:      415,
     InternalServerError:            500,
+    ServiceUnavailableError:        503,
 }
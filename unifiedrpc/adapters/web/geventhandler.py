@@ -11,16 +11,24 @@
 
 from gevent.pywsgi import WSGIHandler as _WSGIHandler
 
+from connection import Connection
+
 class WSGIHandler(_WSGIHandler):
     """The wsgi handler
     This handle will extend the standard gevent wsgi handler:
         - Add socket object to the environ as key 'wsgi.socket'
+        - Add the Connection object to the environ as key 'wsgi.connection', the object is created once per socket
+          and shared by all requests of the keep-alive connection
     """
+    connection = None
+
     def get_environ(self):
         """Get environ
         """
         environ = super(WSGIHandler, self).get_environ()
         environ['wsgi.socket'] = self.socket
+        if not self.connection:
+            self.connection = Connection(environ)
+        environ['wsgi.connection'] = self.connection
         # Done
         return environ
-
@@ -8,6 +8,7 @@ Always be used as raw request in protocol.Request
 """
 import urlparse
 
+from werkzeug.utils import cached_property
 from werkzeug.wrappers import Request
 
 from unifiedrpc.errors import BadRequestError
@@ -15,6 +16,8 @@ from unifiedrpc.protocol.request import Request as ProtocolRequest, RequestConte
 
 class WebRequest(Request, ProtocolRequest):
     """The web request class
+    The attributes of the protocol request (params, content, accept) and the werkzeug request (headers, cookies, ...)
+    are parsed on first access and memoized
     Attributes:
         queryParams                         The query parameters
     """
@@ -22,20 +25,36 @@ class WebRequest(Request, ProtocolRequest):
         """Create a new WebRequest
         """
         # Super for werkzeug request
-        Request.__init__(self, environ)
-        # Parse the query string
         # NOTE:
-        #   Here, the value of queryParams a list: key -> [ value ]
-        #   We will not change this value in order to support multiple values of a query parameter
-        self.queryParams = self._parseQueryParameter()
-        # Super for protocol request
-        ProtocolRequest.__init__(
-            self,
-            self.headers,
-            self.queryParams,
-            self._parseContent(),
-            self._parseAccept()
-            )
+        #   The protocol request is not initialized since all of its attributes are lazy properties
+        Request.__init__(self, environ)
+
+    @cached_property
+    def queryParams(self):
+        """The query parameters
+        NOTE:
+            Here, the value of queryParams a list: key -> [ value ]
+            We will not change this value in order to support multiple values of a query parameter
+        """
+        return self._parseQueryParameter()
+
+    @cached_property
+    def params(self):
+        """The request parameters
+        """
+        return self.queryParams
+
+    @cached_property
+    def content(self):
+        """The request content
+        """
+        return self._parseContent()
+
+    @cached_property
+    def accept(self):
+        """The accept content
+        """
+        return self._parseAccept()
 
     def _parseQueryParameter(self):
         """Parse the query parameters
@@ -11,11 +11,18 @@
 
 from Cookie import SimpleCookie
 
+from unifiedrpc.util import LRUCache
+from unifiedrpc.errors import RPCError, NotAcceptableError
 from unifiedrpc.protocol import Response
 
 class WebResponse(Response):
     """The web response
     """
+    # The size of the cache of the negotiated mimetype and encoding per execution context, key is (kind, raw accept
+    # header, builder). Set to None to disable the cache
+    NEGOTIATION_CACHE_SIZE  = 64
+    NEGOTIATION_META_KEY    = 'web.negotiation'
+
     def __init__(self, status = 200, cookies = None, **kwargs):
         """Create a new WebResponse
         """
@@ -29,3 +36,59 @@ class WebResponse(Response):
         """
         self.headers["Location"] = location
         self.status = code
+
+    @classmethod
+    def getEncoding(cls, request, response, execution):
+        """Get the response encoding
+        """
+        key = ('encoding', request.environ.get('HTTP_ACCEPT_CHARSET'))
+        return cls.negotiate(key, super(WebResponse, cls).getEncoding, request, response, execution)
+
+    @classmethod
+    def getMimeType(cls, request, response, execution):
+        """Get the response mimeType
+        """
+        key = ('mimeType', request.environ.get('HTTP_ACCEPT'), response.content.builder)
+        return cls.negotiate(key, super(WebResponse, cls).getMimeType, request, response, execution)
+
+    @classmethod
+    def getNegotiationCache(cls, execution):
+        """Get the negotiation cache of the execution context
+        NOTE:
+            The cache is kept in the meta of the execution context, so it's released with the execution context when
+            the execution contexts are invalidated or the server is stopped
+        Returns:
+            The LRUCache object, None if disabled
+        """
+        if not cls.NEGOTIATION_CACHE_SIZE:
+            return
+        cache = execution.meta.get(cls.NEGOTIATION_META_KEY)
+        if cache is None:
+            cache = LRUCache(cls.NEGOTIATION_CACHE_SIZE)
+            execution.meta[cls.NEGOTIATION_META_KEY] = cache
+        # Done
+        return cache
+
+    @classmethod
+    def negotiate(cls, key, method, request, response, execution):
+        """Negotiate by the method with the cache
+        NOTE:
+            The NotAcceptableError is cached as well
+        Parameters:
+            key                         The cache key
+            method                      The negotiate method, method(request, response, execution)
+        """
+        cache = cls.getNegotiationCache(execution)
+        if cache is None:
+            return method(request, response, execution)
+        result = cache.get(key)
+        if result is None:
+            try:
+                result = method(request, response, execution)
+            except NotAcceptableError as error:
+                result = error
+            cache.set(key, result)
+        if isinstance(result, RPCError):
+            raise type(result)(result.code, result.reason, result.detail)
+        # Done
+        return result
@@ -0,0 +1,253 @@
+# encoding=utf8
+
+""" The web router
+    Author: lipixun
+    Created Time : 日 10/18 17:02:36 2026
+
+    File Name: router.py
+    Description:
+
+        The router is compiled from the web endpoints when the adapter starts:
+
+            - The static paths are matched by a dict
+            - The parameterized paths are matched by a segment trie, the static segments are matched by a dict and the
+              parameterized segments are matched by the werkzeug converters (default, string, int, float, path, any, uuid),
+              a segment with a path converter could match one or more segments of the request path
+
+        The matching order follows the werkzeug map: static paths first, then in the trie, static segments first then
+        the parameterized segments ordered by their converter weights (int / float first, then default, then path).
+        If a path is matched but the method is not allowed, the matching continues and the MethodNotAllowedError is
+        raised only when no other rules are matched.
+
+"""
+
+import re
+
+from werkzeug.routing import Map, BaseConverter, PathConverter, ValidationError, parse_rule, parse_converter_args
+
+from unifiedrpc.errors import NotFoundError, MethodNotAllowedError, ERRCODE_NOTFOUND_ENDPOINT_NOT_FOUND
+
+class Route(object):
+    """The route
+    Attributes:
+        webEndpoint                     The WebEndpoint object
+        endpoint                        The protocol.Endpoint object
+        methods                         The allowed methods (a frozenset), None means all methods are allowed
+        host                            The host to match, None means any host
+        subdomain                       The sub domain to match, None means any sub domain
+    """
+    def __init__(self, webEndpoint, endpoint):
+        """Create a new Route
+        """
+        self.webEndpoint = webEndpoint
+        self.endpoint = endpoint
+        self.methods = webEndpoint.getMethods()
+        self.host = webEndpoint.host.lower() if webEndpoint.host else None
+        self.subdomain = webEndpoint.subdomain.lower() if webEndpoint.subdomain else None
+
+    def matchHost(self, host):
+        """Check if the host is matched
+        """
+        if self.host and host != self.host and host.split(':')[0] != self.host:
+            return False
+        if self.subdomain and not host.startswith(self.subdomain + '.'):
+            return False
+        # Done
+        return True
+
+class RouteNode(object):
+    """The node of the route trie
+    Attributes:
+        routes                          The routes end at this node
+        statics                         The static children, a dict which key is the segment and value is RouteNode
+        params                          The parameterized children, a list of RouteEdge
+    """
+    def __init__(self):
+        """Create a new RouteNode
+        """
+        self.routes = []
+        self.statics = {}
+        self.params = []
+
+class RouteEdge(object):
+    """The parameterized edge of the route trie
+    Attributes:
+        template                        The segment template
+        regex                           The compiled regex of the segment
+        converters                      A dict which key is the parameter name and value is the converter
+        isPath                          If the segment has a path converter which could match multiple segments
+        weight                          The weight used to order the edges, the lower the first
+        node                            The child RouteNode
+    """
+    def __init__(self, template, regex, converters, isPath, weight):
+        """Create a new RouteEdge
+        """
+        self.template = template
+        self.regex = regex
+        self.converters = converters
+        self.isPath = isPath
+        self.weight = weight
+        self.node = RouteNode()
+
+    def convert(self, value):
+        """Convert the value of segment(s) to parameters
+        Returns:
+            A dict of parameters, None if not matched
+        """
+        match = self.regex.match(value)
+        if not match:
+            return
+        try:
+            return dict([ (name, self.converters[name].to_python(v)) for (name, v) in match.groupdict().iteritems() ])
+        except ValidationError:
+            return
+
+class Router(object):
+    """The web router
+    """
+    def __init__(self):
+        """Create a new Router
+        """
+        self._map = Map()
+        self._statics = {}          # The static routes, key is the path and value is a list of Route
+        self._root = RouteNode()    # The root of the route trie
+
+    def add(self, webEndpoint, endpoint):
+        """Add a web endpoint
+        """
+        route = Route(webEndpoint, endpoint)
+        parts = list(parse_rule(webEndpoint.path))
+        if not any(converter for (converter, args, variable) in parts):
+            # Static
+            self._statics.setdefault(webEndpoint.path, []).append(route)
+            return
+        # Split the parts by segments
+        segments = [ [] ]
+        for converter, args, variable in parts:
+            if converter:
+                segments[-1].append((converter, args, variable))
+            else:
+                texts = variable.split('/')
+                for i, text in enumerate(texts):
+                    if i > 0:
+                        segments.append([])
+                    if text:
+                        segments[-1].append((None, None, text))
+        # Add to the trie (the first segment is empty since the path starts with /)
+        if segments[0]:
+            raise ValueError('Url rule [%s] should start with a slash' % webEndpoint.path)
+        node = self._root
+        for segment in segments[1:]:
+            node = self._addSegment(node, segment)
+        node.routes.append(route)
+
+    def _addSegment(self, node, segment):
+        """Add a segment to the node
+        Returns:
+            The child RouteNode
+        """
+        if not segment:
+            return node.statics.setdefault('', RouteNode())
+        if len(segment) == 1 and not segment[0][0]:
+            return node.statics.setdefault(segment[0][2], RouteNode())
+        # Parameterized
+        template = ''.join([ '<%s(%s):%s>' % (c, a, v) if c else v for (c, a, v) in segment ])
+        for edge in node.params:
+            if edge.template == template:
+                return edge.node
+        regexes, converters, isPath, weight = [], {}, False, 0
+        for converter, args, variable in segment:
+            if not converter:
+                regexes.append(re.escape(variable))
+                continue
+            if not converter in self._map.converters:
+                raise LookupError('The converter [%s] does not exist' % converter)
+            if args:
+                args, kwargs = parse_converter_args(args)
+            else:
+                args, kwargs = (), {}
+            converterObj = self._map.converters[converter](self._map, *args, **kwargs)
+            if isinstance(converterObj, PathConverter):
+                isPath = True
+            regexes.append('(?P<%s>%s)' % (variable, converterObj.regex))
+            converters[variable] = converterObj
+            weight = max(weight, getattr(converterObj, 'weight', BaseConverter.weight))
+        # Create the edge, the segment with static text is tried before the single converter
+        edge = RouteEdge(template, re.compile('^%s$' % ''.join(regexes), re.UNICODE), converters, isPath, (len(segment) == 1, weight))
+        node.params.append(edge)
+        node.params.sort(key = lambda x: x.weight)
+        # Done
+        return edge.node
+
+    def match(self, method, path, host):
+        """Match the request
+        Parameters:
+            method                      The request method
+            path                        The request path (unquoted)
+            host                        The request host
+        Returns:
+            A tuple (WebEndpoint, Endpoint, parameters)
+        """
+        host = host.lower() if host else ''
+        state = [ False ]       # If matched the path but the method is not allowed
+        # The static routes
+        routes = self._statics.get(path)
+        if routes:
+            route = self._matchRoutes(routes, method, host, state)
+            if route:
+                return route.webEndpoint, route.endpoint, {}
+        # The trie
+        segments = path.split('/')[1:]
+        result = self._matchNode(self._root, segments, 0, method, host, state)
+        if result:
+            route, params = result
+            return route.webEndpoint, route.endpoint, params
+        # Not matched
+        if state[0]:
+            raise MethodNotAllowedError(reason = 'Method isn\'t allowed for the endpoint')
+        raise NotFoundError(ERRCODE_NOTFOUND_ENDPOINT_NOT_FOUND, reason = 'Endpoint not found')
+
+    def _matchRoutes(self, routes, method, host, state):
+        """Match the routes by method and host
+        """
+        for route in routes:
+            if route.matchHost(host):
+                if route.methods is None or method in route.methods:
+                    return route
+                state[0] = True
+
+    def _matchNode(self, node, segments, index, method, host, state):
+        """Match the segments from index by the node
+        Returns:
+            A tuple (Route, parameters), None if not matched
+        """
+        if index == len(segments):
+            route = self._matchRoutes(node.routes, method, host, state)
+            if route:
+                return route, {}
+            return
+        segment = segments[index]
+        # The static children
+        child = node.statics.get(segment)
+        if child:
+            result = self._matchNode(child, segments, index + 1, method, host, state)
+            if result:
+                return result
+        # The parameterized children
+        for edge in node.params:
+            if edge.isPath:
+                # Match one or more segments, the shorter the first
+                for end in xrange(index + 1, len(segments) + 1):
+                    params = edge.convert('/'.join(segments[index: end]))
+                    if not params is None:
+                        result = self._matchNode(edge.node, segments, end, method, host, state)
+                        if result:
+                            result[1].update(params)
+                            return result
+            else:
+                params = edge.convert(segment)
+                if not params is None:
+                    result = self._matchNode(edge.node, segments, index + 1, method, host, state)
+                    if result:
+                        result[1].update(params)
+                        return result
@@ -11,18 +11,64 @@
 
 import mime
 
+from werkzeug.http import HTTP_STATUS_CODES
+
 TEXT_MIMETYPES = [
         mime.APPLICATION_JSON,
         mime.APPLICATION_XML
         ]
 
+CONTENT_TYPE_CACHE_SIZE = 1024
+
+_contentTypes = {}
+
 def getContentType(mimetype, charset):
     """Returns the full content type string with charset for a mimetype.
+    NOTE:
+        The results are cached until CONTENT_TYPE_CACHE_SIZE content types are cached
     """
-    if mimetype.startswith('text/') or \
-       mimetype in TEXT_MIMETYPES or \
-       (mimetype.startswith('application/') and (mimetype.endswith('+xml') or mimetype.endswith('+json'))):
-        mimetype += '; charset=' + charset
-    return mimetype
+    contentType = _contentTypes.get((mimetype, charset))
+    if contentType is None:
+        contentType = mimetype
+        if mimetype.startswith('text/') or \
+           mimetype in TEXT_MIMETYPES or \
+           (mimetype.startswith('application/') and (mimetype.endswith('+xml') or mimetype.endswith('+json'))):
+            contentType += '; charset=' + charset
+        if len(_contentTypes) < CONTENT_TYPE_CACHE_SIZE:
+            _contentTypes[(mimetype, charset)] = contentType
+    return contentType
 
+def getStatusLine(status):
+    """Get the status line of the status code, e.g. 200 OK
+    """
+    return '%d %s' % (status, HTTP_STATUS_CODES.get(status, 'UNKNOWN').upper())
 
+def getHeaderValue(value):
+    """Get the header value string
+    Raises:
+        ValueError if the value has newline (The header injection)
+    """
+    if isinstance(value, unicode):
+        value = value.encode('latin-1')
+    elif not isinstance(value, str):
+        value = str(value)
+    if '\n' in value or '\r' in value:
+        raise ValueError('Detected newline in header value')
+    # Done
+    return value
+
+def getHeader(name, value):
+    """Get the header tuple (name, value string)
+    Raises:
+        ValueError if the name or value has newline (The header injection)
+    """
+    name = str(name)
+    if '\n' in name or '\r' in name:
+        raise ValueError('Detected newline in header name')
+    # Done
+    return name, getHeaderValue(value)
+
+def hasResponseBody(method, status):
+    """Check if the response of the request method and status has body
+    """
+    return method != 'HEAD' and not 100 <= status < 200 and not status in (204, 304)
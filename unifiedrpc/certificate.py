@@ -0,0 +1,162 @@
+# encoding=utf8
+
+""" The certificate
+    Author: lipixun
+    Created Time : 日 10/18 23:12:40 2026
+
+    File Name: certificate.py
+    Description:
+
+        The parsed peer certificate and the cache of the values bound to the certificates, shared by the web
+        connection and the secure stage.
+
+"""
+
+import time
+
+from calendar import timegm
+
+from unifiedrpc.util import LRUCache
+
+class CertificateCache(object):
+    """The cache of the values bound to the certificates, key is the certificate fingerprint
+    The value expires when the certificate expires (the notAfter time)
+    """
+    def __init__(self, size = 1024):
+        """Create a new CertificateCache
+        """
+        self._cache = LRUCache(size)
+
+    def __len__(self):
+        """Get the number of the cached values
+        """
+        return len(self._cache)
+
+    def get(self, fingerprint, default = None):
+        """Get the value of the certificate
+        """
+        item = self._cache.get(fingerprint)
+        if not item:
+            return default
+        value, expireTime = item
+        if not expireTime is None and time.time() >= expireTime:
+            self._cache.delete(fingerprint)
+            return default
+        # Done
+        return value
+
+    def set(self, fingerprint, value, expireTime = None):
+        """Set the value of the certificate
+        Parameters:
+            fingerprint                 The certificate fingerprint
+            value                       The value
+            expireTime                  The timestamp the value expires, None means never
+        """
+        self._cache.set(fingerprint, (value, expireTime))
+
+    def clear(self):
+        """Clear the cache
+        """
+        self._cache.clear()
+
+    def getStats(self):
+        """Get the statistics
+        """
+        return self._cache.getStats()
+
+class Certificate(object):
+    """The certificate
+    The certificate object is immutable since it's shared by the connections
+    Attributes:
+        fingerprint                     The sha256 hex digest of the DER certificate
+        expireTime                      The timestamp of notAfter, None if notAfter is not set
+    """
+    def __init__(self, subject, issuer, notBefore, notAfter, serialNumber, version, fingerprint = None):
+        """Create a new Certificate
+        """
+        self.__dict__.update(
+            subject = subject,
+            issuer = issuer,
+            notBefore = notBefore,
+            notAfter = notAfter,
+            serialNumber = serialNumber,
+            version = version,
+            fingerprint = fingerprint,
+            expireTime = timegm(notAfter) if notAfter else None,
+            )
+
+    def __setattr__(self, key, value):
+        """The certificate is immutable
+        """
+        raise AttributeError('Certificate is immutable')
+
+    def isExpired(self):
+        """Check if the certificate is expired
+        """
+        return not self.expireTime is None and time.time() >= self.expireTime
+
+    def __str__(self):
+        """To string
+        """
+        return 'Subject [%s] Issuer [%s] NotBefore [%s] NotAfter[%s] SN [%s] VERSION [%s]' % (
+            self.subject,
+            self.issuer,
+            self.notBefore,
+            self.notAfter,
+            self.serialNumber,
+            self.version
+            )
+
+class Name(object):
+    """The name
+    The name object is immutable since it's shared by the connections
+    """
+    def __init__(
+        self,
+        countryName = None,
+        stateOrProvinceName = None,
+        localityName = None,
+        organizationName = None,
+        organizationalUnitName = None,
+        commonName = None,
+        emailAddress = None,
+        altNames = None
+        ):
+        """Create a new Name
+        """
+        self.__dict__.update(
+            countryName = countryName,
+            stateOrProvinceName = stateOrProvinceName,
+            localityName = localityName,
+            organizationName = organizationName,
+            organizationalUnitName = organizationalUnitName,
+            commonName = commonName,
+            emailAddress = emailAddress,
+            altNames = altNames,
+            )
+
+    def __setattr__(self, key, value):
+        """The name is immutable
+        """
+        raise AttributeError('Name is immutable')
+
+    def __str__(self):
+        """To string (The DN String)
+        """
+        pieces = []
+        if self.commonName:
+            pieces.append('/CN=%s' % self.commonName)
+        if self.countryName:
+            pieces.append('/C=%s' % self.countryName)
+        if self.stateOrProvinceName:
+            pieces.append('/ST=%s' % self.stateOrProvinceName)
+        if self.localityName:
+            pieces.append('/L=%s' % self.localityName)
+        if self.organizationName:
+            pieces.append('/O=%s' % self.organizationName)
+        if self.organizationalUnitName:
+            pieces.append('/OU=%s' % self.organizationalUnitName)
+        if self.emailAddress:
+            pieces.append('/emailAddress=%s' % self.emailAddress)
+        # Done
+        return ''.join(pieces)
@@ -6,9 +6,24 @@
 
 from text import TextContentBuilder
 from _json import JsonContentBuilder
+from ndjson import NdjsonContentBuilder
 from binary import BinaryContentBuilder
+from xml import XmlContentBuilder
 from automatic import AutomaticContentBuilder
 
+def optionalBuilders():
+    """Get the builders which libraries are installed
+    """
+    builders = []
+    try:
+        from _msgpack import MsgpackContentBuilder, MsgpackStreamContentBuilder
+        builders.append(MsgpackContentBuilder())
+        builders.append(MsgpackStreamContentBuilder())
+    except ImportError:
+        pass
+    # Done
+    return tuple(builders)
+
 def default():
     """Get the default builder
     """
@@ -17,8 +32,10 @@ def default():
     for builder in (
         TextContentBuilder(),
         JsonContentBuilder(),
-        BinaryContentBuilder()
-        ):
+        NdjsonContentBuilder(),
+        BinaryContentBuilder(),
+        XmlContentBuilder(),
+        ) + optionalBuilders():
         for mimeType in builder.SUPPORT_MIMETYPES:
             builders[mimeType] = builder
     # Done
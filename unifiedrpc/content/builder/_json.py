@@ -2,13 +2,34 @@
 # The json content builder
 
 """The json content builder
+
+The multiple values result (GeneratorEndpointExecutionResult, IterableEndpointExecutionResult) is encoded as a json
+array element by element, as the content of the plain container or the value in the envelope of the api container:
+
+    [value1,value2,...]
+    {"value":[value1,value2,...]}
+
+The multiple values result is always an array, even if it has only one value (The plain container used
+to write the only value of the generator result itself, and failed on more values).
+
+The separators follow the json codec, e.g. the standard library json codec writes [value1, value2, ...].
+
+The encoded content is yielded in chunks of at least chunkSize bytes. If an error occurred while iterating the
+result, the array is closed and the error is appended as the trailing error object:
+
+    [value1,value2,{"error":{"code":...,"reason":...,"detail":...}}]
+    {"value":[value1,value2],"error":{"code":...,"reason":...,"detail":...}}
+
 """
 
+import logging
+
 import mime
 
-from unifiedrpc.util import json
+from unifiedrpc.content.codec import getJsonCodec
+from unifiedrpc.protocol.execution import EndpointExecutionResult
 
-from base import ContentBuilder
+from base import ContentBuilder, chunks
 
 class JsonContentBuilder(ContentBuilder):
     """The ContentBuilder
@@ -17,9 +38,33 @@ class JsonContentBuilder(ContentBuilder):
         mime.APPLICATION_JSON,
     ]
 
+    CHUNK_SIZE  = 65536                 # The min size of the chunks of the streaming content
+    KEY_ERROR   = 'error'               # The key of the trailing error object of the streaming content
+
+    logger = logging.getLogger('unifiedrpc.content.builder.json')
+
+    def __init__(self, codec = None, chunkSize = None):
+        """Create a new JsonContentBuilder
+        Parameters:
+            codec                       The json codec name or JsonCodec object used when the response has no codec
+            chunkSize                   The min size of the chunks of the streaming content
+        """
+        self.codec = getJsonCodec(codec)
+        self.chunkSize = chunkSize or self.CHUNK_SIZE
+
     def build(self, response, values):
         """Build the content
         """
+        codec = response.content.codec or self.codec
+        if isinstance(values, EndpointExecutionResult) and not values.isSingle:
+            # Stream the values as an array
+            return self.chunk(self.encodeArray(values, codec, response.encoding))
+        # Done
+        return self.buildValues(values, codec, response.encoding)
+
+    def buildValues(self, values, codec, encoding):
+        """Build the content of the values
+        """
         # Get all results
         values = list(values)
         # Check the values
@@ -29,10 +74,72 @@ class JsonContentBuilder(ContentBuilder):
         elif len(values) == 1:
             # Good, encode the value
             value = values[0]
-            if isinstance(value, (dict, tuple, list)):
-                yield json.dumps(value, ensure_ascii = False).encode(response.encoding)
+            if isinstance(value, dict) and any(isinstance(x, EndpointExecutionResult) for x in value.itervalues()):
+                # Stream the value in the object
+                for chunk in self.chunk(self.encodeObject(value, codec, encoding)):
+                    yield chunk
+            elif isinstance(value, (dict, tuple, list)):
+                yield codec.dumps(value, encoding)
             else:
                 raise ValueError('Unsupported value type [%s] for json content builder' % type(value).__name__)
         else:
             # Too many values
             raise ValueError('Too many values [%s] returned for json content builder' % len(values))
+
+    def chunk(self, parts):
+        """Join the parts into chunks of at least chunkSize bytes
+        """
+        return chunks(parts, self.chunkSize)
+
+    def encodeObject(self, value, codec, encoding):
+        """Encode the object which has streaming values (The streaming values are encoded at last)
+        Returns:
+            The parts of the encoded content
+        """
+        itemSeparator, keySeparator = codec.SEPARATORS
+        items = sorted(value.iteritems(), key = lambda x: isinstance(x[1], EndpointExecutionResult))
+        errors = []
+        yield '{'
+        for i, (key, item) in enumerate(items):
+            if i > 0:
+                yield itemSeparator
+            yield codec.dumps(key, encoding)
+            yield keySeparator
+            if isinstance(item, EndpointExecutionResult):
+                for part in self.encodeArray(item, codec, encoding, errors):
+                    yield part
+            else:
+                yield codec.dumps(item, encoding)
+        if errors and not self.KEY_ERROR in value:
+            yield itemSeparator
+            yield codec.dumps(self.KEY_ERROR, encoding)
+            yield keySeparator
+            yield codec.dumps(errors[0], encoding)
+        yield '}'
+
+    def encodeArray(self, values, codec, encoding, errors = None):
+        """Encode the values as an array
+        Parameters:
+            errors                      The list to add the error to, the error is appended to the array if None
+        Returns:
+            The parts of the encoded content
+        """
+        itemSeparator = codec.SEPARATORS[0]
+        count = 0
+        yield '['
+        try:
+            for value in values:
+                data = codec.dumps(value, encoding)
+                if count > 0:
+                    yield itemSeparator
+                yield data
+                count += 1
+        except Exception as error:
+            error = self.getErrorObject(error)
+            if errors is None:
+                if count > 0:
+                    yield itemSeparator
+                yield codec.dumps({ self.KEY_ERROR: error }, encoding)
+            else:
+                errors.append(error)
+        yield ']'
@@ -0,0 +1,239 @@
+# encoding=utf8
+
+""" The msgpack content builder
+    Author: lipixun
+    Created Time : 日 10/18 21:58:14 2026
+
+    File Name: _msgpack.py
+    Description:
+
+        The multiple values result (GeneratorEndpointExecutionResult, IterableEndpointExecutionResult) is packed as an
+        array element by element, as the content of the plain container or the value in the envelope of the api
+        container, the content is yielded in chunks of at least chunkSize bytes. The msgpack array is prefixed by its
+        length, so:
+
+            - The result of known length (list, tuple) is streamed, the array header is written first and the values
+              are packed as they're iterated. If an error occurred while packing a value, the error object is
+              written in place of the value and the rest of the values are nil:
+                    [value1,{"error":{"code":...,"reason":...,"detail":...}},nil,...]
+            - The generator result is NOT streamed, its length is unknown until it's exhausted. The packed values
+              (not the values) are buffered, then written after the array header. If an error occurred while
+              iterating the result, the error is appended as the trailing error object (the same as the json
+              content builder).
+
+        The msgpack stream content builder (application/x-msgpack-stream) streams the generator result in constant
+        memory. The content is a sequence of msgpack objects (Read by msgpack.Unpacker) instead of a single one, each
+        value of the result is packed as one object, the same as the lines of the ndjson content builder:
+
+            - The plain container: the values are the objects.
+            - The api container: the values of the multiple values result in the envelope are the objects. The
+              envelope without multiple values result is packed as a single object.
+            - errorObject is True       The rest of the envelope (the error and meta) is packed as the final object
+                                        if it's not empty, the error raised while iterating the result is packed as
+                                        the final object {"error":{"code":...,"reason":...,"detail":...}}
+            - errorObject is False      Only the values are packed, the error raised while iterating the result is
+                                        raised and the content is truncated
+
+"""
+
+from unifiedrpc.content.codec import TYPE_ENCODERS
+from unifiedrpc.protocol.execution import EndpointExecutionResult
+
+from base import ContentBuilder, chunks
+
+class MsgpackContentBuilder(ContentBuilder):
+    """The msgpack content builder
+    NOTE:
+        The msgpack library is required
+    """
+    SUPPORT_MIMETYPES = [
+        'application/msgpack',
+        'application/x-msgpack',
+    ]
+
+    CHUNK_SIZE  = 65536                 # The min size of the chunks of the content
+    KEY_ERROR   = 'error'               # The key of the error object
+
+    def __init__(self, chunkSize = None, useBinType = False, encoders = None):
+        """Create a new MsgpackContentBuilder
+        Parameters:
+            chunkSize                   The min size of the chunks of the content
+            useBinType                  Pack the str as bin type (And unicode as str type), or both as str type
+            encoders                    The TypeEncoders object, the global TYPE_ENCODERS by default
+        """
+        import msgpack
+        self._msgpack = msgpack
+        self.chunkSize = chunkSize or self.CHUNK_SIZE
+        self.useBinType = useBinType
+        self.encoders = encoders or TYPE_ENCODERS
+
+    def createPacker(self):
+        """Create a packer (The packer is not thread safe)
+        """
+        return self._msgpack.Packer(default = self.encoders.encode, use_bin_type = self.useBinType)
+
+    def build(self, response, values):
+        """Build the content
+        """
+        packer = self.createPacker()
+        if isinstance(values, EndpointExecutionResult) and not values.isSingle:
+            # Pack the values as an array
+            return chunks(self.packArray(values, packer), self.chunkSize)
+        # Done
+        return self.buildValues(values, packer)
+
+    def buildValues(self, values, packer):
+        """Build the content of the values
+        """
+        # Get all results
+        values = list(values)
+        # Check the values
+        if len(values) == 0:
+            # An empty response
+            yield packer.pack({})
+        elif len(values) == 1:
+            # Good, pack the value
+            value = values[0]
+            if isinstance(value, dict) and any(isinstance(x, EndpointExecutionResult) for x in value.itervalues()):
+                for chunk in chunks(self.packMap(value, packer), self.chunkSize):
+                    yield chunk
+            elif isinstance(value, (dict, tuple, list)):
+                yield packer.pack(value)
+            else:
+                raise ValueError('Unsupported value type [%s] for msgpack content builder' % type(value).__name__)
+        else:
+            # Too many values
+            raise ValueError('Too many values [%s] returned for msgpack content builder' % len(values))
+
+    def packMap(self, value, packer):
+        """Pack the map which has multiple values results
+        NOTE:
+            The generator results are packed first, so the error raised while iterating them could be added to the map
+        Returns:
+            The packed parts
+        """
+        errors, packed = [], {}
+        for key, item in value.iteritems():
+            if isinstance(item, EndpointExecutionResult) and item.length is None:
+                packed[key] = list(self.packArray(item, packer, errors))
+        count = len(value)
+        if errors and not self.KEY_ERROR in value:
+            count += 1
+        yield packer.pack_map_header(count)
+        for key, item in value.iteritems():
+            yield packer.pack(key)
+            if key in packed:
+                for part in packed.pop(key):
+                    yield part
+            elif isinstance(item, EndpointExecutionResult):
+                for part in self.packArray(item, packer):
+                    yield part
+            else:
+                yield packer.pack(item)
+        if count > len(value):
+            yield packer.pack(self.KEY_ERROR)
+            yield packer.pack(errors[0])
+
+    def packArray(self, values, packer, errors = None):
+        """Pack the values as an array
+        Parameters:
+            errors                      The list to add the error of the generator result to, the error is appended
+                                        to the array if None
+        Returns:
+            The packed parts
+        """
+        length = values.length
+        if length is None:
+            # The length is unknown, buffer the packed values
+            parts = []
+            try:
+                for value in values:
+                    parts.append(packer.pack(value))
+            except Exception as error:
+                error = self.getErrorObject(error)
+                if errors is None:
+                    parts.append(packer.pack({ self.KEY_ERROR: error }))
+                else:
+                    errors.append(error)
+            yield packer.pack_array_header(len(parts))
+            for part in parts:
+                yield part
+        else:
+            # Stream the values
+            yield packer.pack_array_header(length)
+            count = 0
+            try:
+                for value in values:
+                    data = packer.pack(value)
+                    count += 1
+                    yield data
+            except Exception as error:
+                yield packer.pack({ self.KEY_ERROR: self.getErrorObject(error) })
+                for _ in xrange(length - count - 1):
+                    yield packer.pack(None)
+
+class MsgpackStreamContentBuilder(MsgpackContentBuilder):
+    """The msgpack stream content builder
+    NOTE:
+        The msgpack library is required
+    """
+    SUPPORT_MIMETYPES = [
+        'application/x-msgpack-stream',
+    ]
+
+    def __init__(self, chunkSize = None, useBinType = False, encoders = None, errorObject = True):
+        """Create a new MsgpackStreamContentBuilder
+        Parameters:
+            errorObject                 Pack the error raised while iterating the result as the final object
+        """
+        self.errorObject = errorObject
+        # Super
+        super(MsgpackStreamContentBuilder, self).__init__(chunkSize, useBinType, encoders)
+
+    def build(self, response, values):
+        """Build the content
+        """
+        return chunks(self.packObjects(values, self.createPacker()), self.chunkSize)
+
+    def packObjects(self, values, packer):
+        """Pack the values as objects
+        Returns:
+            The packed parts
+        """
+        if isinstance(values, EndpointExecutionResult) and not values.isSingle:
+            # The multiple values of the plain container
+            error = {}
+            for part in self.packValues(values, packer, error):
+                yield part
+            if error:
+                yield packer.pack(error)
+            return
+        for value in values:
+            if isinstance(value, dict) and any(isinstance(x, EndpointExecutionResult) for x in value.itervalues()):
+                # The envelope
+                rest = {}
+                for key, item in value.iteritems():
+                    if isinstance(item, EndpointExecutionResult):
+                        for part in self.packValues(item, packer, rest):
+                            yield part
+                    else:
+                        rest[key] = item
+                if rest and self.errorObject:
+                    yield packer.pack(rest)
+            else:
+                yield packer.pack(value)
+
+    def packValues(self, values, packer, error):
+        """Pack the values one by one
+        Parameters:
+            error                       The dict to set the error object to
+        Returns:
+            The packed parts
+        """
+        try:
+            for value in values:
+                yield packer.pack(value)
+        except Exception as e:
+            if not self.errorObject:
+                raise
+            error[self.KEY_ERROR] = self.getErrorObject(e)
@@ -4,9 +4,15 @@
 """The base content builder
 """
 
+import logging
+
+from unifiedrpc.errors import RPCError, InternalServerError, ERRCODE_UNDEFINED
+
 class ContentBuilder(object):
     """The ContentBuilder
     """
+    logger = logging.getLogger('unifiedrpc.content.builder')
+
     def isSupportMimeType(self, mimeType):
         """Check if the current content builder could support the specified mimeType
         """
@@ -21,3 +27,27 @@ class ContentBuilder(object):
             The build value
         """
         raise NotImplementedError
+
+    def getErrorObject(self, error):
+        """Get the error object of the error raised while iterating the values
+        """
+        if isinstance(error, RPCError):
+            self.logger.error('Failed to iterate the values: %s', error)
+        else:
+            self.logger.exception('Failed to iterate the values')
+            error = InternalServerError(ERRCODE_UNDEFINED, reason = 'Undefined error occurred')
+        # Done
+        return { 'code': error.code, 'reason': error.reason, 'detail': error.detail }
+
+def chunks(parts, size):
+    """Join the parts into chunks of at least size bytes
+    """
+    buffer, length = [], 0
+    for part in parts:
+        buffer.append(part)
+        length += len(part)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
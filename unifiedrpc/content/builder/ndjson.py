@@ -0,0 +1,96 @@
+# encoding=utf8
+
+""" The ndjson (json lines) content builder
+    Author: lipixun
+    Created Time : 日 10/18 21:26:40 2026
+
+    File Name: ndjson.py
+    Description:
+
+        Each value of the result is encoded as one json line, the lines are yielded in chunks of at least chunkSize
+        bytes, so the generator result is streamed in constant memory.
+
+        The plain container: the values are the lines.
+        The api container: the values of the multiple values result in the envelope are the lines. The envelope
+        without multiple values result is written as a single line.
+
+        The modes:
+
+            - errorLine is True         The rest of the envelope (the error and meta) is written as the final line
+                                        if it's not empty, the error raised while iterating the result is written
+                                        as the final line {"error":{"code":...,"reason":...,"detail":...}}
+            - errorLine is False        Only the values are written, the error raised while iterating the result
+                                        is raised and the content is truncated
+
+"""
+
+from unifiedrpc.protocol.execution import EndpointExecutionResult
+
+from _json import JsonContentBuilder
+
+class NdjsonContentBuilder(JsonContentBuilder):
+    """The ndjson content builder
+    """
+    SUPPORT_MIMETYPES = [
+        'application/x-ndjson',
+        'application/x-jsonlines',
+    ]
+
+    def __init__(self, codec = None, chunkSize = None, errorLine = True):
+        """Create a new NdjsonContentBuilder
+        Parameters:
+            codec                       The json codec name or JsonCodec object used when the response has no codec
+            chunkSize                   The min size of the chunks
+            errorLine                   Write the error raised while iterating the result as the final line
+        """
+        self.errorLine = errorLine
+        # Super
+        super(NdjsonContentBuilder, self).__init__(codec, chunkSize)
+
+    def build(self, response, values):
+        """Build the content
+        """
+        return self.chunk(self.encodeLines(values, response.content.codec or self.codec, response.encoding))
+
+    def encodeLines(self, values, codec, encoding):
+        """Encode the values as lines
+        Returns:
+            The parts of the encoded content
+        """
+        if isinstance(values, EndpointExecutionResult) and not values.isSingle:
+            # The multiple values of the plain container
+            error = {}
+            for part in self.encodeValues(values, codec, encoding, error):
+                yield part
+            if error:
+                yield codec.dumps(error, encoding) + '\n'
+            return
+        for value in values:
+            if isinstance(value, dict) and any(isinstance(x, EndpointExecutionResult) for x in value.itervalues()):
+                # The envelope
+                rest = {}
+                for key, item in value.iteritems():
+                    if isinstance(item, EndpointExecutionResult):
+                        for part in self.encodeValues(item, codec, encoding, rest):
+                            yield part
+                    else:
+                        rest[key] = item
+                if rest and self.errorLine:
+                    yield codec.dumps(rest, encoding) + '\n'
+            else:
+                yield codec.dumps(value, encoding) + '\n'
+
+    def encodeValues(self, values, codec, encoding, error):
+        """Encode the values as lines
+        Parameters:
+            error                       The dict to set the error object to
+        Returns:
+            The parts of the encoded content
+        """
+        try:
+            for value in values:
+                yield codec.dumps(value, encoding) + '\n'
+        except Exception as e:
+            if not self.errorLine:
+                raise
+            error[self.KEY_ERROR] = self.getErrorObject(e)
@@ -2,22 +2,168 @@
 # The xml content builder
 
 """The xml content builder
+
+The values are written as the children of the root element, the xml is written element by element and yielded in
+chunks of at least chunkSize bytes, so the generator result is streamed without building the tree in memory:
+
+    - dict                          Each item is written as a child element which tag is the key, or as an entry
+                                    element with the key attribute if the key is not a valid tag name:
+                                        <value><name>...</name><entry key="1 a">...</entry></value>
+    - list, tuple, set, generator   Each value is written as an item element:
+                                        <value><item>...</item><item>...</item></value>
+    - scalar                        The text of the element (None and the empty string are empty elements)
+
+The values of the other types are converted by the json type encoders. If an error occurred while iterating the
+multiple values result, the element is closed and the error is written as the trailing error element (the same as
+the json content builder):
+
+    <response><item>...</item><item><error><code>...</code><reason>...</reason></error></item></response>
+    <response><value><item>...</item></value><error><code>...</code><reason>...</reason></error></response>
+
 """
 
+import re
+import types
+
 import mime
 
-from unifiedrpc.util import ET
+from unifiedrpc.content.codec import TYPE_ENCODERS
+from unifiedrpc.protocol.execution import EndpointExecutionResult
+
+from base import ContentBuilder, chunks
+
+TAG_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_.-]*$')
+INVALID_CHARS_PATTERN = re.compile(u'[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
 
-from base import ContentBuilder
+SEQUENCE_TYPES = (list, tuple, set, frozenset, types.GeneratorType, EndpointExecutionResult)
+
+def escape(text):
+    """Escape the text (and the attribute value in double quotes)
+    """
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
 
 class XmlContentBuilder(ContentBuilder):
-    """The TextContentBuilder
+    """The XmlContentBuilder
     """
     SUPPORT_MIMETYPES = [
         mime.APPLICATION_XML,
+        'text/xml',
     ]
 
+    CHUNK_SIZE  = 65536                 # The min size of the chunks of the content
+    ROOT_TAG    = 'response'            # The tag of the root element
+    ITEM_TAG    = 'item'                # The tag of the elements of the sequence
+    ENTRY_TAG   = 'entry'               # The tag of the elements of the dict items which key is not a valid tag name
+    KEY_ERROR   = 'error'               # The tag of the trailing error element
+
+    def __init__(self, chunkSize = None, rootTag = None, encoders = None):
+        """Create a new XmlContentBuilder
+        Parameters:
+            chunkSize                   The min size of the chunks of the content
+            rootTag                     The tag of the root element
+            encoders                    The TypeEncoders object, the global TYPE_ENCODERS by default
+        """
+        self.chunkSize = chunkSize or self.CHUNK_SIZE
+        self.rootTag = rootTag or self.ROOT_TAG
+        self.encoders = encoders or TYPE_ENCODERS
+
     def build(self, response, values):
         """Build the content
         """
-        raise NotImplementedError
+        return chunks(self.encodeDocument(values, response.encoding), self.chunkSize)
+
+    def encodeDocument(self, values, encoding):
+        """Encode the document
+        Returns:
+            The parts of the encoded content
+        """
+        yield '<?xml version="1.0" encoding="%s"?>' % str(encoding)
+        if isinstance(values, EndpointExecutionResult) and not values.isSingle:
+            # The multiple values of the plain container
+            for part in self.encodeElement(self.rootTag, values, encoding):
+                yield part
+            return
+        # Get all results
+        values = list(values)
+        if len(values) <= 1:
+            # An empty response is an empty root element
+            for part in self.encodeElement(self.rootTag, values[0] if values else None, encoding):
+                yield part
+        else:
+            # Too many values
+            raise ValueError('Too many values [%s] returned for xml content builder' % len(values))
+
+    def encodeElement(self, tag, value, encoding, errors = None, key = None):
+        """Encode the value as an element
+        Parameters:
+            errors                      The list to add the error raised while iterating the multiple values result
+                                        to, the error is written as the trailing item if None
+            key                         The key attribute of the element
+        Returns:
+            The parts of the encoded content
+        """
+        if isinstance(tag, unicode):
+            # The tag from the unicode key (or root tag), all parts should be str
+            tag = tag.encode(encoding)
+        start = tag if key is None else '%s key="%s"' % (tag, self.encodeText(key, encoding))
+        if value is None or (isinstance(value, basestring) and not value):
+            yield '<%s/>' % start
+        elif isinstance(value, dict):
+            # Write the streaming values at last
+            errors = []
+            yield '<%s>' % start
+            for name, item in sorted(value.iteritems(), key = lambda x: isinstance(x[1], EndpointExecutionResult)):
+                if isinstance(name, basestring) and TAG_PATTERN.match(name) and not name[:3].lower() == 'xml':
+                    parts = self.encodeElement(name, item, encoding, errors)
+                else:
+                    parts = self.encodeElement(self.ENTRY_TAG, item, encoding, errors, name)
+                for part in parts:
+                    yield part
+            if errors and not self.KEY_ERROR in value:
+                for part in self.encodeElement(self.KEY_ERROR, errors[0], encoding):
+                    yield part
+            yield '</%s>' % tag
+        elif isinstance(value, EndpointExecutionResult):
+            yield '<%s>' % start
+            try:
+                for item in value:
+                    # Encode the whole item before writing it, the element won't be broken by the error
+                    yield ''.join(self.encodeElement(self.ITEM_TAG, item, encoding))
+            except Exception as error:
+                error = self.getErrorObject(error)
+                if errors is None:
+                    yield ''.join(self.encodeElement(self.ITEM_TAG, { self.KEY_ERROR: error }, encoding))
+                else:
+                    errors.append(error)
+            yield '</%s>' % tag
+        elif isinstance(value, SEQUENCE_TYPES):
+            yield '<%s>' % start
+            for item in value:
+                for part in self.encodeElement(self.ITEM_TAG, item, encoding):
+                    yield part
+            yield '</%s>' % tag
+        elif isinstance(value, basestring):
+            yield '<%s>%s</%s>' % (start, self.encodeText(value, encoding), tag)
+        elif isinstance(value, bool):
+            yield '<%s>%s</%s>' % (start, 'true' if value else 'false', tag)
+        elif isinstance(value, (int, long)):
+            yield '<%s>%d</%s>' % (start, value, tag)
+        elif isinstance(value, float):
+            yield '<%s>%s</%s>' % (start, repr(value), tag)
+        else:
+            # Convert by the type encoders
+            for part in self.encodeElement(tag, self.encoders.encode(value), encoding, errors, key):
+                yield part
+
+    def encodeText(self, text, encoding):
+        """Encode the text
+        NOTE:
+            The str is decoded by utf-8, the chars which are not allowed in xml are removed, the chars which are
+            not supported by the encoding are written as character references
+        """
+        if isinstance(text, str):
+            text = text.decode('utf-8')
+        elif not isinstance(text, unicode):
+            text = unicode(text)
+        # Done
+        return escape(INVALID_CHARS_PATTERN.sub(u'', text)).encode(encoding, 'xmlcharrefreplace')
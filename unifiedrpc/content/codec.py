@@ -0,0 +1,318 @@
+# encoding=utf8
+
+""" The json codecs
+    Author: lipixun
+    Created Time : 日 10/18 20:21:36 2026
+
+    File Name: codec.py
+    Description:
+
+        The json codec encodes the value to bytes in the response encoding and decodes the bytes to value, the backends:
+
+            - json                      The standard library
+            - simplejson                The simplejson library (The default codec if installed)
+            - ujson                     The ujson library
+            - orjson                    The orjson library
+
+        The backend library is imported when the codec is created, use getJsonCodec to get the codec by name.
+
+        The values of the types which are not supported by json are encoded by the type encoders, the default type
+        encoders support datetime, date, time (iso format), Decimal, UUID (string) and set, frozenset (list).
+
+"""
+
+from uuid import UUID
+from decimal import Decimal
+from datetime import datetime, date, time
+from threading import Lock
+
+UTF8_ENCODINGS = frozenset([ 'utf-8', 'utf8', 'u8' ])
+
+class TypeEncoders(object):
+    """The type encoders which encode the values of the non-json types to the json types
+    """
+    def __init__(self, encoders = None):
+        """Create a new TypeEncoders
+        Parameters:
+            encoders                    A dict which key is the type and value is the encode method
+        """
+        self._encoders = dict(encoders or {})
+        self._resolved = {}             # The type --> encode method (or None) resolved by the mro of the type
+
+    def register(self, valueType, encoder):
+        """Register the encoder of the type (and its sub types)
+        """
+        self._encoders[valueType] = encoder
+        self._resolved = {}
+
+    def unregister(self, valueType):
+        """Unregister the encoder of the type
+        """
+        self._encoders.pop(valueType, None)
+        self._resolved = {}
+
+    def copy(self):
+        """Copy the encoders
+        """
+        return TypeEncoders(self._encoders)
+
+    def encode(self, value):
+        """Encode the value
+        NOTE:
+            This method is used as the `default` method of the json backends
+        """
+        valueType = type(value)
+        try:
+            encoder = self._resolved[valueType]
+        except KeyError:
+            encoder = None
+            for cls in getattr(valueType, '__mro__', (valueType, )):
+                if cls in self._encoders:
+                    encoder = self._encoders[cls]
+                    break
+            self._resolved[valueType] = encoder
+        if not encoder:
+            raise TypeError('Value of type [%s] is not json serializable' % valueType.__name__)
+        # Done
+        return encoder(value)
+
+TYPE_ENCODERS = TypeEncoders({
+    datetime: lambda x: x.isoformat(),
+    date: lambda x: x.isoformat(),
+    time: lambda x: x.isoformat(),
+    Decimal: str,
+    UUID: str,
+    set: list,
+    frozenset: list,
+    })
+
+def registerTypeEncoder(valueType, encoder):
+    """Register the type encoder used by all json codecs which are not created with their own type encoders
+    """
+    TYPE_ENCODERS.register(valueType, encoder)
+
+class JsonCodec(object):
+    """The json codec
+    """
+    NAME = None
+    SEPARATORS = (',', ':')             # The item and key separators of the encoded content (Used by the streaming builder)
+
+    def __init__(self, encoders = None):
+        """Create a new JsonCodec
+        Parameters:
+            encoders                    The TypeEncoders object, the global TYPE_ENCODERS by default
+        """
+        self.encoders = encoders or TYPE_ENCODERS
+
+    def dumps(self, value, encoding = 'utf-8'):
+        """Encode the value
+        Returns:
+            The encoded bytes
+        """
+        raise NotImplementedError
+
+    def loads(self, data, encoding = 'utf-8'):
+        """Decode the bytes
+        Returns:
+            The decoded value
+        Raises:
+            ValueError if failed to decode
+        """
+        raise NotImplementedError
+
+    def load(self, stream, encoding = 'utf-8'):
+        """Decode the bytes read from the stream
+        """
+        return self.loads(stream.read(), encoding)
+
+class StdJsonCodec(JsonCodec):
+    """The json codec of the standard library
+    """
+    NAME = 'json'
+    SEPARATORS = (', ', ': ')
+
+    def __init__(self, encoders = None):
+        """Create a new StdJsonCodec
+        """
+        import json
+        self._json = json
+        # Super
+        super(StdJsonCodec, self).__init__(encoders)
+
+    def dumps(self, value, encoding = 'utf-8'):
+        """Encode the value
+        """
+        data = self._json.dumps(value, ensure_ascii = False, default = self.encoders.encode)
+        # The result is a str if all the strings are str, which may have the raw utf-8 bytes of the non-ascii str
+        if isinstance(data, unicode):
+            data = data.encode(encoding)
+        elif not encoding.lower() in UTF8_ENCODINGS:
+            data = data.decode('utf-8').encode(encoding)
+        # Done
+        return data
+
+    def loads(self, data, encoding = 'utf-8'):
+        """Decode the bytes
+        """
+        return self._json.loads(data, encoding = encoding)
+
+    def load(self, stream, encoding = 'utf-8'):
+        """Decode the bytes read from the stream
+        """
+        return self._json.load(stream, encoding = encoding)
+
+class SimpleJsonCodec(StdJsonCodec):
+    """The json codec of simplejson
+    """
+    NAME = 'simplejson'
+
+    def __init__(self, encoders = None):
+        """Create a new SimpleJsonCodec
+        """
+        import simplejson
+        self._json = simplejson
+        # Super (Skip the std json codec)
+        JsonCodec.__init__(self, encoders)
+
+class UJsonCodec(JsonCodec):
+    """The json codec of ujson
+    NOTE:
+        The type encoders are only supported by ujson 5.0 or later
+    """
+    NAME = 'ujson'
+
+    def __init__(self, encoders = None):
+        """Create a new UJsonCodec
+        """
+        import ujson
+        self._ujson = ujson
+        try:
+            ujson.dumps(None, default = None)
+            self._supportDefault = True
+        except TypeError:
+            self._supportDefault = False
+        # Super
+        super(UJsonCodec, self).__init__(encoders)
+
+    def dumps(self, value, encoding = 'utf-8'):
+        """Encode the value
+        """
+        if self._supportDefault:
+            data = self._ujson.dumps(value, ensure_ascii = False, escape_forward_slashes = False, default = self.encoders.encode)
+        else:
+            data = self._ujson.dumps(value, ensure_ascii = False, escape_forward_slashes = False)
+        # The ujson always encodes in utf-8
+        if isinstance(data, unicode):
+            data = data.encode(encoding)
+        elif not encoding.lower() in UTF8_ENCODINGS:
+            data = data.decode('utf-8').encode(encoding)
+        # Done
+        return data
+
+    def loads(self, data, encoding = 'utf-8'):
+        """Decode the bytes
+        """
+        if not isinstance(data, unicode) and not encoding.lower() in UTF8_ENCODINGS:
+            data = data.decode(encoding)
+        # Done
+        return self._ujson.loads(data)
+
+class OrJsonCodec(JsonCodec):
+    """The json codec of orjson
+    """
+    NAME = 'orjson'
+
+    def __init__(self, encoders = None):
+        """Create a new OrJsonCodec
+        """
+        import orjson
+        self._orjson = orjson
+        # Super
+        super(OrJsonCodec, self).__init__(encoders)
+
+    def dumps(self, value, encoding = 'utf-8'):
+        """Encode the value
+        """
+        data = self._orjson.dumps(value, default = self.encoders.encode, option = self._orjson.OPT_NON_STR_KEYS)
+        # The orjson always encodes in utf-8
+        if not encoding.lower() in UTF8_ENCODINGS:
+            data = data.decode('utf-8').encode(encoding)
+        # Done
+        return data
+
+    def loads(self, data, encoding = 'utf-8'):
+        """Decode the bytes
+        """
+        if not isinstance(data, unicode) and not encoding.lower() in UTF8_ENCODINGS:
+            data = data.decode(encoding)
+        # Done
+        return self._orjson.loads(data)
+
+JSON_CODECS = dict([ (x.NAME, x) for x in (StdJsonCodec, SimpleJsonCodec, UJsonCodec, OrJsonCodec) ])
+
+_jsonCodecs = {}                        # The created codecs, name --> JsonCodec
+_jsonCodecLock = Lock()
+_defaultJsonCodecName = None
+
+def registerJsonCodec(codecClass):
+    """Register the json codec class by its name
+    """
+    JSON_CODECS[codecClass.NAME] = codecClass
+    with _jsonCodecLock:
+        _jsonCodecs.pop(codecClass.NAME, None)
+    # Done
+    return codecClass
+
+def unregisterJsonCodec(name):
+    """Unregister the json codec class by its name
+    """
+    JSON_CODECS.pop(name, None)
+    with _jsonCodecLock:
+        _jsonCodecs.pop(name, None)
+
+def getAvailableJsonCodecs():
+    """Get the names of the json codecs which backends are installed
+    """
+    names = []
+    for name in sorted(JSON_CODECS.keys()):
+        try:
+            getJsonCodec(name)
+        except ValueError:
+            continue
+        names.append(name)
+    # Done
+    return names
+
+def getJsonCodec(codec = None):
+    """Get the json codec
+    Parameters:
+        codec                           The codec name or JsonCodec object, None means the default codec (simplejson
+                                        if installed, otherwise json of the standard library)
+    Returns:
+        The JsonCodec object
+    """
+    global _defaultJsonCodecName
+    if isinstance(codec, JsonCodec):
+        return codec
+    if not codec:
+        if not _defaultJsonCodecName:
+            try:
+                getJsonCodec(SimpleJsonCodec.NAME)
+                _defaultJsonCodecName = SimpleJsonCodec.NAME
+            except ValueError:
+                _defaultJsonCodecName = StdJsonCodec.NAME
+        codec = _defaultJsonCodecName
+    # Get the created codec
+    jsonCodec = _jsonCodecs.get(codec)
+    if jsonCodec:
+        return jsonCodec
+    if not codec in JSON_CODECS:
+        raise ValueError('Unknown json codec [%s]' % codec)
+    with _jsonCodecLock:
+        if not codec in _jsonCodecs:
+            try:
+                _jsonCodecs[codec] = JSON_CODECS[codec]()
+            except ImportError:
+                raise ValueError('Json codec [%s] is not available, the backend library is not installed' % codec)
+        # Done
+        return _jsonCodecs[codec]
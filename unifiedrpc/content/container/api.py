@@ -17,8 +17,13 @@
         If the return value is empty, then value = None
         If the return value is a single value, then value = value
         If the return value is not a single value, then value = list of value
+
+        The value of multiple values is kept as the EndpointExecutionResult (if STREAM_VALUE is True) which is
+        encoded element by element by the content builder, so the generator result is never materialized in memory.
 """
 
+from unifiedrpc.protocol.execution import EndpointExecutionResult
+
 from base import ContentContainer
 
 class APIContentContainer(ContentContainer):
@@ -28,6 +33,8 @@ class APIContentContainer(ContentContainer):
     KEY_VALUE           = 'value'
     KEY_META_ERROR      = 'error'
 
+    STREAM_VALUE        = True
+
     def __init__(self):
         """Create a new APIContentContainer
         """
@@ -35,8 +42,15 @@ class APIContentContainer(ContentContainer):
 
     def getValue(self):
         """Get the value
+        NOTE:
+            The streaming value is materialized to a list
         """
-        return self._object.get(self.KEY_VALUE)
+        value = self._object.get(self.KEY_VALUE)
+        if isinstance(value, EndpointExecutionResult):
+            value = list(value)
+            self._object[self.KEY_VALUE] = value
+        # Done
+        return value
 
     def setValue(self, value):
         """Set the value
@@ -47,7 +61,7 @@ class APIContentContainer(ContentContainer):
                 value = None
             else:
                 value = value[0]
-        else:
+        elif not self.STREAM_VALUE:
             value = list(value)
         # Set to json dict
         self._object[self.KEY_VALUE] = value
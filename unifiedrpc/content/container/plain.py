@@ -42,6 +42,8 @@ class PlainContentContainer(ContentContainer):
 
     def setError(self, code, reason, detail = None):
         """Set the error
+        NOTE:
+            The error is encoded as ascii json (the header value must be ascii), not by the json codec
         """
         self._headers[self.KEY_META_ERROR] = json.dumps({ 'code': code, 'reason': reason, 'detail': detail })
 
@@ -7,8 +7,21 @@
 from text import TextContentParser
 from form import FormContentParser
 from _json import JsonContentParser
+from _xml import XmlContentParser
 from aggregate import AggregateContentParser
 
+def optionalParsers():
+    """Get the parsers which libraries are installed
+    """
+    parsers = []
+    try:
+        from _msgpack import MsgpackContentParser
+        parsers.append(MsgpackContentParser())
+    except ImportError:
+        pass
+    # Done
+    return tuple(parsers)
+
 def default():
     """Get default content parser
     """
@@ -18,7 +31,8 @@ def default():
         TextContentParser(),
         FormContentParser(),
         JsonContentParser(),
-        ):
+        XmlContentParser(),
+        ) + optionalParsers():
         for mimeType in parser.SUPPORT_MIMETYPES:
             parsers[mimeType] = parser
     # Done
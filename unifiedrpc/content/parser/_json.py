@@ -8,7 +8,8 @@ import logging
 
 import mime
 
-from unifiedrpc.util import json, JSONDecodeError
+from unifiedrpc.definition import CONFIG_RESPONSE_CONTENT_CODEC
+from unifiedrpc.content.codec import getJsonCodec
 from unifiedrpc.errors import BadRequestError
 
 from base import ContentParser
@@ -22,12 +23,22 @@ class JsonContentParser(ContentParser):
 
     logger = logging.getLogger('unifiedrpc.content.parser.json')
 
+    def __init__(self, codec = None):
+        """Create a new JsonContentParser
+        Parameters:
+            codec                       The json codec name or JsonCodec object used when the endpoint has no codec
+        """
+        self.codec = getJsonCodec(codec)
+
     def parse(self, context):
         """Parse the request content
+        NOTE:
+            The request content is decoded by the codec of the endpoint (CONFIG_RESPONSE_CONTENT_CODEC) if configured
         """
+        codec = context.execution().getConfig(CONFIG_RESPONSE_CONTENT_CODEC)
         try:
-            return json.load(context.request.content.stream, encoding = context.request.content.encoding)
-        except JSONDecodeError:
+            return (getJsonCodec(codec) if codec else self.codec).load(context.request.content.stream, context.request.content.encoding)
+        except ValueError:
             # Failed to decode the content
             self.logger.error('Failed to decode request content')
             # Raise
@@ -0,0 +1,47 @@
+# encoding=utf8
+
+""" The msgpack content parser
+    Author: lipixun
+    Created Time : 日 10/18 22:04:37 2026
+
+    File Name: _msgpack.py
+    Description:
+
+"""
+
+import logging
+
+from unifiedrpc.errors import BadRequestError
+
+from base import ContentParser
+
+class MsgpackContentParser(ContentParser):
+    """The msgpack content parser
+    NOTE:
+        The msgpack library is required
+    """
+    SUPPORT_MIMETYPES = [
+        'application/msgpack',
+        'application/x-msgpack',
+    ]
+
+    logger = logging.getLogger('unifiedrpc.content.parser.msgpack')
+
+    def __init__(self):
+        """Create a new MsgpackContentParser
+        """
+        import msgpack
+        self._msgpack = msgpack
+
+    def parse(self, context):
+        """Parse the request content
+        NOTE:
+            The str type is decoded to unicode (As the json content parser does)
+        """
+        try:
+            return self._msgpack.unpackb(context.request.content.stream.read(), raw = False)
+        except Exception:
+            # Failed to decode the content
+            self.logger.error('Failed to decode request content')
+            # Raise
+            raise BadRequestError
@@ -0,0 +1,137 @@
+# encoding=utf8
+# The xml content parser
+
+"""The xml content parser
+
+The content is fed to the expat parser incrementally, the elements are converted to values (in the layout written by
+the xml content builder) as soon as they're closed, no element tree is built:
+
+    - The element without children  The text of the element (None if empty)
+    - The children are all items    A list of the values of the children
+    - Otherwise                     A dict, the key is the key attribute or the tag of the child element, the values
+                                    of the children of the same key are grouped into a list
+
+The depth of the elements and the size of the content are limited, the document type declaration (and so the entity
+declarations) is rejected by the parser.
+
+"""
+
+import logging
+
+from xml.parsers import expat
+
+import mime
+
+from unifiedrpc.errors import BadRequestError, RequestEntityTooLargeError
+
+from base import ContentParser
+
+class XmlContentParser(ContentParser):
+    """The XmlContentParser
+    """
+    SUPPORT_MIMETYPES = [
+        mime.APPLICATION_XML,
+        'text/xml',
+    ]
+
+    MAX_DEPTH       = 64                    # The max depth of the elements
+    MAX_SIZE        = 16 * 1024 * 1024      # The max bytes of the content
+    READ_SIZE       = 65536                 # The bytes read from the stream at a time
+    ITEM_TAG        = 'item'                # The tag of the elements of the list
+    KEY_ATTRIBUTE   = 'key'                 # The attribute of the key of the dict item
+
+    logger = logging.getLogger('unifiedrpc.content.parser.xml')
+
+    def __init__(self, maxDepth = None, maxSize = None):
+        """Create a new XmlContentParser
+        Parameters:
+            maxDepth                    The max depth of the elements
+            maxSize                     The max bytes of the content
+        """
+        self.maxDepth = maxDepth or self.MAX_DEPTH
+        self.maxSize = maxSize or self.MAX_SIZE
+
+    def parse(self, context):
+        """Parse the request content
+        """
+        content = context.request.content
+        if content.length and content.length > self.maxSize:
+            raise RequestEntityTooLargeError(reason = 'Request content exceeds %d bytes' % self.maxSize)
+        try:
+            return self.load(content.stream)
+        except expat.ExpatError:
+            # Failed to decode the content
+            self.logger.error('Failed to decode request content')
+            # Raise
+            raise BadRequestError
+
+    def load(self, stream):
+        """Load the value from the stream
+        Raises:
+            ExpatError if the content is not a valid xml document
+        """
+        stack = []                      # The (tag, key, texts, children) of the open elements
+        values = []                     # The value of the root element
+        def startElement(tag, attributes):
+            """Open an element
+            """
+            if len(stack) >= self.maxDepth:
+                raise BadRequestError(reason = 'Request content exceeds the max depth %d' % self.maxDepth)
+            stack.append((tag, attributes.get(self.KEY_ATTRIBUTE, tag), [], []))
+        def endElement(_):
+            """Close an element, the element is released after its value is added to the parent
+            """
+            tag, key, texts, children = stack.pop()
+            value = self.getValue(texts, children)
+            if stack:
+                stack[-1][3].append((tag, key, value))
+            else:
+                values.append(value)
+        def characterData(text):
+            """Add the text of the current element
+            """
+            if stack:
+                stack[-1][2].append(text)
+        def rejectDoctype(*args):
+            """Reject the document type declaration
+            """
+            raise BadRequestError(reason = 'Document type declaration is not allowed')
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = startElement
+        parser.EndElementHandler = endElement
+        parser.CharacterDataHandler = characterData
+        parser.StartDoctypeDeclHandler = rejectDoctype
+        parser.EntityDeclHandler = rejectDoctype
+        parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_NEVER)
+        # Feed the content
+        size = 0
+        while True:
+            data = stream.read(self.READ_SIZE)
+            if not data:
+                break
+            size += len(data)
+            if size > self.maxSize:
+                raise RequestEntityTooLargeError(reason = 'Request content exceeds %d bytes' % self.maxSize)
+            parser.Parse(data, False)
+        parser.Parse('', True)
+        # Done
+        return values[0] if values else None
+
+    def getValue(self, texts, children):
+        """Get the value of the element
+        """
+        if not children:
+            return ''.join(texts) or None
+        if all(tag == self.ITEM_TAG for tag, _, _ in children):
+            return [ x for _, _, x in children ]
+        value, groups = {}, set()
+        for _, key, item in children:
+            if not key in value:
+                value[key] = item
+            elif key in groups:
+                value[key].append(item)
+            else:
+                value[key] = [ value[key], item ]
+                groups.add(key)
+        # Done
+        return value
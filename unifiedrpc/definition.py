@@ -6,11 +6,15 @@
 
 CONFIG_REQUEST_ENCODING                     = 'request.encoding'
 CONFIG_REQUEST_CONTENT_PARSER               = 'request.contentParser'
+CONFIG_REQUEST_TIMEOUT                      = 'request.timeout'                     # The seconds the request should be completed in
 
 CONFIG_RESPONSE_MIMETYPE                    = 'response.mimeType'
 CONFIG_RESPONSE_ENCODING                    = 'response.encoding'
 
 CONFIG_RESPONSE_CONTENT_CONTAINER           = 'response.contentContainer'           # NOTE, the value of this config is the ContentContainer class not object
 CONFIG_RESPONSE_CONTENT_BUILDER             = 'response.contentBuilder'
+CONFIG_RESPONSE_CONTENT_CODEC               = 'response.contentCodec'               # The json codec name or JsonCodec object
 
 CONFIG_SESSION_MANAGER                      = 'session.manager'
+
+CONFIG_PROCESSPOOL_SIZE                     = 'processPool.size'                    # The worker process count, the cpu count by default
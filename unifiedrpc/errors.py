@@ -98,6 +98,10 @@ class InternalServerError(RPCError):
     """The internal server error
     """
 
+class ServiceUnavailableError(RPCError):
+    """The service unavailable error
+    """
+
 # -*- ---------- The error codes and messages --------- -*-
 
 ERRCODE_UNDEFINED                                           = 0x0                   # The undefined error
@@ -119,9 +123,17 @@ ERRCODE_NOTFOUND_ENDPOINT_NOT_FOUND                         = 0x0004001
 
 ERRCODE_METHODNOTALLOWED                                    = 0x0005001
 
+ERRCODE_SERVICEUNAVAILABLE_QUEUE_FULL                       = 0x0006001             # The execution queue of the endpoint is full
+ERRCODE_SERVICEUNAVAILABLE_BULKHEAD_FULL                    = 0x0006002             # The concurrent calls of the endpoint exceeded the limit
+
+ERRCODE_REQUESTTIMEOUT_DEADLINE_EXCEEDED                    = 0x0007001             # The deadline of the request exceeded
+
 DEFAULT_REASON = {
     ERRCODE_UNDEFINED                                       : 'Undefined error',
     ERRCODE_BADREQUEST_INVALID_PARAMETER_TYPE               : 'Invalid parameter type',
     ERRCODE_NOTFOUND_ENDPOINT_NOT_FOUND                     : 'Endpoint not found',
-    ERRCODE_METHODNOTALLOWED                                : 'Method is not allowed'
+    ERRCODE_METHODNOTALLOWED                                : 'Method is not allowed',
+    ERRCODE_REQUESTTIMEOUT_DEADLINE_EXCEEDED                : 'Deadline exceeded',
+    ERRCODE_SERVICEUNAVAILABLE_QUEUE_FULL                   : 'Execution queue is full',
+    ERRCODE_SERVICEUNAVAILABLE_BULKHEAD_FULL                : 'Too many concurrent calls',
     }
@@ -11,12 +11,16 @@
 
 from params import paramtype
 from secure import requiressl
-from content import requiredata, container, mimetype, encoding
+from content import requiredata, container, mimetype, encoding, codec
 from session import requiresession
+from offload import threadpool, cpubound
+from limit import bulkhead, timeout
 
 __all__ = [
         'paramtype',
         'requiressl',
-        'requiredata', 'container', 'mimetype', 'encoding',
+        'requiredata', 'container', 'mimetype', 'encoding', 'codec',
         'requiresession',
+        'threadpool', 'cpubound',
+        'bulkhead', 'timeout',
         ]
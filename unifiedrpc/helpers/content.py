@@ -10,7 +10,7 @@
 """
 
 from unifiedrpc.stages import DataValidator
-from unifiedrpc.definition import CONFIG_RESPONSE_CONTENT_CONTAINER, CONFIG_RESPONSE_MIMETYPE, CONFIG_RESPONSE_ENCODING
+from unifiedrpc.definition import CONFIG_RESPONSE_CONTENT_CONTAINER, CONFIG_RESPONSE_MIMETYPE, CONFIG_RESPONSE_ENCODING, CONFIG_RESPONSE_CONTENT_CODEC
 
 def requiredata(dataType = dict, notEmpty = True):
     """Require the request data should be a specified type
@@ -61,3 +61,17 @@ def encoding(encoding):
         return endpoint
     # Done
     return decorate
+
+def codec(codec):
+    """Set the json codec of the request and response content
+    Parameters:
+        codec                       The json codec name (json, simplejson, ujson, orjson) or JsonCodec object
+    """
+    def decorate(endpoint):
+        """The method to decorate endpoint
+        """
+        endpoint.setConfig(CONFIG_RESPONSE_CONTENT_CODEC, codec)
+        # Done
+        return endpoint
+    # Done
+    return decorate
@@ -0,0 +1,52 @@
+# encoding=utf8
+
+""" The limit helpers
+    Author: lipixun
+    Created Time : 日 10/18 15:48:51 2026
+
+    File Name: limit.py
+    Description:
+
+"""
+
+from unifiedrpc.stages import createBulkhead
+from unifiedrpc.protocol import Endpoint, CONFIG_ENDPOINT_BULKHEAD
+from unifiedrpc.definition import CONFIG_REQUEST_TIMEOUT
+
+def timeout(seconds):
+    """Set the seconds the request of the endpoint should be completed in
+    The request fails with RequestTimeoutError (408) when the deadline exceeded before calling the endpoint or during
+    iterating the returned generator. The endpoint could get the remaining seconds by context.getRemainingTime()
+    """
+    def decorate(endpoint):
+        """The method to decorate the endpoint
+        """
+        endpoint.setConfig(CONFIG_REQUEST_TIMEOUT, seconds)
+        # Done
+        return endpoint
+    # Done
+    return decorate
+
+def bulkhead(limit, queueSize = 0, maxWait = None, retryAfter = 1, bulkheadClass = None):
+    """Limit the concurrent calls of the endpoint or service
+    This could decorate an endpoint or be called with a service object, the latter limits the calls of all endpoints
+    of the service together. The Bulkhead object of the endpoint could be got by config `endpoint.bulkhead`.
+    Parameters:
+        limit                       The max number of the running calls
+        queueSize                   The max number of the waiting calls
+        maxWait                     The max seconds to wait, None means wait until a call completed
+        retryAfter                  The seconds of the Retry-After header when rejected (503)
+        bulkheadClass               The bulkhead class, GeventBulkhead (or Bulkhead if gevent is not installed) by default,
+                                    use Bulkhead when serving by native threads
+    """
+    def decorate(obj):
+        """The method to decorate the endpoint or service
+        """
+        _bulkhead = (bulkheadClass or createBulkhead)(limit, queueSize, maxWait, retryAfter)
+        obj._stage.addCaller(_bulkhead, 2000)
+        if isinstance(obj, Endpoint):
+            obj.setConfig(CONFIG_ENDPOINT_BULKHEAD, _bulkhead)
+        # Done
+        return obj
+    # Done
+    return decorate
@@ -0,0 +1,49 @@
+# encoding=utf8
+
+""" The offload helpers
+    Author: lipixun
+    Created Time : 日 10/18 13:42:06 2026
+
+    File Name: offload.py
+    Description:
+
+"""
+
+from unifiedrpc.stages import ThreadPoolCaller, ProcessPoolCaller
+from unifiedrpc.protocol import CONFIG_ENDPOINT_CPUBOUND
+
+def threadpool(size = 10, queueSize = 100, pool = None):
+    """Run the executor of the endpoint in a thread pool
+    Parameters:
+        size                        The thread pool size
+        queueSize                   The max number of requests waiting for a free thread, 503 will be returned when exceeded
+        pool                        The ThreadPool object, could be shared by endpoints. A new one of the
+                                    THREAD_POOL_CLASS of the server (GeventThreadPool for GeventServer,
+                                    FuturesThreadPool otherwise) will be created if not specified
+    """
+    def decorate(endpoint):
+        """The method to decorate the endpoint
+        """
+        endpoint._stage.addCaller(ThreadPoolCaller(size, queueSize, pool), -10000)
+        # Done
+        return endpoint
+    # Done
+    return decorate
+
+def cpubound(spoolThreshold = 1024 * 1024):
+    """Run the executor of the endpoint in the process pool of the server
+    NOTE:
+        - The service class should be importable by the worker process (defined at module level)
+        - The executor is called without the service instance (`self` is None), so it should only depend on its parameters
+    Parameters:
+        spoolThreshold              The bytes parameters not less than this size will be sent by temporary files
+    """
+    def decorate(endpoint):
+        """The method to decorate the endpoint
+        """
+        endpoint.setConfig(CONFIG_ENDPOINT_CPUBOUND, True)
+        endpoint._stage.addCaller(ProcessPoolCaller(spoolThreshold), -10000)
+        # Done
+        return endpoint
+    # Done
+    return decorate
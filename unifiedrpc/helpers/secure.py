@@ -11,13 +11,17 @@
 
 from unifiedrpc.stages import SSLValidator
 
-def requiressl(clientAuth = False):
+def requiressl(clientAuth = False, authorize = None, authorizationCacheSize = 1024):
     """Require the request should be transported via ssl
+    Parameters:
+        clientAuth                      Whether the client should be authenticated by ssl certificate
+        authorize                       The method to authorize the client certificate, see SSLValidator
+        authorizationCacheSize          The max number of the cached authorization results, 0 means no cache
     """
     def decorate(endpoint):
         """The method to decorate the endpoint
         """
-        endpoint._stage.addPreRequest(SSLValidator(clientAuth), 5000)
+        endpoint._stage.addPreRequest(SSLValidator(clientAuth, authorize, authorizationCacheSize), 5000)
         # Done
         return endpoint
     # Done
@@ -0,0 +1,142 @@
+# encoding=utf8
+
+""" The pre-fork supervisor
+    Author: lipixun
+    Created Time : 日 10/18 19:42:10 2026
+
+    File Name: prefork.py
+    Description:
+
+        The supervisor forks N worker processes, each worker starts the server (the adapters and the startup handlers
+        of the services) and serves the requests until SIGTERM is received.
+
+        The listeners of the adapters are bound in the supervisor process before forking and shared by all workers
+        (the kernel distributes the connections by the accept calls), or bound in each worker with SO_REUSEPORT (the
+        kernel distributes the connections by hashing).
+
+        The crashed workers are restarted, SIGTERM or SIGINT received by the supervisor is forwarded to all workers
+        as SIGTERM and the supervisor returns after all workers exited.
+
+"""
+
+import os
+import errno
+import signal
+import logging
+
+from time import time, sleep
+
+class PreforkSupervisor(object):
+    """The pre-fork supervisor
+    """
+    logger = logging.getLogger('unifiedrpc.prefork')
+
+    MIN_WORKER_LIFETIME = 1.0           # The worker exits within this seconds is regarded as a startup failure
+    RESTART_DELAY       = 1.0           # The delay seconds before restarting a worker of startup failure
+
+    def __init__(self, server, workers, reusePort = False):
+        """Create a new PreforkSupervisor
+        Parameters:
+            server                      The Server object
+            workers                     The number of workers
+            reusePort                   Bind the listener in each worker with SO_REUSEPORT
+        """
+        if workers < 1:
+            raise ValueError('Require at least one worker')
+        self._server = server
+        self._workers = workers
+        self._reusePort = reusePort
+        self._stopping = False
+        self._pids = {}                 # The worker pid --> (worker id, start time)
+
+    @property
+    def pids(self):
+        """Get the pids of the running workers
+        """
+        return self._pids.keys()
+
+    def run(self):
+        """Run the workers until SIGTERM or SIGINT is received
+        """
+        handlers = dict([ (signum, signal.signal(signum, self.stop)) for signum in (signal.SIGTERM, signal.SIGINT) ])
+        try:
+            # Bind the listeners which are shared by the workers
+            if not self._reusePort:
+                for adapter in self._server.adapters:
+                    adapter.bind()
+            # Fork the workers
+            for workerId in range(self._workers):
+                self.spawn(workerId)
+            # Supervise
+            self.supervise()
+        finally:
+            # Stop the workers if the supervisor exits abnormally
+            self.stop()
+            for adapter in self._server.adapters:
+                adapter.unbind()
+            for signum, handler in handlers.iteritems():
+                signal.signal(signum, handler)
+        # Done
+        self.logger.info('All workers exited')
+
+    def stop(self, signum = None, frame = None):
+        """Stop all workers
+        NOTE:
+            This method is the signal handler of SIGTERM and SIGINT
+        """
+        if not self._stopping:
+            self._stopping = True
+            self.logger.info('Stop %d workers', len(self._pids))
+        for pid in self._pids.keys():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    def spawn(self, workerId):
+        """Fork a worker
+        """
+        pid = os.fork()
+        if pid == 0:
+            # The worker process, never return to the caller
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_IGN)    # Stopped by the SIGTERM forwarded by the supervisor
+                self._server.runWorker(workerId, self._reusePort)
+            except:
+                self.logger.exception('Worker [%d] failed', workerId)
+                code = 1
+            finally:
+                os._exit(code)
+        # The supervisor process
+        self._pids[pid] = (workerId, time())
+        self.logger.info('Worker [%d] started with pid [%d]', workerId, pid)
+        if self._stopping:
+            # The stop signal is received while forking
+            os.kill(pid, signal.SIGTERM)
+
+    def supervise(self):
+        """Wait for the workers, restart the crashed workers
+        """
+        while self._pids:
+            try:
+                pid, status = os.wait()
+            except OSError as error:
+                if error.errno == errno.EINTR:
+                    continue
+                if error.errno == errno.ECHILD:
+                    break
+                raise
+            if not pid in self._pids:
+                continue
+            workerId, startTime = self._pids.pop(pid)
+            if self._stopping:
+                self.logger.info('Worker [%d] with pid [%d] exited', workerId, pid)
+                continue
+            # Restart the worker
+            self.logger.error('Worker [%d] with pid [%d] exited unexpectedly with status [%d], restart it', workerId, pid, status)
+            if time() - startTime < self.MIN_WORKER_LIFETIME:
+                sleep(self.RESTART_DELAY)
+            if not self._stopping:
+                self.spawn(workerId)
@@ -0,0 +1,259 @@
+# encoding=utf8
+
+""" The process pool
+    Author: lipixun
+    Created Time : 日 10/18 14:05:33 2026
+
+    File Name: processpool.py
+    Description:
+
+        The process pool is owned by the server, used to run the cpu bound endpoints in worker processes.
+        The endpoint is addressed by the module name, service class name and endpoint name, the worker process
+        gets the executor from the endpoints of the service class (See ServiceMetaClass).
+
+"""
+
+import os
+import stat
+import logging
+import tempfile
+import importlib
+
+from threading import Lock, BoundedSemaphore
+from multiprocessing import Process, Pipe
+
+from errors import InternalServerError, ERRCODE_UNDEFINED
+from protocol.service import ENDPOINTS_NAME
+
+SPOOL_PATH = '/dev/shm'
+MAX_FD = 65536
+
+class SpooledBytes(object):
+    """The bytes sent to the worker process by a temporary file (On the tmpfs if possible) instead of the pipe
+    NOTE:
+        The bytes are not shared, they're written to the file and read back as a new str by the worker
+    """
+    def __init__(self, value):
+        """Create a new SpooledBytes
+        """
+        fd, self.path = tempfile.mkstemp(prefix = 'unifiedrpc-', dir = SPOOL_PATH if os.path.isdir(SPOOL_PATH) else None)
+        try:
+            os.write(fd, value)
+        finally:
+            os.close(fd)
+        self.size = len(value)
+
+    def load(self):
+        """Load the bytes
+        """
+        if not self.size:
+            return ''
+        with open(self.path, 'rb') as fd:
+            return fd.read(self.size)
+
+    def release(self):
+        """Release the bytes
+        """
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+class ProcessPoolTask(object):
+    """The task to run in the process pool
+    """
+    def __init__(self, moduleName, serviceClassName, endpointName, params):
+        """Create a new ProcessPoolTask
+        """
+        self.moduleName = moduleName
+        self.serviceClassName = serviceClassName
+        self.endpointName = endpointName
+        self.params = params
+
+    def __call__(self):
+        """Run the task
+        NOTE:
+            The executor is called without the service instance, the `self` parameter is None
+        """
+        serviceClass = getattr(importlib.import_module(self.moduleName), self.serviceClassName)
+        endpoint = getattr(serviceClass, ENDPOINTS_NAME)[self.endpointName]
+        params = dict(map(lambda (k, v): (k, v.load() if isinstance(v, SpooledBytes) else v), self.params.iteritems()))
+        # Call the executor
+        return endpoint._executor.obj(None, **params)
+
+    def spool(self, threshold):
+        """Send the bytes parameters whose size is not less than the threshold by temporary files
+        """
+        for key, value in self.params.iteritems():
+            if isinstance(value, str) and len(value) >= threshold:
+                self.params[key] = SpooledBytes(value)
+
+    def release(self):
+        """Release the spooled parameters
+        """
+        for value in self.params.itervalues():
+            if isinstance(value, SpooledBytes):
+                value.release()
+
+def closeSockets(keep):
+    """Close the sockets inherited from the parent process (the listeners and the accepted connections of the
+    adapters when the worker is replaced while serving) except the one to keep
+    """
+    try:
+        fds = [ int(x) for x in os.listdir('/proc/self/fd') ]
+    except OSError:
+        fds = range(3, MAX_FD)
+    for fd in fds:
+        if fd < 3 or fd == keep:
+            continue
+        try:
+            if stat.S_ISSOCK(os.fstat(fd).st_mode):
+                os.close(fd)
+        except OSError:
+            pass
+
+def work(connection):
+    """The main loop of the worker process
+    """
+    closeSockets(connection.fileno())
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        try:
+            result = (True, task())
+        except Exception as error:
+            result = (False, (type(error), error.args, error.__dict__))
+        try:
+            connection.send(result)
+        except Exception as error:
+            # Failed to pickle the result
+            connection.send((False, (InternalServerError, (), { 'code': ERRCODE_UNDEFINED, 'reason': 'Failed to send result', 'detail': str(error) })))
+
+class ProcessPoolWorker(object):
+    """The worker process
+    """
+    def __init__(self):
+        """Create a new ProcessPoolWorker
+        """
+        self.connection, connection = Pipe()
+        self.process = Process(target = work, args = (connection, ))
+        self.process.daemon = True
+        self.process.start()
+        connection.close()
+
+    def stop(self):
+        """Stop the worker process
+        """
+        try:
+            self.connection.send(None)
+        except (IOError, OSError):
+            pass
+        self.process.join()
+        self.connection.close()
+
+    def kill(self):
+        """Kill the worker process
+        """
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+class ProcessPool(object):
+    """The process pool
+    Each worker process runs one task at a time, the caller will wait for a free worker
+    """
+    logger = logging.getLogger('unifiedrpc.processPool')
+
+    def __init__(self, size = None):
+        """Create a new ProcessPool
+        Parameters:
+            size                        The number of the worker processes, the cpu count by default
+        """
+        if not size:
+            from multiprocessing import cpu_count
+            size = cpu_count()
+        self.size = size
+        self._lock = Lock()
+        self._slots = None
+        self._workers = None
+
+    def createSemaphore(self, value):
+        """Create the semaphore to wait for a free worker
+        """
+        return BoundedSemaphore(value)
+
+    def wait(self, connection):
+        """Wait for the connection to be readable
+        """
+        connection.poll(None)
+
+    def start(self):
+        """Start the worker processes
+        """
+        self._slots = self.createSemaphore(self.size)
+        self._workers = [ ProcessPoolWorker() for _ in range(self.size) ]
+
+    def stop(self):
+        """Stop the worker processes after all running tasks are completed
+        """
+        for _ in range(self.size):
+            self._slots.acquire()
+        for worker in self._workers:
+            worker.stop()
+        self._workers = None
+
+    def run(self, task):
+        """Run the task in a worker process and wait for the result
+        """
+        if self._workers is None:
+            raise ValueError('Process pool is not started')
+        self._slots.acquire()
+        try:
+            with self._lock:
+                worker = self._workers.pop()
+            received = False
+            try:
+                worker.connection.send(task)
+                self.wait(worker.connection)
+                succeed, result = worker.connection.recv()
+                received = True
+            except (EOFError, IOError, OSError):
+                # The worker process crashed
+                self.logger.error('Worker process [%s] crashed with exit code [%s]', worker.process.pid, worker.process.exitcode)
+                raise InternalServerError(ERRCODE_UNDEFINED, reason = 'Worker process crashed')
+            finally:
+                if not received:
+                    # The worker process crashed or the caller is interrupted (GreenletExit, Timeout, ...) before the
+                    # result is received, the unread result shouldn't be read by the next task, replace the worker
+                    worker.kill()
+                    worker = ProcessPoolWorker()
+                with self._lock:
+                    self._workers.append(worker)
+        finally:
+            self._slots.release()
+        # Check the result
+        if not succeed:
+            errorType, args, attributes = result
+            error = errorType.__new__(errorType)
+            error.args = args
+            error.__dict__.update(attributes)
+            raise error
+        # Done
+        return result
+
+class GeventProcessPool(ProcessPool):
+    """The gevent process pool
+    """
+    def createSemaphore(self, value):
+        """Create the semaphore to wait for a free worker
+        """
+        from gevent.lock import BoundedSemaphore
+        return BoundedSemaphore(value)
+
+    def wait(self, connection):
+        """Wait for the connection to be readable
+        """
+        from gevent.socket import wait_read
+        wait_read(connection.fileno())
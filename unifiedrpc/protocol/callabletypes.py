@@ -10,6 +10,8 @@
 """
 import inspect
 
+from unifiedrpc.errors import BadRequestParameterError, ERRCODE_BADREQUEST_UNKNOWN_PARAMETER, ERRCODE_BADREQUEST_LACK_OF_PARAMETER
+
 from types import FunctionType, MethodType, ClassType
 
 class CallableObject(object):
@@ -101,6 +103,47 @@ class ParameterConstraint(object):
         """
         return not self.keywordArgName is None
 
+class ParameterBinder(object):
+    """The compiled parameter binder of the endpoint
+    This class checks and completes the invoking parameters by the pre-computed sets and default values of a ParameterConstraint
+    """
+    def __init__(self, parameter):
+        """Create a new ParameterBinder
+        Parameters:
+            parameter                   The ParameterConstraint object
+        """
+        self.args = tuple(parameter.args)
+        self.argSet = frozenset(parameter.args)
+        self.defaults = dict(parameter.defaults)
+        self.required = frozenset([ x for x in parameter.args if not x in self.defaults ])
+        self.isDynamic = parameter.isDynamic
+
+    def bind(self, params):
+        """Bind the parameters
+        Parameters:
+            params                      The parameter dict, the default values will be set to this dict
+        Returns:
+            The parameter dict
+        """
+        keys = params.viewkeys()
+        # Check the unknown parameters
+        if not self.isDynamic:
+            unknowns = keys - self.argSet
+            if unknowns:
+                param = next(iter(unknowns))
+                raise BadRequestParameterError(param, ERRCODE_BADREQUEST_UNKNOWN_PARAMETER, 'Parameter [%s] is unknown via current endpoint' % param)
+        # Check the necessary parameters
+        missings = self.required - keys
+        if missings:
+            param = next(x for x in self.args if x in missings)
+            raise BadRequestParameterError(param, ERRCODE_BADREQUEST_LACK_OF_PARAMETER, 'Missing necessary parameter [%s] via current endpoint' % param)
+        # Set the default values
+        for param, value in self.defaults.iteritems():
+            if not param in params:
+                params[param] = value
+        # Done
+        return params
+
 class MethodCallable(CallableObject):
     """The method callable
     """
@@ -4,11 +4,14 @@
 """The context object
 """
 
-from threading import local
+import time
+
+from functools import wraps
 from contextlib import contextmanager
 
-from werkzeug.local import LocalProxy
+from werkzeug.local import Local, LocalProxy
 
+from unifiedrpc.errors import RequestTimeoutError, ERRCODE_REQUESTTIMEOUT_DEADLINE_EXCEEDED
 from unifiedrpc.definition import CONFIG_REQUEST_CONTENT_PARSER, CONFIG_RESPONSE_CONTENT_CONTAINER, CONFIG_RESPONSE_CONTENT_BUILDER
 
 class Context(object):
@@ -19,8 +22,9 @@ class Context(object):
         request                             The request
         session                             The session
         response                            The response
+        deadline                            The time (timestamp) the request should be completed before, None means no deadline
     """
-    def __init__(self, server, adapter, request = None, dispatchResult = None, session = None, response = None, meta = None):
+    def __init__(self, server, adapter, request = None, dispatchResult = None, session = None, response = None, meta = None, deadline = None):
         """Create a new context
         """
         self.server = server
@@ -30,6 +34,7 @@ class Context(object):
         self.session = session
         self.response = response
         self.meta = meta or {}
+        self.deadline = deadline
 
     def __getattr__(self, key):
         """Get attribute which is not pre-defined, try the meta
@@ -39,19 +44,41 @@ class Context(object):
         # Raise error
         raise AttributeError
 
+    def getRemainingTime(self):
+        """Get the remaining seconds before the deadline, could be passed to the downstream calls
+        Returns:
+            The seconds (not less than 0), None if no deadline
+        """
+        if not self.deadline is None:
+            return max(self.deadline - time.time(), 0)
+
+    def checkDeadline(self):
+        """Raise RequestTimeoutError if the deadline exceeded
+        """
+        if not self.deadline is None and time.time() >= self.deadline:
+            raise RequestTimeoutError(ERRCODE_REQUESTTIMEOUT_DEADLINE_EXCEEDED)
+
     def execution(self):
         """Get the execution context
         """
+        service = self.dispatchResult.service if self.dispatchResult else None
+        endpoint = self.dispatchResult.endpoint if self.dispatchResult else None
+        if self.server:
+            # Use the execution context shared by the requests of the endpoint
+            return self.server.getExecutionContext(self.adapter, service, endpoint)
         from execution import ExecutionContext
-        return ExecutionContext(
-            self.server,
-            self.adapter,
-            self.dispatchResult.service if self.dispatchResult else None,
-            self.dispatchResult.endpoint if self.dispatchResult else None
-            )
+        return ExecutionContext(self.server, self.adapter, service, endpoint)
 
-_local = local()
-context = LocalProxy(lambda: _local.context if hasattr(_local, 'context') else None)
+# NOTE:
+#   The werkzeug Local is identified by the current greenlet (if greenlet is installed) or thread, so the context of
+#   the concurrent requests served by greenlets will not be mixed up even if the threading module is not patched
+_local = Local()
+context = LocalProxy(lambda: getattr(_local, 'context', None))
+
+def getContext():
+    """Get the current context object (Not the proxy)
+    """
+    return getattr(_local, 'context', None)
 
 def setContext(context):
     """Set the current context object
@@ -61,5 +88,28 @@ def setContext(context):
 def clearContext():
     """Clear the current context object
     """
-    if hasattr(_local, 'context'):
-        del _local.context
+    _local.__release_local__()
+
+def bindContext(method, context = None):
+    """Bind the method to a context object
+    The returned method will run the method with the context, this is useful when running a method in another greenlet or thread
+    Parameters:
+        method                  The method
+        context                 The context object, will use the current context if not specified
+    """
+    context = context or getContext()
+    @wraps(method)
+    def run(*args, **kwargs):
+        """Run the method with the context
+        """
+        previous = getContext()
+        setContext(context)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            if previous is None:
+                clearContext()
+            else:
+                setContext(previous)
+    # Done
+    return run
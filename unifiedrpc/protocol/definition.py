@@ -10,3 +10,5 @@
 """
 
 CONFIG_ENDPOINT_PARAMETER_TYPE                      = 'endpoint.parameter.type'
+CONFIG_ENDPOINT_CPUBOUND                            = 'endpoint.cpuBound'
+CONFIG_ENDPOINT_BULKHEAD                            = 'endpoint.bulkhead'
@@ -16,7 +16,7 @@ from context import context
 
 from handler import Handler
 from execution import EndpointExecutionStage
-from callabletypes import CallableObject
+from callabletypes import CallableObject, ParameterBinder
 
 class Endpoint(object):
     """The Endpoint
@@ -32,6 +32,7 @@ class Endpoint(object):
         """Create a new Endpoint
         """
         self._executor = CallableObject.create(executor) if executor else None
+        self._binder = None
         self._document = document
         self._bindObject = bindObject
         # The execution stage
@@ -39,6 +40,7 @@ class Endpoint(object):
         # The children and configs
         self._children = children or {}
         self._configs = configs or {}
+        self._listeners = []
 
     def __getattr__(self, key):
         """Get the attribute, transparently access attribute of executor
@@ -72,6 +74,12 @@ class Endpoint(object):
         """
         return not self._bindObject is None
 
+    @property
+    def bindObject(self):
+        """Get the bound object
+        """
+        return self._bindObject
+
     def getConfig(self, key):
         """Get the config
         """
@@ -81,6 +89,25 @@ class Endpoint(object):
         """Set the config
         """
         self._configs[key] = value
+        self.notify()
+
+    def addListener(self, method):
+        """Add a listener which will be called (without parameters) when the configs of this endpoint are changed
+        """
+        if not method in self._listeners:
+            self._listeners.append(method)
+
+    def removeListener(self, method):
+        """Remove a listener
+        """
+        if method in self._listeners:
+            self._listeners.remove(method)
+
+    def notify(self):
+        """Notify the listeners that this endpoint is changed
+        """
+        for listener in self._listeners:
+            listener()
 
     def bind(self, obj):
         """Bind this endpoint to a specified object
@@ -106,6 +133,7 @@ class Endpoint(object):
         if not method:
             raise ValueError('Invalid method')
         self._executor = CallableObject.create(method)
+        self._binder = None
 
     def prerequest(self, *args, **kwargs):
         """Add a prerequest method
@@ -136,3 +164,15 @@ class Endpoint(object):
         """Get the signature of this endpoint (The signature of executor)
         """
         return self._executor.bind(self._bindObject).getSignature()
+
+    def getBinder(self):
+        """Get the parameter binder of this endpoint
+        NOTE:
+            The binder is compiled from the signature at the first time and cached until the executor is changed
+        """
+        binder = self._binder
+        if not binder:
+            binder = ParameterBinder(self.getSignature().parameter)
+            self._binder = binder
+        # Done
+        return binder
@@ -9,6 +9,7 @@
 
 """
 
+import time
 import types
 import logging
 
@@ -24,6 +25,10 @@ class ExecutionContext(object):
         All these objects have the following attributs:
             - _configs          A dict
             - _stage            A EndpointExecutionStage object
+        The meta is a dict which is used by adapters to attach the data compiled from this context
+        The configs are merged into a single dict and the stages are compiled into an EndpointExecutionPlan at the
+        first time they're used, so an ExecutionContext could be shared by all requests of the same endpoint until
+        the configs or stages are changed (See Server.getExecutionContext)
     """
     def __init__(self, server, adapter = None, service = None, endpoint = None):
         """Create a new ExecutionContext
@@ -32,21 +37,34 @@ class ExecutionContext(object):
         self.adapter = adapter
         self.service = service
         self.endpoint = endpoint
+        self.meta = {}
+        self._configs = None
+        self._plan = None
 
-    def getConfig(self, key):
+    @property
+    def configs(self):
+        """Get the merged configs
+        """
+        configs = self._configs
+        if configs is None:
+            configs = {}
+            # Merge from the outermost scope to the innermost one
+            for obj in (self.server, self.adapter, self.service, self.endpoint):
+                if obj and obj._configs:
+                    configs.update(obj._configs)
+            self._configs = configs
+        # Done
+        return configs
+
+    def getConfig(self, key, default = None):
         """Get config
         """
-        if self.endpoint and self.endpoint._configs and key in self.endpoint._configs:
-            return self.endpoint._configs[key]
-        elif self.service and self.service._configs and key in self.service._configs:
-            return self.service._configs[key]
-        elif self.adapter and self.adapter._configs and key in self.adapter._configs:
-            return self.adapter._configs[key]
-        elif self.server and self.server._configs and key in self.server._configs:
-            return self.server._configs[key]
+        return self.configs.get(key, default)
 
-    def getEndpointExecutionContext(self):
-        """Get endpoint execution context
+    def getStages(self):
+        """Get the stages
+        Returns:
+            A list of tuple (EndpointExecutionStage, Bound Object)
         """
         stages = []
         # Collect stages
@@ -59,7 +77,34 @@ class ExecutionContext(object):
         if self.service:
             stages.append((self.service._stage, self.service))
         # Done
-        return EndpointExecutionContext(stages, self.endpoint)
+        return stages
+
+    def getExecutionPlan(self):
+        """Get the execution plan
+        Returns:
+            EndpointExecutionPlan object
+        """
+        plan = self._plan
+        if not plan:
+            plan = EndpointExecutionPlan.compile(self.getStages(), self.endpoint)
+            self._plan = plan
+        # Done
+        return plan
+
+    def compile(self):
+        """Compile the configs and execution plan of this context
+        Returns:
+            This ExecutionContext object
+        """
+        self.configs
+        self.getExecutionPlan()
+        # Done
+        return self
+
+    def getEndpointExecutionContext(self):
+        """Get endpoint execution context
+        """
+        return EndpointExecutionContext(self.getExecutionPlan(), self.endpoint)
 
 class EndpointExecutionStage(object):
     """The endpoint execution stages
@@ -78,6 +123,7 @@ class EndpointExecutionStage(object):
         self._calling = calling or []
         self._onerror = onerror or []
         self._finalizing = finalizing or []
+        self._listeners = []
 
     def clone(self):
         """Clone this stages
@@ -96,6 +142,7 @@ class EndpointExecutionStage(object):
         if not method:
             raise ValueError('Invalid method')
         self._prerequest.append(Handler(method, weight))
+        self.notify()
 
     def addPostRequest(self, method, weight = None):
         """Add a post-request method
@@ -103,6 +150,7 @@ class EndpointExecutionStage(object):
         if not method:
             raise ValueError('Invalid method')
         self._postrequest.append(Handler(method, weight))
+        self.notify()
 
     def addCaller(self, method, weight = None):
         """Add a caller method
@@ -110,6 +158,7 @@ class EndpointExecutionStage(object):
         if not method:
             raise ValueError('Invalid method')
         self._calling.append(Handler(method, weight))
+        self.notify()
 
     def addErrorHandler(self, method, weight = None):
         """Add a onerror method
@@ -117,6 +166,7 @@ class EndpointExecutionStage(object):
         if not method:
             raise ValueError('Invalid method')
         self._onerror.append(Handler(method, weight))
+        self.notify()
 
     def addFinalizer(self, method, weight = None):
         """Add a finalize method
@@ -124,6 +174,25 @@ class EndpointExecutionStage(object):
         if not method:
             raise ValueError('Invalid method')
         self._finalizing.append(Handler(method, weight))
+        self.notify()
+
+    def addListener(self, method):
+        """Add a listener which will be called (without parameters) when this stage is changed
+        """
+        if not method in self._listeners:
+            self._listeners.append(method)
+
+    def removeListener(self, method):
+        """Remove a listener
+        """
+        if method in self._listeners:
+            self._listeners.remove(method)
+
+    def notify(self):
+        """Notify the listeners that this stage is changed
+        """
+        for listener in self._listeners:
+            listener()
 
     # -*- ---------- The decorators ---------- -*-
 
@@ -177,18 +246,76 @@ class EndpointExecutionStage(object):
         # Done
         return decorator
 
+class EndpointExecutionPlan(object):
+    """The endpoint execution plan
+    A frozen snapshot of the handlers of all stages (endpoint, server, adapter, service) of an endpoint,
+    each stage is merged and sorted by weight when compiling, so nothing is sorted when executing.
+    Attributes:
+        prerequest                      A tuple of (handler, bound)
+        calling                         A tuple of (handler, bound)
+        postrequest                     A tuple of (handler, bound)
+        onerror                         A tuple of (handler, bound)
+        finalizing                      A tuple of (handler, bound)
+        callStack                       The CallStack of the calling stage which calls the endpoint at last, None if no endpoint
+    """
+    def __init__(self, prerequest = None, calling = None, postrequest = None, onerror = None, finalizing = None, endpoint = None):
+        """Create a new EndpointExecutionPlan
+        """
+        self.prerequest = tuple(prerequest or ())
+        self.calling = tuple(calling or ())
+        self.postrequest = tuple(postrequest or ())
+        self.onerror = tuple(onerror or ())
+        self.finalizing = tuple(finalizing or ())
+        if endpoint:
+            self.callStack = CallStack([ x.getCallable(y) for (x, y) in self.calling ] + [ createEndpointCaller(endpoint) ])
+        else:
+            self.callStack = None
+
+    @classmethod
+    def compile(cls, stages, endpoint = None):
+        """Compile the plan
+        Parameters:
+            stages                          A list of tuple (EndpointExecutionStage, Bound Object)
+            endpoint                        The endpoint object
+        Returns:
+            EndpointExecutionPlan object
+        """
+        return cls(
+            prerequest = cls.mergeHandlers(lambda x: x._prerequest, stages),
+            calling = cls.mergeHandlers(lambda x: x._calling, stages),
+            postrequest = cls.mergeHandlers(lambda x: x._postrequest, stages),
+            onerror = cls.mergeHandlers(lambda x: x._onerror, stages),
+            finalizing = cls.mergeHandlers(lambda x: x._finalizing, stages),
+            endpoint = endpoint,
+            )
+
+    @classmethod
+    def mergeHandlers(cls, func, stages):
+        """Merge and sort the handlers
+        Returns:
+            A list of (handler, bound)
+        """
+        handlers = []
+        for stage, bound in stages:
+            _handlers = func(stage)
+            for handler in _handlers:
+                handlers.append((handler, bound))
+        handlers.sort(key = lambda x: x[0].weight or 0, reverse = True)
+        # Done
+        return handlers
+
 class EndpointExecutionContext(object):
     """The endpoint execution context
     """
     logger = logging.getLogger('unifiedrpc.protocol.endpoint.executionContext')
 
-    def __init__(self, stages, endpoint):
+    def __init__(self, plan, endpoint):
         """Create a new EndpointExecutionContext
         Parameters:
-            stages                          A list of tuple (EndpointExecutionStage, Bound Object)
+            plan                            The EndpointExecutionPlan object
             endpoint                        The endpoint object
         """
-        self.stages = stages
+        self.plan = plan
         self.endpoint = endpoint
 
     def __call__(self):
@@ -211,8 +338,7 @@ class EndpointExecutionContext(object):
 
         # The pre-request stage
         try:
-            handlers = self.mergeHandlers(lambda x: x._prerequest, self.stages)
-            for handler, bound in handlers:
+            for handler, bound in self.plan.prerequest:
                 res = handler(bound)
                 if not res is None:
                     # Stop handle
@@ -233,10 +359,9 @@ class EndpointExecutionContext(object):
             try:
                 if not self.endpoint:
                     raise NotFoundError
-                handlers = self.mergeHandlers(lambda x: x._calling, self.stages)
-                callStack = CallStack([ x.getCallable(y) for (x, y) in handlers ] + [ self.__callendpoint__ ])
+                context.checkDeadline()
                 # Call the endpoint and create the execution result
-                context.response.content.executionResult = createResponseResult(callStack())
+                context.response.content.executionResult = createResponseResult(self.plan.callStack())
             except Exception as error:
                 # Only log error when debugging
                 if not isinstance(error, RPCError):
@@ -249,8 +374,8 @@ class EndpointExecutionContext(object):
 
         # The post-request stage
         try:
-            handlers = self.mergeHandlers(lambda x: x._postrequest, self.stages)
-            for handler, bound in handlers:
+            context.checkDeadline()
+            for handler, bound in self.plan.postrequest:
                 handler(bound)
         except Exception as error:
             # Only log error when debugging
@@ -262,59 +387,21 @@ class EndpointExecutionContext(object):
             # Done
             return
 
-    def __callendpoint__(self, next):
-        """Call endpoint
-        """
-        params = context.dispatchResult.parameters
-        signature = self.endpoint.getSignature()
-        # Check parameters
-        for param, value in params.iteritems():
-            if not param in signature.parameter.args and not signature.parameter.isDynamic:
-                # Unknown parameter error
-                raise BadRequestParameterError(param, ERRCODE_BADREQUEST_UNKNOWN_PARAMETER, 'Parameter [%s] is unknown via current endpoint' % param)
-            params[param] = value
-        for param in signature.parameter.args:
-            if not param in params:
-                # Set the default value
-                if param in signature.parameter.defaults:
-                    params[param] = signature.parameter.defaults[param]
-                else:
-                    # Lack of necessary parameter
-                    raise BadRequestParameterError(param, ERRCODE_BADREQUEST_LACK_OF_PARAMETER, 'Missing necessary parameter [%s] via current endpoint' % param)
-        # Call endpoint
-        return self.endpoint(**params)
-
     def finalize(self):
         """Run the finalize stage
         """
-        handlers = self.mergeHandlers(lambda x: x._finalizing, self.stages)
-        for handler, bound in handlers:
+        for handler, bound in self.plan.finalizing:
             handler(bound)
 
     def handleError(self, error):
         """Handle error
         """
         handled = False
-        handlers = self.mergeHandlers(lambda x: x._onerror, self.stages)
-        for handler, bound in handlers:
+        for handler, bound in self.plan.onerror:
             handled = handler.callableObject.getCallable(bound)(error, handled)
         # Done
         return handled
 
-    def mergeHandlers(self, func, stages):
-        """Merge and sort the handlers
-        Returns:
-            A list of (handler, bound)
-        """
-        handlers = []
-        for stage, bound in stages:
-            _handlers = func(stage)
-            for handler in _handlers:
-                handlers.append((handler, bound))
-        handlers.sort(key = lambda x: x[0].weight or 0, reverse = True)
-        # Done
-        return handlers
-
 class EndpointExecutionResult(object):
     """The endpoint execution result wrapper
     This class is used to wrap the result of the endpoint execution handler in order to handle:
@@ -344,15 +431,24 @@ class EndpointExecutionResult(object):
         """
         return type(self._result)
 
+    @property
+    def length(self):
+        """Get the number of the values, None if unknown (The generator result)
+        """
+        return None
+
     @classmethod
-    def create(cls, result):
+    def create(cls, result, deadline = None):
         """Create a result
+        Parameters:
+            result                      The returned value of the endpoint
+            deadline                    The deadline (timestamp) to generate the values of a generator
         """
         if isinstance(result, types.GeneratorType):
             # Call this generator until the first value is returned
             try:
                 first = result.next()
-                return GeneratorEndpointExecutionResult(first, result)
+                return GeneratorEndpointExecutionResult(first, result, deadline)
             except StopIteration:
                 # No value is returned
                 return EmptyEndpointExecutionResult(result)
@@ -369,6 +465,12 @@ class EndpointExecutionResult(object):
 class EmptyEndpointExecutionResult(EndpointExecutionResult):
     """The empty endpoint execution result
     """
+    @property
+    def length(self):
+        """Get the number of the values
+        """
+        return 0
+
     def __iter__(self):
         """Iterate an empty result
         """
@@ -378,22 +480,31 @@ class EmptyEndpointExecutionResult(EndpointExecutionResult):
 class GeneratorEndpointExecutionResult(EndpointExecutionResult):
     """The generator endpoint execution result
     """
-    def __init__(self, first, result):
+    def __init__(self, first, result, deadline = None):
         """Create a new GeneratorEndpointExecutionResult
         """
         self._first = first
+        self._deadline = deadline
         # Super
         super(GeneratorEndpointExecutionResult, self).__init__(result, False)
 
     def __iter__(self):
-        """Iterate an empty result
+        """Iterate the result
+        NOTE:
+            The generator will be closed when the deadline exceeded or the iteration is stopped
         """
-        yield self._first
         try:
-            for value in self._result:
+            yield self._first
+            while True:
+                if not self._deadline is None and time.time() >= self._deadline:
+                    raise RequestTimeoutError(ERRCODE_REQUESTTIMEOUT_DEADLINE_EXCEEDED)
+                try:
+                    value = self._result.next()
+                except StopIteration:
+                    break
                 yield value
-        except StopIteration:
-            pass
+        finally:
+            self._result.close()
 
 class IterableEndpointExecutionResult(EndpointExecutionResult):
     """The iterable endpoint execution result
@@ -403,6 +514,12 @@ class IterableEndpointExecutionResult(EndpointExecutionResult):
         """
         super(IterableEndpointExecutionResult, self).__init__(result, False)
 
+    @property
+    def length(self):
+        """Get the number of the values
+        """
+        return len(self._result)
+
     def __iter__(self):
         """Iterate the result
         """
@@ -415,6 +532,12 @@ class IterableEndpointExecutionResult(EndpointExecutionResult):
 class SingleValueEndpointExecutionResult(EndpointExecutionResult):
     """The single value endpoint execution result
     """
+    @property
+    def length(self):
+        """Get the number of the values
+        """
+        return 1
+
     def __iter__(self):
         """Return the single result
         """
@@ -422,25 +545,58 @@ class SingleValueEndpointExecutionResult(EndpointExecutionResult):
 
 class CallStack(object):
     """The CallStack
+    The handlers are compiled into nested closures once, each handler is called with the closure of the rest
+    handlers as the `next` parameter, and the `next` of the last handler returns None
     """
     def __init__(self, handlers):
         """Create a new CallStack
         """
         self.handlers = handlers
-        self.index = -1
+        self.call = self.compile(handlers)
 
     def __call__(self):
         """Run the pipeline
-        Parameters:
-            context                     The Context object
         Returns:
             The returned value
         """
-        self.index += 1
-        if self.index < len(self.handlers):
-            return self.handlers[self.index](self)
+        return self.call()
+
+    @classmethod
+    def compile(cls, handlers):
+        """Compile the handlers
+        Returns:
+            The method to call the first handler
+        """
+        call = lambda: None
+        for handler in reversed(handlers):
+            call = cls.chain(handler, call)
+        # Done
+        return call
+
+    @staticmethod
+    def chain(handler, next):
+        """Chain the handler with the next method
+        """
+        def call():
+            """Call the handler
+            """
+            return handler(next)
+        # Done
+        return call
+
+def createEndpointCaller(endpoint):
+    """Create the method to call the endpoint at the end of the call stack
+    """
+    def callEndpoint(next):
+        """Call endpoint
+        """
+        params = endpoint.getBinder().bind(context.dispatchResult.parameters)
+        # Call endpoint
+        return endpoint(**params)
+    # Done
+    return callEndpoint
 
 def createResponseResult(result):
     """Create the response result
     """
-    return EndpointExecutionResult.create(result)
+    return EndpointExecutionResult.create(result, context.deadline if context else None)
@@ -12,7 +12,9 @@
 from Cookie import SimpleCookie
 
 from unifiedrpc.errors import NotAcceptableError, ERRCODE_NOTACCEPTABLE_NO_SUPPORTED_MIMETYPES
-from unifiedrpc.definition import CONFIG_RESPONSE_MIMETYPE, CONFIG_RESPONSE_ENCODING, CONFIG_RESPONSE_CONTENT_CONTAINER, CONFIG_RESPONSE_CONTENT_BUILDER
+from unifiedrpc.definition import CONFIG_RESPONSE_MIMETYPE, CONFIG_RESPONSE_ENCODING, CONFIG_RESPONSE_CONTENT_CONTAINER, CONFIG_RESPONSE_CONTENT_BUILDER, \
+    CONFIG_RESPONSE_CONTENT_CODEC
+from unifiedrpc.content.codec import getJsonCodec
 from unifiedrpc.content.builder import TextContentBuilder
 from unifiedrpc.content.container import PlainContentContainer
 
@@ -109,13 +111,20 @@ class Response(object):
         """
         return execution.getConfig(CONFIG_RESPONSE_CONTENT_BUILDER) or cls.DEFAULT_CONTENT_BUILDER
 
+    @classmethod
+    def getContentCodec(cls, request, response, execution):
+        """Get the json codec
+        """
+        return getJsonCodec(execution.getConfig(CONFIG_RESPONSE_CONTENT_CODEC))
+
 class ResponseContent(object):
     """The response content
     """
-    def __init__(self, executionResult = None, error = None, container = None, builder = None):
+    def __init__(self, executionResult = None, error = None, container = None, builder = None, codec = None):
         """Create a new ResponseContent
         """
         self.executionResult = executionResult
         self.error = error
         self.container = container
         self.builder = builder
+        self.codec = codec
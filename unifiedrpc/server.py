@@ -10,9 +10,11 @@
 
 """
 
+import signal
 import logging
 
 from threading import Lock, Event
+from multiprocessing import cpu_count
 
 from unifiedrpc.content.parser import default as createDefaultContentParser
 from unifiedrpc.content.builder import default as createDefaultContentBuilder
@@ -20,7 +22,10 @@ from unifiedrpc.content.container import PlainContentContainer
 
 from errors import *
 from definition import *
-from protocol.execution import EndpointExecutionStage
+from threadpool import FuturesThreadPool, GeventThreadPool
+from processpool import ProcessPool, GeventProcessPool
+from protocol.definition import CONFIG_ENDPOINT_CPUBOUND
+from protocol.execution import ExecutionContext, EndpointExecutionStage
 
 class Server(object):
     """The unified RPC server
@@ -35,6 +40,9 @@ class Server(object):
     DEFAULT_RESPONSE_ENCODING       = 'utf-8'           # utf-8 instead of utf8 for ie compitable
     DEFAULT_CONTENT_CONTAINER       = PlainContentContainer
 
+    THREAD_POOL_CLASS               = FuturesThreadPool
+    PROCESS_POOL_CLASS              = ProcessPool
+
     def __init__(self, services, adapters, configs = None, stage = None):
         """Create a new Server
         """
@@ -48,6 +56,12 @@ class Server(object):
         # Initialize the flags
         self._started = False
         self._stopEvent = Event()
+        # The compiled execution contexts, (adapter, service, endpoint) --> ExecutionContext, None if not watched
+        self._executionContexts = None
+        # The process pool for cpu bound endpoints
+        self._processPool = None
+        # The worker id in the pre-fork mode
+        self._workerId = None
         # Set the defaults if missing
         if not CONFIG_REQUEST_ENCODING in self._configs:
             self._configs[CONFIG_REQUEST_ENCODING] = self.DEFAULT_REQUEST_ENCODING
@@ -80,6 +94,18 @@ class Server(object):
         """
         return self._stopEvent
 
+    @property
+    def processPool(self):
+        """Get the process pool, None if no cpu bound endpoint
+        """
+        return self._processPool
+
+    @property
+    def workerId(self):
+        """Get the worker id (0 ~ N-1) in the pre-fork mode, None if not running as a pre-forked worker
+        """
+        return self._workerId
+
     @property
     def services(self):
         """Get the services
@@ -105,6 +131,12 @@ class Server(object):
                 raise ValueError('Require services')
             if not self._adapters:
                 raise ValueError('Require adapters')
+            # Compile the execution contexts
+            self.compileExecutionContexts()
+            # Start the process pool (before starting adapters, so the worker processes will not inherit the listeners)
+            if any(map(lambda x: x.getConfig(CONFIG_ENDPOINT_CPUBOUND), self.getEndpoints())):
+                self._processPool = self.PROCESS_POOL_CLASS(self._configs.get(CONFIG_PROCESSPOOL_SIZE))
+                self._processPool.start()
             # Start adapters
             for adapter in self._adapters:
                 adapter.start()
@@ -122,29 +154,171 @@ class Server(object):
             # Stop adapters
             for adapter in self.adapters:
                 adapter.stop()
+            # Drain the process pool
+            if self._processPool:
+                self._processPool.stop()
+                self._processPool = None
+            # Release the execution contexts
+            for obj in self.getStages() + self.getEndpoints():
+                obj.removeListener(self.invalidateExecutionContexts)
+            self._executionContexts = None
             # Set flags
             self._started = False
             self._stopEvent.set()
 
+    def getStages(self):
+        """Get all the stages of this server (server, adapters, services and endpoints)
+        """
+        stages = [ self._stage ]
+        for adapter in self._adapters:
+            stages.append(adapter._stage)
+        for service in self._services:
+            stages.append(service._stage)
+            for endpoint in service.endpoints.itervalues():
+                stages.append(endpoint._stage)
+        # Done
+        return stages
+
+    def getEndpoints(self):
+        """Get all the endpoints of this server
+        """
+        endpoints = []
+        for service in self._services:
+            endpoints.extend(service.endpoints.itervalues())
+        # Done
+        return endpoints
+
+    def compileExecutionContexts(self):
+        """Compile the execution contexts (configs and execution plans) of all endpoints on all adapters
+        NOTE:
+            The execution contexts will be invalidated when any stage or endpoint config (Endpoint.setConfig) of this
+            server is changed. The changes of the configs dicts of the server, adapters and services are not watched,
+            call invalidateExecutionContexts after changing them
+        """
+        executionContexts = {}
+        for adapter in self._adapters:
+            executionContexts[(adapter, None, None)] = ExecutionContext(self, adapter).compile()
+            for service in self._services:
+                for endpoint in service.endpoints.itervalues():
+                    executionContexts[(adapter, service, endpoint)] = ExecutionContext(self, adapter, service, endpoint).compile()
+        # Watch the stages and endpoints
+        for obj in self.getStages() + self.getEndpoints():
+            obj.addListener(self.invalidateExecutionContexts)
+        # Done
+        self._executionContexts = executionContexts
+
+    def invalidateExecutionContexts(self):
+        """Invalidate all compiled execution contexts
+        """
+        if not self._executionContexts is None:
+            self._executionContexts = {}
+
+    def getExecutionContext(self, adapter = None, service = None, endpoint = None):
+        """Get the execution context
+        The execution context is cached only when the stages and endpoints are watched (From start to stop), see
+        compileExecutionContexts for the changes which are not watched
+        Returns:
+            ExecutionContext object
+        """
+        executionContexts = self._executionContexts
+        if executionContexts is None:
+            # Not watched, don't cache it
+            return ExecutionContext(self, adapter, service, endpoint)
+        key = (adapter, service, endpoint)
+        executionContext = executionContexts.get(key)
+        if not executionContext:
+            # Create and cache it
+            executionContext = ExecutionContext(self, adapter, service, endpoint)
+            executionContexts[key] = executionContext
+        # Done
+        return executionContext
+
+    def getExecutionPlan(self, adapter = None, service = None, endpoint = None):
+        """Get the execution plan
+        Returns:
+            EndpointExecutionPlan object
+        """
+        return self.getExecutionContext(adapter, service, endpoint).getExecutionPlan()
+
     def wait(self, timeout = None):
         """Wait for the server stopped
         """
         self._stopEvent.wait()
 
-    def forever(self):
+    def forever(self, workers = None, reusePort = False):
         """Start the server and run forever
+        Parameters:
+            workers                     Run in the pre-fork mode with the number of workers if specified
+            reusePort                   Bind the listener in each worker with SO_REUSEPORT in the pre-fork mode
         """
+        if workers:
+            return self.prefork(workers, reusePort)
         # Start the server
         self.start()
         # Wait for the server stopped forever
         self.wait()
 
+    def prefork(self, workers = None, reusePort = False):
+        """Fork the workers and supervise them until SIGTERM or SIGINT is received
+        Parameters:
+            workers                     The number of workers, the number of cpus by default
+            reusePort                   Bind the listener in each worker with SO_REUSEPORT instead of sharing the
+                                        listener bound in the supervisor process
+        NOTE:
+            The server is not started in the supervisor process, the startup handlers of the services are called in
+            each worker, use the workerId of the server to tell the workers apart.
+        """
+        from prefork import PreforkSupervisor
+        if self._started:
+            raise ValueError('Server is already started')
+        PreforkSupervisor(self, workers or cpu_count(), reusePort).run()
+
+    def startWorker(self, workerId, reusePort = False):
+        """Start the server as a pre-forked worker
+        """
+        self._workerId = workerId
+        if reusePort:
+            for adapter in self._adapters:
+                adapter.bind(reusePort = True)
+        self.start()
+
+    def runWorker(self, workerId, reusePort = False):
+        """Run the server as a pre-forked worker until SIGTERM is received
+        """
+        stopEvent = Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopEvent.set())
+        self.startWorker(workerId, reusePort)
+        try:
+            # Wait with timeout, the signal handler is not called when waiting without timeout
+            while not stopEvent.is_set():
+                stopEvent.wait(1)
+        finally:
+            self.stop()
+
 class GeventServer(Server):
     """The gevent server
     """
+    THREAD_POOL_CLASS               = GeventThreadPool
+    PROCESS_POOL_CLASS              = GeventProcessPool
+
     @classmethod
     def waits(cls, servers, timeout = None):
         """Wait for multiple services
         """
         import gevent
         gevent.wait([ x.stopEvent for x in servers ], timeout)
+
+    def runWorker(self, workerId, reusePort = False):
+        """Run the server as a pre-forked worker until SIGTERM is received
+        """
+        import gevent
+        from gevent.event import Event as GeventEvent
+        # Reinitialize the hub which may be inherited from the supervisor
+        gevent.reinit()
+        stopEvent = GeventEvent()
+        (getattr(gevent, 'signal_handler', None) or gevent.signal)(signal.SIGTERM, stopEvent.set)
+        self.startWorker(workerId, reusePort)
+        try:
+            stopEvent.wait()
+        finally:
+            self.stop()
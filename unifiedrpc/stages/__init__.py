@@ -8,5 +8,8 @@ from secure import SSLValidator
 from content import DataValidator
 from session import SessionValidator
 from parameter import ParameterConverter
+from offload import ThreadPoolCaller, ThreadPool, GeventThreadPool, FuturesThreadPool
+from cpubound import ProcessPoolCaller
+from bulkhead import Bulkhead, GeventBulkhead, createBulkhead
 
-__init__ = [ 'DataValidator', 'ParameterConverter', 'SessionValidator', 'SSLValidator' ]
+__init__ = [ 'DataValidator', 'ParameterConverter', 'SessionValidator', 'SSLValidator', 'ThreadPoolCaller', 'ThreadPool', 'GeventThreadPool', 'FuturesThreadPool', 'ProcessPoolCaller', 'Bulkhead', 'GeventBulkhead', 'createBulkhead' ]
@@ -0,0 +1,160 @@
+# encoding=utf8
+
+""" The bulkhead stage
+    Author: lipixun
+    Created Time : 日 10/18 15:22:08 2026
+
+    File Name: bulkhead.py
+    Description:
+
+        Limit the concurrent calls of an endpoint (or all endpoints of a service), so a slow endpoint will not
+        exhaust the whole server
+
+"""
+
+import time
+import types
+
+from threading import Lock, Condition
+
+from unifiedrpc import context
+from unifiedrpc.errors import ServiceUnavailableError, ERRCODE_SERVICEUNAVAILABLE_BULKHEAD_FULL
+
+class Bulkhead(object):
+    """The bulkhead caller
+    At most `limit` calls are running at the same time, at most `queueSize` calls are waiting for `maxWait` seconds
+    at most, others are rejected by ServiceUnavailableError with the Retry-After header
+    Attributes:
+        inflight                        The number of the running calls
+        waiting                         The number of the waiting calls (The queue depth)
+        rejected                        The number of the rejected calls
+    """
+    def __init__(self, limit, queueSize = 0, maxWait = None, retryAfter = 1):
+        """Create a new Bulkhead
+        Parameters:
+            limit                       The max number of the running calls
+            queueSize                   The max number of the waiting calls
+            maxWait                     The max seconds to wait, None means wait until a call completed
+            retryAfter                  The seconds of the Retry-After header when rejected
+        """
+        self.limit = limit
+        self.queueSize = queueSize
+        self.maxWait = maxWait
+        self.retryAfter = retryAfter
+        self.inflight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._condition = Condition(Lock())
+
+    def __call__(self, next):
+        """Call next in the bulkhead
+        The slot of a generator result is kept until the generator is exhausted or closed
+        """
+        self.enter()
+        try:
+            result = next()
+        except:
+            self.leave()
+            raise
+        if isinstance(result, types.GeneratorType):
+            return self.iterate(result)
+        # Done
+        self.leave()
+        return result
+
+    def iterate(self, result):
+        """Iterate the generator result and leave the bulkhead when it's exhausted or closed
+        NOTE:
+            The slot is leaked if the returned generator is never started, the execution result always starts it
+        """
+        try:
+            for value in result:
+                yield value
+        finally:
+            try:
+                result.close()
+            finally:
+                self.leave()
+
+    def getStats(self):
+        """Get the stats
+        """
+        return { 'inflight': self.inflight, 'waiting': self.waiting, 'rejected': self.rejected }
+
+    def reject(self):
+        """Reject the call
+        """
+        self.rejected += 1
+        if context and context.response:
+            context.response.headers['Retry-After'] = str(self.retryAfter)
+        raise ServiceUnavailableError(ERRCODE_SERVICEUNAVAILABLE_BULKHEAD_FULL)
+
+    def enter(self):
+        """Enter the bulkhead
+        """
+        with self._condition:
+            if self.inflight >= self.limit:
+                if self.waiting >= self.queueSize:
+                    self.reject()
+                # Wait
+                self.waiting += 1
+                try:
+                    deadline = time.time() + self.maxWait if not self.maxWait is None else None
+                    while self.inflight >= self.limit:
+                        timeout = deadline - time.time() if deadline else None
+                        if not timeout is None and timeout <= 0:
+                            self.reject()
+                        self._condition.wait(timeout)
+                finally:
+                    self.waiting -= 1
+            self.inflight += 1
+
+    def leave(self):
+        """Leave the bulkhead
+        """
+        with self._condition:
+            self.inflight -= 1
+            self._condition.notify()
+
+class GeventBulkhead(Bulkhead):
+    """The gevent bulkhead
+    """
+    def __init__(self, limit, queueSize = 0, maxWait = None, retryAfter = 1):
+        """Create a new GeventBulkhead
+        """
+        from gevent.lock import Semaphore
+        self._semaphore = Semaphore(limit)
+        # Super
+        super(GeventBulkhead, self).__init__(limit, queueSize, maxWait, retryAfter)
+
+    def enter(self):
+        """Enter the bulkhead
+        """
+        if not self._semaphore.acquire(blocking = False):
+            if self.waiting >= self.queueSize:
+                self.reject()
+            # Wait
+            self.waiting += 1
+            try:
+                if not self._semaphore.acquire(timeout = self.maxWait):
+                    self.reject()
+            finally:
+                self.waiting -= 1
+        self.inflight += 1
+
+    def leave(self):
+        """Leave the bulkhead
+        """
+        self.inflight -= 1
+        self._semaphore.release()
+
+def createBulkhead(limit, queueSize = 0, maxWait = None, retryAfter = 1):
+    """Create a bulkhead, prefer the gevent bulkhead
+    NOTE:
+        The waiting on the threading condition blocks the whole gevent hub if threading is not patched, use the
+        Bulkhead explicitly when serving by native threads
+    """
+    try:
+        return GeventBulkhead(limit, queueSize, maxWait, retryAfter)
+    except ImportError:
+        return Bulkhead(limit, queueSize, maxWait, retryAfter)
@@ -0,0 +1,60 @@
+# encoding=utf8
+
+""" The cpu bound stage
+    Author: lipixun
+    Created Time : 日 10/18 14:40:12 2026
+
+    File Name: cpubound.py
+    Description:
+
+"""
+
+from unifiedrpc import context
+from unifiedrpc.processpool import ProcessPoolTask
+
+class ProcessPoolCaller(object):
+    """The process pool caller
+    This caller will run the executor of the endpoint in the process pool of the server instead of calling next
+    NOTE:
+        The executor is called without the service instance (See ProcessPoolTask)
+    """
+    def __init__(self, spoolThreshold = 1024 * 1024):
+        """Create a new ProcessPoolCaller
+        Parameters:
+            spoolThreshold              The bytes parameters not less than this size will be sent by temporary files
+        """
+        self.spoolThreshold = spoolThreshold
+        self._names = {}        # Endpoint --> (module name, service class name, endpoint name)
+
+    def getName(self, endpoint):
+        """Get the name of the endpoint
+        """
+        name = self._names.get(endpoint)
+        if not name:
+            service = endpoint.bindObject
+            serviceClass = type(service)
+            for endpointName, _endpoint in service.endpoints.iteritems():
+                if _endpoint is endpoint:
+                    name = (serviceClass.__module__, serviceClass.__name__, endpointName)
+                    break
+            else:
+                raise ValueError('Endpoint not found in service [%s]' % service.name)
+            self._names[endpoint] = name
+        # Done
+        return name
+
+    def __call__(self, next):
+        """Run the endpoint in process pool
+        """
+        endpoint = context.dispatchResult.endpoint
+        pool = context.server.processPool
+        if not pool:
+            raise ValueError('Process pool is not started')
+        # Create the task
+        moduleName, serviceClassName, endpointName = self.getName(endpoint)
+        task = ProcessPoolTask(moduleName, serviceClassName, endpointName, dict(endpoint.getBinder().bind(context.dispatchResult.parameters)))
+        task.spool(self.spoolThreshold)
+        try:
+            return pool.run(task)
+        finally:
+            task.release()
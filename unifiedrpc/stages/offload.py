@@ -0,0 +1,67 @@
+# encoding=utf8
+
+""" The offload stage
+    Author: lipixun
+    Created Time : 日 10/18 13:20:45 2026
+
+    File Name: offload.py
+    Description:
+
+        Run the executor of the endpoint in a thread pool, in order not to block the gevent hub by the blocking
+        calls (C-extensions) or cpu consuming works
+
+        The gevent versions (GeventThreadPool, GeventProcessPool, GeventBulkhead) only block the current greenlet
+        while waiting, other greenlets on the hub keep running. The threading versions block the whole hub if
+        threading is not patched, while the gevent versions are bound to the hub of the thread which creates them
+        and don't work in native threads.
+
+"""
+
+from threading import Lock, Semaphore
+
+from unifiedrpc import context
+from unifiedrpc.errors import ServiceUnavailableError, ERRCODE_SERVICEUNAVAILABLE_QUEUE_FULL
+from unifiedrpc.threadpool import ThreadPool, GeventThreadPool, FuturesThreadPool
+from unifiedrpc.protocol.context import bindContext
+
+class ThreadPoolCaller(object):
+    """The thread pool caller
+    This caller will run the rest of the calling stage (usually only the executor of the endpoint) in the thread pool
+    with the current context. The number of the running and waiting calls are limited by the pool size and queue size,
+    the ServiceUnavailableError will be raised when the limit is exceeded.
+    NOTE:
+        The generator endpoint will only be created in the pool, the values are still generated in the caller
+    """
+    def __init__(self, size = 10, queueSize = 100, pool = None):
+        """Create a new ThreadPoolCaller
+        Parameters:
+            size                        The thread pool size, used when creating the thread pool
+            queueSize                   The max number of calls waiting for a free thread
+            pool                        The ThreadPool object, a new one of the THREAD_POOL_CLASS of the server will be
+                                        created when first called if not specified
+        """
+        self.size = pool.size if pool else size
+        self.queueSize = queueSize
+        self.pool = pool
+        self._lock = Lock()
+        self._slots = Semaphore(self.size + queueSize)
+
+    def getPool(self):
+        """Get the thread pool
+        """
+        if not self.pool:
+            with self._lock:
+                if not self.pool:
+                    self.pool = context.server.THREAD_POOL_CLASS(self.size)
+        # Done
+        return self.pool
+
+    def __call__(self, next):
+        """Run next in the thread pool
+        """
+        if not self._slots.acquire(False):
+            raise ServiceUnavailableError(ERRCODE_SERVICEUNAVAILABLE_QUEUE_FULL)
+        try:
+            return self.getPool().run(bindContext(next))
+        finally:
+            self._slots.release()
@@ -11,22 +11,51 @@
 
 from unifiedrpc import context
 from unifiedrpc.errors import ForbiddenError
+from unifiedrpc.certificate import CertificateCache
 
 class SSLValidator(object):
     """The ssl validator
     This class will ensure the request should be transported via secure connection
     """
-    def __init__(self, clientAuth = False):
+    META_IDENTITY = 'identity'
+
+    def __init__(self, clientAuth = False, authorize = None, authorizationCacheSize = 1024):
         """Create a new SSLValidator
         Parameters:
             clientAuth                          Whether the client should be authenticated by ssl certificate
+            authorize                           The method to authorize the client certificate, authorize(Certificate)
+                                                returns the identity or None to reject. The identity could be got by
+                                                context.identity. The method implies clientAuth
+            authorizationCacheSize              The max number of the cached authorization results, the results
+                                                are cached by the certificate fingerprint until the certificate expires.
+                                                0 means no cache
         """
-        self.clientAuth = clientAuth
+        self.clientAuth = clientAuth or bool(authorize)
+        self.authorize = authorize
+        self.authorizations = CertificateCache(authorizationCacheSize) if authorize and authorizationCacheSize else None
 
     def __call__(self):
         """Validate the request data
         """
         if not context.connection.ssl:
             raise ForbiddenError
-        if self.clientAuth and not context.connection.remote.cert:
+        cert = context.connection.remote.cert if self.clientAuth else None
+        if self.clientAuth and not cert:
             raise ForbiddenError
+        if self.authorize:
+            identity = self.getIdentity(cert)
+            if identity is None:
+                raise ForbiddenError
+            context.meta[self.META_IDENTITY] = identity
+
+    def getIdentity(self, cert):
+        """Get the identity of the certificate by the authorize method
+        """
+        if self.authorizations is None or not cert.fingerprint:
+            return self.authorize(cert)
+        result = self.authorizations.get(cert.fingerprint)
+        if not result:
+            result = (self.authorize(cert), )
+            self.authorizations.set(cert.fingerprint, result, cert.expireTime)
+        # Done
+        return result[0]
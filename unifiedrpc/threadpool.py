@@ -0,0 +1,60 @@
+# encoding=utf8
+
+""" The thread pool
+    Author: lipixun
+    Created Time : 日 10/18 13:20:45 2026
+
+    File Name: threadpool.py
+    Description:
+
+        The thread pools used to offload the executors of the endpoints (See ThreadPoolCaller), the pool class is
+        chosen by the server (See Server.THREAD_POOL_CLASS)
+
+"""
+
+class ThreadPool(object):
+    """The thread pool
+    """
+    def __init__(self, size):
+        """Create a new ThreadPool
+        """
+        self.size = size
+
+    def run(self, method):
+        """Run the method in the pool and wait for the result
+        """
+        raise NotImplementedError
+
+class GeventThreadPool(ThreadPool):
+    """The gevent thread pool
+    NOTE:
+        The pool is bound to the hub of the thread which creates it
+    """
+    def __init__(self, size):
+        """Create a new GeventThreadPool
+        """
+        from gevent.threadpool import ThreadPool as _ThreadPool
+        self.pool = _ThreadPool(size)
+        # Super
+        super(GeventThreadPool, self).__init__(size)
+
+    def run(self, method):
+        """Run the method in the pool and wait for the result
+        """
+        return self.pool.apply(method)
+
+class FuturesThreadPool(ThreadPool):
+    """The concurrent.futures thread pool
+    """
+    def __init__(self, size):
+        """Create a new FuturesThreadPool
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(size)
+        # Super
+        super(FuturesThreadPool, self).__init__(size)
+
+    def run(self, method):
+        """Run the method in the pool and wait for the result
+        """
+        return self.executor.submit(method).result()
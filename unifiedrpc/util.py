@@ -15,3 +15,74 @@ try:
     import xml.etree.cElementTree as ET
 except ImportError:
     import xml.etree.ElementTree as ET
+
+from threading import Lock
+from collections import OrderedDict
+
+class LRUCache(object):
+    """The bounded least recently used cache
+    Attributes:
+        size                                The max number of the cached items
+        hits                                The number of the cache hits
+        misses                              The number of the cache misses
+    """
+    def __init__(self, size):
+        """Create a new LRUCache
+        """
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        """Get the number of the cached items
+        """
+        return len(self._items)
+
+    def __contains__(self, key):
+        """Check if the key is cached
+        """
+        return key in self._items
+
+    def get(self, key, default = None):
+        """Get the cached value and mark it as the most recently used
+        """
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items[key] = value
+            self.hits += 1
+        # Done
+        return value
+
+    def set(self, key, value):
+        """Set the value, the least recently used item will be removed if the cache is full
+        """
+        with self._lock:
+            self._items.pop(key, None)
+            while self._items and len(self._items) >= self.size:
+                self._items.popitem(last = False)
+            self._items[key] = value
+
+    def delete(self, key):
+        """Delete the item
+        """
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        """Clear the items and the counters
+        """
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def getStats(self):
+        """Get the statistics
+        """
+        return { 'size': len(self._items), 'hits': self.hits, 'misses': self.misses }